@@ -3,6 +3,12 @@
 Módulo de dados mestre para o projeto de Dynamic Programming.
 Contém a definição das habilidades e seus metadados.
 """
+import hashlib
+import json
+
+import numpy as np
+
+from .src.catalog_utils import open_catalog
 
 HABILIDADES_MESTRE = {
     'S1': {'Nome': 'Programação Básica (Python)', 'Tempo': 80, 'Valor': 3, 'Complexidade': 4, 'Pre_Reqs': [], 'Uso': 'Base'},
@@ -21,6 +27,61 @@ HABILIDADES_MESTRE = {
 
 HABILIDADES_CRITICAS = ['S3', 'S5', 'S7', 'S8', 'S9']
 
+# Catálogo embutido, restaurado por reset_catalog()
+_HABILIDADES_PADRAO = HABILIDADES_MESTRE
+
+_CRITICAS_PADRAO = HABILIDADES_CRITICAS
+
+# Versão do catálogo ativo (invalida o catálogo compilado sem re-hash)
+_CATALOG_VERSION = 0
+
+# True quando HABILIDADES_MESTRE é uma cópia própria, editável por update_skill
+_CATALOG_OWNED = False
+
+def use_catalog(habilidades, criticas=None):
+    """
+    Substitui o catálogo ativo (e, opcionalmente, a lista de habilidades
+    críticas). Usado com catálogos sintéticos e colunares.
+    """
+    global HABILIDADES_MESTRE, HABILIDADES_CRITICAS, _CATALOG_VERSION, _CATALOG_OWNED
+    HABILIDADES_MESTRE = habilidades
+    _CATALOG_OWNED = False
+    _CATALOG_VERSION += 1
+    if criticas is not None:
+        HABILIDADES_CRITICAS = list(criticas)
+    return HABILIDADES_MESTRE
+
+def update_skill(skill_id, dados):
+    """
+    Inclui ou substitui uma habilidade do catálogo ativo e avança a versão.
+    Na primeira edição, o catálogo é copiado para um dicionário próprio (o
+    embutido e os colunares não são alterados). Para validar o grafo a cada
+    edição, use graph_utils.edit_skill.
+    """
+    global HABILIDADES_MESTRE, _CATALOG_VERSION, _CATALOG_OWNED
+    if not _CATALOG_OWNED:
+        HABILIDADES_MESTRE = dict(HABILIDADES_MESTRE.items())
+        _CATALOG_OWNED = True
+    HABILIDADES_MESTRE[skill_id] = dados
+    _CATALOG_VERSION += 1
+    return HABILIDADES_MESTRE
+
+def catalog_version():
+    """Contador incrementado a cada troca ou edição do catálogo ativo."""
+    return _CATALOG_VERSION
+
+def load_catalog(directory):
+    """
+    Substitui o catálogo ativo por um catálogo colunar (memory-mapped) gerado
+    por src.catalog_utils.ingest_catalog. get_habilidades() passa a retornar uma
+    visão somente leitura com a mesma interface do dicionário mestre.
+    """
+    return use_catalog(open_catalog(directory))
+
+def reset_catalog():
+    """Restaura o catálogo embutido e a lista de habilidades críticas."""
+    use_catalog(_HABILIDADES_PADRAO, _CRITICAS_PADRAO)
+
 def get_habilidades():
     """Retorna o dicionário mestre de habilidades."""
     return HABILIDADES_MESTRE
@@ -31,12 +92,204 @@ def get_habilidades_criticas():
 
 def get_base_skills():
     """Retorna as habilidades de nível básico (sem pré-requisitos)."""
-    # List comprehension para filtrar habilidades sem pré-requisitos
-    return [
-        skill_id for skill_id, data in HABILIDADES_MESTRE.items()
-        if not data['Pre_Reqs']
-    ]
+    # Catálogo colunar: lido direto dos offsets CSR, sem compilar o índice
+    if hasattr(HABILIDADES_MESTRE, 'base_skills'):
+        return HABILIDADES_MESTRE.base_skills()
+    # Máscara do catálogo compilado, apenas se ele já estiver atualizado
+    if _COMPILED_CATALOG is not None and _COMPILED_CATALOG.version == _CATALOG_VERSION:
+        return _COMPILED_CATALOG.ids_of(_COMPILED_CATALOG.base_mask)
+    return [skill_id for skill_id, data in HABILIDADES_MESTRE.items() if not data['Pre_Reqs']]
 
 def get_skill_data(skill_id):
     """Retorna os dados de uma habilidade específica."""
     return HABILIDADES_MESTRE.get(skill_id)
+
+
+class SkillIndex:
+    """
+    Índice compacto das habilidades para uso com bitmasks.
+
+    Cada habilidade recebe uma posição de bit (na ordem do catálogo) e seus
+    atributos ficam em listas paralelas indexadas por essa posição. Conjuntos
+    de habilidades são representados por inteiros (bit i = habilidade ids[i]).
+    A adjacência é guardada em CSR; as máscaras por habilidade
+    ('prereq_mask', 'dependent_mask'), que ocupam O(n^2) bits, só são
+    montadas no primeiro acesso.
+    """
+
+    def __init__(self, habilidades):
+        self.ids = list(habilidades.keys())
+        self.position = {skill_id: i for i, skill_id in enumerate(self.ids)}
+        records = [habilidades[s] for s in self.ids]
+        self.valor = [r['Valor'] for r in records]
+        self.tempo = [r['Tempo'] for r in records]
+        self.complexidade = [r['Complexidade'] for r in records]
+
+        # Adjacência CSR (habilidade -> pré-requisitos), montada direto de
+        # Pre_Reqs; pré-requisitos inexistentes ficam de fora
+        self.prereq_offsets = [0]
+        self.prereq_targets = []
+        orphans = []
+        for i, record in enumerate(records):
+            for p in record['Pre_Reqs']:
+                target = self.position.get(p)
+                if target is None:
+                    orphans.append(i)
+                else:
+                    self.prereq_targets.append(target)
+            self.prereq_offsets.append(len(self.prereq_targets))
+
+        # Adjacência reversa (-> dependentes) por contagem
+        n = len(self.ids)
+        counts = [0] * (n + 1)
+        for p in self.prereq_targets:
+            counts[p + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.dependent_offsets = counts
+        self.dependent_targets = [0] * len(self.prereq_targets)
+        cursor = counts[:-1]
+        for v in range(n):
+            for p in self.prereq_targets[self.prereq_offsets[v]:self.prereq_offsets[v + 1]]:
+                self.dependent_targets[cursor[p]] = v
+                cursor[p] += 1
+
+        # Habilidades com pré-requisitos inexistentes (nunca ficam disponíveis)
+        self.orphan_mask = self._mask_from_positions(orphans)
+        self._prereq_mask = None
+        self._dependent_mask = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _mask_from_positions(self, positions):
+        """Bitmask a partir de posições, montada em bytes (O(n) mesmo com muitos bits)."""
+        buffer = bytearray((len(self.ids) + 7) // 8)
+        for i in positions:
+            buffer[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buffer, 'little')
+
+    def _masks_from_csr(self, offsets, targets):
+        return [
+            sum(1 << t for t in targets[offsets[v]:offsets[v + 1]])
+            for v in range(len(self.ids))
+        ]
+
+    @property
+    def prereq_mask(self):
+        """Máscara dos pré-requisitos diretos de cada habilidade (sob demanda)."""
+        if self._prereq_mask is None:
+            self._prereq_mask = self._masks_from_csr(self.prereq_offsets, self.prereq_targets)
+        return self._prereq_mask
+
+    @property
+    def dependent_mask(self):
+        """Máscara dos dependentes diretos de cada habilidade (sob demanda)."""
+        if self._dependent_mask is None:
+            self._dependent_mask = self._masks_from_csr(self.dependent_offsets, self.dependent_targets)
+        return self._dependent_mask
+
+    def mask_of(self, skill_ids):
+        """Converte um iterável de IDs em bitmask."""
+        return self._mask_from_positions(self.position[skill_id] for skill_id in skill_ids)
+
+    @staticmethod
+    def bits(mask):
+        """Gera as posições dos bits ligados de 'mask' (do menos significativo)."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def ids_of(self, mask):
+        """Converte uma bitmask na lista de IDs (ordem do catálogo)."""
+        return [self.ids[i] for i in self.bits(mask)]
+
+    def total(self, mask, column):
+        """Soma a coluna ('valor', 'tempo' ou 'complexidade') sobre a máscara."""
+        values = getattr(self, column)
+        return sum(values[i] for i in self.bits(mask))
+
+
+class CompiledCatalog(SkillIndex):
+    """
+    Catálogo compilado uma vez por versão do catálogo ativo (ver
+    catalog_version).
+
+    Além do índice de bits (SkillIndex), guarda a ordem topológica, colunas
+    NumPy de Tempo/Valor/Complexidade e a máscara das habilidades base. Os
+    fechos de pré-requisitos ficam em graph_utils.TransitiveClosure. O hash
+    do conteúdo é calculado no primeiro acesso. Em grafos com ciclo,
+    'topological_order' é None.
+    """
+
+    def __init__(self, habilidades, version=None):
+        super().__init__(habilidades)
+        self.version = version
+        self._habilidades = habilidades
+        self._content_hash = None
+        n = len(self.ids)
+
+        self.columns = {
+            'Tempo': np.array(self.tempo),
+            'Valor': np.array(self.valor),
+            'Complexidade': np.array(self.complexidade)
+        }
+        self.base_mask = self._mask_from_positions(
+            i for i in range(n) if self.prereq_offsets[i] == self.prereq_offsets[i + 1]
+            and not (self.orphan_mask >> i) & 1
+        )
+
+        # Ordem topológica (Kahn): pré-requisitos antes dos dependentes
+        indegree = [self.prereq_offsets[i + 1] - self.prereq_offsets[i] for i in range(n)]
+        order = [i for i in range(n) if indegree[i] == 0]
+        for v in order:
+            for w in self.dependent_targets[self.dependent_offsets[v]:self.dependent_offsets[v + 1]]:
+                indegree[w] -= 1
+                if indegree[w] == 0:
+                    order.append(w)
+
+        self.topological_order = order if len(order) == n else None
+
+    @property
+    def content_hash(self):
+        """Hash do conteúdo (ver catalog_hash), calculado uma vez por versão."""
+        if self._content_hash is None:
+            self._content_hash = catalog_hash(self._habilidades)
+        return self._content_hash
+
+
+def catalog_hash(habilidades):
+    """
+    Hash do conteúdo do catálogo (muda com qualquer edição de habilidade).
+    A ordem das habilidades faz parte do hash, pois define as posições de bit
+    do índice (resultados em bitmask não valem para outra ordem).
+    """
+    # Catálogos colunares já trazem o hash calculado na ingestão
+    if hasattr(habilidades, 'content_hash'):
+        return habilidades.content_hash
+    payload = json.dumps(list(habilidades.items()), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+_COMPILED_CATALOG = None
+
+def get_compiled_catalog():
+    """
+    Retorna o catálogo compilado de HABILIDADES_MESTRE, recompilando-o apenas
+    quando a versão do catálogo muda (use_catalog, load_catalog, update_skill).
+    Edições feitas diretamente no dicionário não são detectadas: use
+    update_skill.
+    """
+    global _COMPILED_CATALOG
+    if _COMPILED_CATALOG is None or _COMPILED_CATALOG.version != _CATALOG_VERSION:
+        _COMPILED_CATALOG = CompiledCatalog(HABILIDADES_MESTRE, _CATALOG_VERSION)
+    return _COMPILED_CATALOG
+
+def get_skill_index():
+    """
+    Retorna o último catálogo compilado sem conferir a versão (uso em laços
+    internos). Os solvers chamam get_compiled_catalog() no início para
+    garantir que ele está atualizado.
+    """
+    return _COMPILED_CATALOG or get_compiled_catalog()
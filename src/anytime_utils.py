@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo com a interface "anytime" comum dos solvers (Desafios 2, 3 e 5).
+
+Cada solver é um gerador que produz soluções cada vez melhores junto com um
+limite (inferior para minimização, superior para maximização), e None como
+sinal de progresso entre duas melhorias (ponto em que o cancelamento é
+atendido). A busca roda
+em uma thread de fundo: solve_anytime devolve a melhor solução encontrada até
+o prazo, com o gap de otimalidade, e chamadas seguintes com os mesmos
+parâmetros recuperam a resposta refinada da mesma busca.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from ..data import get_base_skills, get_compiled_catalog, get_habilidades, get_habilidades_criticas
+from . import challenge_3, challenge_5
+from .challenge_2 import anytime_orders
+
+TIME_BUDGET_PADRAO = 0.2     # segundos (SLO de 200 ms da API)
+MAX_BUSCAS_ATIVAS = 32       # buscas concluídas mais antigas são descartadas acima disso
+
+
+class AnytimeSolver:
+    """
+    Executa um gerador anytime em uma thread de fundo e guarda a melhor
+    solução e o melhor limite vistos até o momento.
+
+    Args:
+        search: gerador de (solução, valor, limite) ou None (progresso).
+        sentido: "min" ou "max".
+    """
+
+    def __init__(self, search, sentido):
+        self.sentido = sentido
+        self._search = search
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._cancelled = False
+        self._started = time.monotonic()
+        self._solution = None
+        self._value = None
+        self._bound = None
+        self._updates = 0
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _not_worse(self, a, b):
+        # Empates aceitam a solução mais recente (as etapas finais refinam a resposta)
+        return b is None or (a <= b if self.sentido == "min" else a >= b)
+
+    def _run(self):
+        try:
+            for item in self._search:
+                if self._cancelled:
+                    break
+                if item is None:
+                    continue
+                solution, value, bound = item
+                with self._lock:
+                    if self._not_worse(value, self._value):
+                        self._solution, self._value = solution, value
+                    # O limite só aperta: maior inferior (min) ou menor superior (max)
+                    if self._bound is None or (bound > self._bound if self.sentido == "min" else bound < self._bound):
+                        self._bound = bound
+                    self._updates += 1
+        except Exception as e:
+            self._error = e
+        finally:
+            try:
+                if hasattr(self._search, 'close'):
+                    self._search.close()
+            finally:
+                self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        """Pede a interrupção da busca no próximo item produzido pelo gerador."""
+        self._cancelled = True
+
+    def result(self, time_budget=None, deadline=None):
+        """
+        Aguarda até 'time_budget' segundos (ou até o instante 'deadline' de
+        time.monotonic()) e retorna o estado atual da busca.
+        """
+        if deadline is None and time_budget is not None:
+            deadline = time.monotonic() + time_budget
+        if deadline is not None:
+            self._done.wait(max(0.0, deadline - time.monotonic()))
+        else:
+            self._done.wait()
+        return self.snapshot()
+
+    def snapshot(self):
+        """
+        Melhor solução, limite e gap no instante atual (sem esperar). Uma busca
+        concluída sem solução viável (valor e limite infinitos) tem status
+        'Inviável' e gap None.
+        """
+        with self._lock:
+            value, bound = self._value, self._bound
+            infeasible = value is not None and math.isinf(value) and value == bound
+            if value is None or infeasible or not math.isfinite(bound):
+                gap = None
+            elif self.sentido == "min":
+                gap = (value - bound) / value if value else 0.0
+            else:
+                gap = (bound - value) / bound if bound else 0.0
+            if self._error is not None:
+                status = 'Erro'
+            elif self.done and not self._cancelled:
+                status = 'Inviável' if infeasible else 'Concluído'
+            elif self.done:
+                status = 'Cancelado'
+            else:
+                status = 'Em Andamento'
+            result = {
+                'Status': status,
+                'Solução': self._solution,
+                'Valor': value,
+                'Limite': bound,
+                'Gap': gap,
+                'Ótimo Comprovado': gap is not None and gap <= 1e-12,
+                'Atualizações': self._updates,
+                'Tempo Decorrido (s)': time.monotonic() - self._started
+            }
+            if self._error is not None:
+                result['Mensagem'] = f'{type(self._error).__name__}: {self._error}'
+            return result
+
+
+def _search_challenge_2(k=3):
+    return anytime_orders(get_habilidades_criticas(), get_habilidades(), k), "min"
+
+
+def _search_challenge_3():
+    return challenge_3.anytime_pivot(get_base_skills(), get_habilidades()), "min"
+
+
+def _search_challenge_5(current_skills_list=('S1', 'S2')):
+    index = get_compiled_catalog()
+    start_mask = index.mask_of(s for s in current_skills_list if s in index.position)
+    market_transition_prob_tuple = tuple(sorted(challenge_5.MARKET_TRANSITION_PROB.items()))
+    search = challenge_5.anytime_recommendation(
+        start_mask, challenge_5.MAX_SKILLS_TO_RECOMMEND, market_transition_prob_tuple
+    )
+    return search, "max"
+
+
+def _search_constants(desafio):
+    """Constantes de módulo lidas pela busca (entram na chave da memorização)."""
+    if desafio == 'challenge_3':
+        return (challenge_3.ADAPTABILIDADE_MINIMA,)
+    if desafio == 'challenge_5':
+        return (
+            _freeze(challenge_5.MARKET_TRANSITION_PROB),
+            challenge_5.MAX_SKILLS_TO_RECOMMEND
+        )
+    return ()
+
+
+SOLVERS = {
+    'challenge_2': _search_challenge_2,
+    'challenge_3': _search_challenge_3,
+    'challenge_5': _search_challenge_5,
+}
+
+_ACTIVE = OrderedDict()
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _freeze(value):
+    """Converte parâmetros em uma chave hashable."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def get_anytime_solver(desafio, **params):
+    """
+    Retorna a busca em andamento (ou concluída) para 'desafio' e 'params' no
+    catálogo atual (e com as constantes atuais do desafio, ver
+    _search_constants), iniciando-a se necessário.
+    """
+    if desafio not in SOLVERS:
+        raise ValueError(f"Desafio sem solver anytime: {desafio}")
+
+    key = (desafio, _freeze(params), _search_constants(desafio), get_compiled_catalog().content_hash)
+    with _ACTIVE_LOCK:
+        solver = _ACTIVE.get(key)
+        if solver is None or solver.snapshot()['Status'] in ('Cancelado', 'Erro'):
+            search, sentido = SOLVERS[desafio](**params)
+            solver = AnytimeSolver(search, sentido)
+            _ACTIVE[key] = solver
+            # Descarta as buscas concluídas mais antigas
+            for old_key in list(_ACTIVE):
+                if len(_ACTIVE) <= MAX_BUSCAS_ATIVAS:
+                    break
+                if _ACTIVE[old_key].done:
+                    del _ACTIVE[old_key]
+        _ACTIVE.move_to_end(key)
+    return solver
+
+
+def solve_anytime(desafio, time_budget=TIME_BUDGET_PADRAO, deadline=None, **params):
+    """
+    Interface anytime comum: retorna a melhor solução de 'desafio'
+    ('challenge_2', 'challenge_3' ou 'challenge_5') encontrada até o prazo,
+    com o limite e o gap de otimalidade. A busca continua em segundo plano;
+    repetir a chamada com os mesmos parâmetros devolve a resposta refinada.
+
+    Args:
+        time_budget: segundos de espera a partir desta chamada.
+        deadline: instante absoluto (time.monotonic()); tem precedência.
+        params: parâmetros do solver (k para challenge_2,
+            current_skills_list para challenge_5).
+    """
+    solver = get_anytime_solver(desafio, **params)
+    result = solver.result(time_budget, deadline)
+    result['Desafio'] = desafio
+    return result
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de benchmark de escala dos solvers.
+
+Executa cada solve_challenge_N (e cada motor alternativo) sobre catálogos
+sintéticos de tamanhos crescentes, com aquecimento, repetições, mediana/p95
+dos tempos e pico de memória (tracemalloc), e grava o relatório em JSON.
+O tracemalloc só enxerga o processo atual: nos casos multiprocesso
+(CASOS_MULTIPROCESSO) o pico não inclui a memória dos processos filhos.
+
+Uso:
+    python -m dynamic_programming_project.src.benchmark_utils --tamanhos 12 50 100 --saida bench.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ..data import get_habilidades, reset_catalog, use_catalog
+from .cache_utils import set_result_cache
+from .challenge_1 import COMPLEXIDADE_MAX, TARGET_SKILL, TEMPO_MAX, find_optimal_path_set, solve_challenge_1
+from .challenge_2 import solve_challenge_2
+from .challenge_3 import solve_challenge_3
+from .challenge_4 import solve_challenge_4
+from .challenge_5 import dp_recommendation, solve_challenge_5
+from .pareto_utils import compute_pareto_frontier
+from .synthetic_utils import generate_catalog
+
+TAMANHOS_PADRAO = (12, 50, 100, 200)
+AQUECIMENTO_PADRAO = 1
+REPETICOES_PADRAO = 5
+
+# (nome, função, maior tamanho de catálogo executado). Motores exponenciais
+# ou sensíveis ao número de estados ficam limitados a catálogos menores.
+CASOS = [
+    ('challenge_1/classico', lambda: solve_challenge_1(modo="classico", seed=0), None),
+    ('challenge_1/vetorizado', lambda: solve_challenge_1(modo="vetorizado", seed=0), None),
+    ('challenge_1/mochila', lambda: solve_challenge_1(modo="vetorizado", seed=0, motor="mochila"), None),
+    ('challenge_1/pareto', lambda: solve_challenge_1(modo="vetorizado", seed=0, motor="pareto"), 200),
+    ('challenge_1/paralelo', lambda: solve_challenge_1(modo="paralelo", seed=0), None),
+    ('challenge_2/permutacoes', lambda: solve_challenge_2(metodo="permutacoes"), None),
+    ('challenge_2/subconjuntos', lambda: solve_challenge_2(metodo="subconjuntos"), None),
+    ('challenge_2/arvore', lambda: solve_challenge_2(metodo="arvore"), None),
+    ('challenge_2/paralelo', lambda: solve_challenge_2(metodo="paralelo"), None),
+    ('challenge_3/exato', lambda: solve_challenge_3(), None),
+    ('challenge_3/auditoria', lambda: solve_challenge_3(auditoria=True), 100),
+    ('challenge_3/pareto', lambda: solve_challenge_3(motor="pareto"), None),
+    ('challenge_4/merge_sort', solve_challenge_4, None),
+    ('challenge_4/bottom_up', lambda: solve_challenge_4(algoritmo="iterativo"), None),
+    ('challenge_4/natural', lambda: solve_challenge_4(algoritmo="natural"), None),
+    ('challenge_4/trilhas_exato', lambda: solve_challenge_4(agendamento="exato", num_trilhas=3), None),
+    ('challenge_5/iterativo', lambda: solve_challenge_5(motor="iterativo"), 200),
+    ('challenge_5/recursivo', lambda: solve_challenge_5(motor="recursivo"), 100),
+    ('challenge_5/astar', lambda: solve_challenge_5(motor="astar"), None),
+    ('challenge_5/feixe', lambda: solve_challenge_5(motor="feixe"), None),
+    # Construção da fronteira sem memorização (os casos "pareto" acima medem as consultas)
+    ('pareto/fronteira', lambda: compute_pareto_frontier(get_habilidades(), None, TEMPO_MAX, COMPLEXIDADE_MAX), 200),
+]
+
+# Casos que distribuem o trabalho em processos filhos (pico de memória parcial)
+CASOS_MULTIPROCESSO = {'challenge_1/paralelo', 'challenge_2/paralelo'}
+
+
+def clear_solver_caches():
+    """
+    Limpa os caches em memória dos solvers recursivos. Sem isso, toda
+    repetição após o aquecimento mediria apenas consultas ao lru_cache.
+    """
+    find_optimal_path_set.cache_clear()
+    dp_recommendation.cache_clear()
+
+
+def measure(func, aquecimento=AQUECIMENTO_PADRAO, repeticoes=REPETICOES_PADRAO, reset=clear_solver_caches):
+    """
+    Mede uma função: 'aquecimento' execuções descartadas, 'repeticoes'
+    execuções cronometradas e uma execução extra sob tracemalloc (separada,
+    para não distorcer os tempos). 'reset' (se houver) roda antes de cada
+    execução, fora do cronômetro. Processos filhos não entram no pico.
+    """
+    def run():
+        if reset is not None:
+            reset()
+        t0 = time.perf_counter()
+        func()
+        return time.perf_counter() - t0
+
+    for _ in range(aquecimento):
+        run()
+
+    times = [run() for _ in range(repeticoes)]
+
+    if reset is not None:
+        reset()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'Repetições': repeticoes,
+        'Mediana (s)': statistics.median(times),
+        'P95 (s)': float(np.percentile(times, 95)),
+        'Mínimo (s)': min(times),
+        'Média (s)': statistics.fmean(times),
+        'Pico de Memória (bytes)': peak
+    }
+
+
+def run_benchmarks(tamanhos=TAMANHOS_PADRAO, casos=None, aquecimento=AQUECIMENTO_PADRAO,
+                   repeticoes=REPETICOES_PADRAO, seed=0, **parametros_catalogo):
+    """
+    Executa os casos de benchmark para cada tamanho de catálogo sintético.
+    O cache persistente de resultados fica desativado durante as medições e
+    os caches em memória são limpos antes de cada execução (ver
+    clear_solver_caches); o catálogo embutido e o cache são restaurados ao final.
+
+    Args:
+        casos: nomes dos casos a executar (padrão: todos de CASOS).
+        parametros_catalogo: repassados a generate_catalog (profundidade,
+            fan_in, distribuicoes, num_criticas).
+
+    Returns:
+        dict: Relatório com 'Metadados' e a lista de 'Resultados'.
+    """
+    selected = [c for c in CASOS if casos is None or c[0] in casos]
+    results = []
+    previous_cache = set_result_cache(None)
+    try:
+        for size in tamanhos:
+            habilidades, criticas = generate_catalog(
+                size, alvo=TARGET_SKILL, seed=seed, **parametros_catalogo
+            )
+            use_catalog(habilidades, criticas)
+            for name, func, max_size in selected:
+                entry = {'Caso': name, 'Tamanho': size}
+                if max_size is not None and size > max_size:
+                    entry['Status'] = 'Ignorado'
+                else:
+                    try:
+                        entry.update(measure(func, aquecimento, repeticoes))
+                        if name in CASOS_MULTIPROCESSO:
+                            entry['Observação'] = 'Pico de memória apenas do processo principal'
+                        entry['Status'] = 'Sucesso'
+                    except Exception as e:
+                        entry['Status'] = 'Erro'
+                        entry['Mensagem'] = f'{type(e).__name__}: {e}'
+                results.append(entry)
+    finally:
+        reset_catalog()
+        set_result_cache(previous_cache)
+
+    return {
+        'Metadados': {
+            'Data': datetime.now(timezone.utc).isoformat(),
+            'Python': platform.python_version(),
+            'NumPy': np.__version__,
+            'Plataforma': platform.platform(),
+            'Tamanhos': list(tamanhos),
+            'Aquecimento': aquecimento,
+            'Repetições': repeticoes,
+            'Seed': seed,
+            'Parâmetros do Catálogo': parametros_catalogo
+        },
+        'Resultados': results
+    }
+
+
+def write_report(report, path):
+    """Grava o relatório em JSON (UTF-8)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de escala dos solvers.')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--casos', nargs='+', default=None)
+    parser.add_argument('--aquecimento', type=int, default=AQUECIMENTO_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--profundidade', type=int, default=4)
+    parser.add_argument('--fan-in', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', default='benchmark.json')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        args.tamanhos, args.casos, args.aquecimento, args.repeticoes, args.seed,
+        profundidade=args.profundidade, fan_in=args.fan_in
+    )
+    write_report(report, args.saida)
+    for entry in report['Resultados']:
+        timing = f"{entry['Mediana (s)']:.4f}s" if 'Mediana (s)' in entry else entry['Status']
+        print(f"{entry['Caso']:<28} N={entry['Tamanho']:<6} {timing}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de cache persistente (SQLite) dos resultados dos solvers.
+
+Os resultados são indexados por (hash do conteúdo do catálogo, nome do
+solver, parâmetros), de modo que processos e réplicas do serviço que
+compartilham o arquivo reaproveitam respostas já calculadas. O hash do
+catálogo considera a ordem das habilidades, que define as posições de bit
+usadas nos parâmetros (bitmasks). O banco usa journal WAL (leitores
+concorrentes não bloqueiam o escritor) e descarta as entradas menos usadas
+recentemente acima de um número de entradas ou de um tamanho total.
+
+O cache é opcional: fica desativado até enable_result_cache() ser chamado
+ou a variável de ambiente DP_RESULT_CACHE apontar para um arquivo. Os
+valores são gravados em JSON (nunca desserializados como objetos Python) e
+o arquivo padrão fica em um diretório do próprio usuário, com permissão 0600.
+"""
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ..data import get_compiled_catalog
+
+MAX_ENTRADAS_PADRAO = 100_000
+MAX_BYTES_PADRAO = 64 * 1024 * 1024
+TIMEOUT_PADRAO = 5.0          # segundos de espera por um bloqueio de escrita
+RESOLUCAO_ACESSO = 1.0        # leituras só atualizam o instante de acesso após esse intervalo
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    chave TEXT PRIMARY KEY,
+    catalogo TEXT NOT NULL,
+    solver TEXT NOT NULL,
+    valor TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    ultimo_acesso REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resultados_acesso ON resultados (ultimo_acesso);
+CREATE TABLE IF NOT EXISTS totais (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entradas INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totais
+    SELECT 0, COUNT(*), COALESCE(SUM(tamanho), 0) FROM resultados;
+"""
+
+
+def default_cache_path():
+    """Arquivo padrão do cache, em um diretório de cache do usuário."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'dynamic_programming', 'resultados.sqlite3')
+
+
+def _create_private_file(path):
+    """Cria o diretório (0700) e o arquivo do banco (0600) se ainda não existirem."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    os.close(fd)
+
+
+class ResultCache:
+    """
+    Cache chave-valor em SQLite com despejo LRU por número de entradas e
+    por bytes (totais mantidos na tabela 'totais', atualizada na mesma
+    transação de cada escrita). Cada thread (e cada processo, após um fork)
+    abre a sua própria conexão. Falhas do banco são tratadas como ausência
+    no cache.
+
+    Args:
+        path: arquivo do banco.
+        max_entradas: número máximo de resultados guardados.
+        max_bytes: soma máxima dos tamanhos serializados.
+    """
+
+    def __init__(self, path, max_entradas=MAX_ENTRADAS_PADRAO, max_bytes=MAX_BYTES_PADRAO,
+                 timeout=TIMEOUT_PADRAO):
+        self.path = path
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        _create_private_file(path)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(catalog_hash, solver, params):
+        """Chave estável para (catálogo, solver, parâmetros serializáveis em JSON)."""
+        payload = json.dumps(params, sort_keys=True, separators=(',', ':'))
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f'{catalog_hash}:{solver}:{digest}'
+
+    def get(self, catalog_hash, solver, params):
+        """
+        Returns:
+            tuple: (encontrado, valor)
+        """
+        key = self.make_key(catalog_hash, solver, params)
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT valor, ultimo_acesso FROM resultados WHERE chave = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            now = time.time()
+            if now - row[1] >= RESOLUCAO_ACESSO:
+                conn.execute('UPDATE resultados SET ultimo_acesso = ? WHERE chave = ?', (now, key))
+            return True, json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            return False, None
+
+    def put(self, catalog_hash, solver, params, value):
+        """Grava um resultado e aplica o despejo LRU."""
+        key = self.make_key(catalog_hash, solver, params)
+        payload = json.dumps(value, separators=(',', ':'))
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                previous = conn.execute(
+                    'SELECT tamanho FROM resultados WHERE chave = ?', (key,)
+                ).fetchone()
+                conn.execute(
+                    'INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, catalog_hash, solver, payload, size, time.time())
+                )
+                if previous is None:
+                    conn.execute('UPDATE totais SET entradas = entradas + 1, bytes = bytes + ?', (size,))
+                else:
+                    conn.execute('UPDATE totais SET bytes = bytes + ?', (size - previous[0],))
+                self._evict(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn):
+        count, total = conn.execute('SELECT entradas, bytes FROM totais').fetchone()
+        if count <= self.max_entradas and total <= self.max_bytes:
+            return
+        excess_entries = max(0, count - self.max_entradas)
+        excess_bytes = max(0, total - self.max_bytes)
+        doomed = []
+        freed = 0
+        for key, size in conn.execute('SELECT chave, tamanho FROM resultados ORDER BY ultimo_acesso'):
+            if len(doomed) >= excess_entries and freed >= excess_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany('DELETE FROM resultados WHERE chave = ?', doomed)
+        conn.execute(
+            'UPDATE totais SET entradas = entradas - ?, bytes = bytes - ?', (len(doomed), freed)
+        )
+
+    def invalidate(self, catalog_hash=None, solver=None):
+        """Remove os resultados de um catálogo e/ou solver (todos, se ambos forem None)."""
+        clauses, args = [], []
+        if catalog_hash is not None:
+            clauses.append('catalogo = ?')
+            args.append(catalog_hash)
+        if solver is not None:
+            clauses.append('solver = ?')
+            args.append(solver)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(f'DELETE FROM resultados{where}', args)
+                conn.execute(
+                    'UPDATE totais SET entradas = (SELECT COUNT(*) FROM resultados), '
+                    'bytes = (SELECT COALESCE(SUM(tamanho), 0) FROM resultados)'
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            pass
+
+    def stats(self):
+        """Número de entradas e bytes ocupados pelos resultados."""
+        count, total = self._connection().execute('SELECT entradas, bytes FROM totais').fetchone()
+        return {'Entradas': count, 'Bytes': total, 'Arquivo': self.path}
+
+
+_RESULT_CACHE = ResultCache(os.environ['DP_RESULT_CACHE']) if os.environ.get('DP_RESULT_CACHE') else None
+
+def get_result_cache():
+    """Cache persistente em uso (None se desativado, o padrão)."""
+    return _RESULT_CACHE
+
+
+def set_result_cache(cache):
+    """
+    Troca o cache persistente (None desativa) e retorna o anterior, para
+    que possa ser restaurado.
+    """
+    global _RESULT_CACHE
+    previous, _RESULT_CACHE = _RESULT_CACHE, cache
+    return previous
+
+
+def enable_result_cache(path=None, max_entradas=MAX_ENTRADAS_PADRAO, max_bytes=MAX_BYTES_PADRAO):
+    """Ativa o cache persistente (padrão: default_cache_path()) e o retorna."""
+    cache = ResultCache(path or default_cache_path(), max_entradas, max_bytes)
+    set_result_cache(cache)
+    return cache
+
+
+def persistent_cache(solver, encode=None, decode=None):
+    """
+    Decorador que consulta o cache persistente (se ativado) antes de chamar
+    a função. 'encode' / 'decode' convertem o resultado de/para JSON.
+
+    Apenas a chamada mais externa usa o disco: chamadas recursivas feitas
+    durante o cálculo seguem direto para a função (e para o seu lru_cache,
+    se houver). Quando o hash do catálogo muda, o cache em memória da função
+    é limpo, então não é preciso limpá-lo a cada execução.
+    """
+    def decorator(func):
+        state = threading.local()
+        seen = {'catalog': None}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(state, 'depth', 0):
+                return func(*args, **kwargs)
+
+            catalog_hash = get_compiled_catalog().content_hash
+            if seen['catalog'] != catalog_hash:
+                if hasattr(func, 'cache_clear'):
+                    func.cache_clear()
+                seen['catalog'] = catalog_hash
+
+            cache = _RESULT_CACHE
+            params = [args, sorted(kwargs.items())]
+            if cache is not None:
+                found, value = cache.get(catalog_hash, solver, params)
+                if found:
+                    return decode(value) if decode else value
+
+            state.depth = 1
+            try:
+                value = func(*args, **kwargs)
+            finally:
+                state.depth = 0
+            if cache is not None:
+                cache.put(catalog_hash, solver, params, encode(value) if encode else value)
+            return value
+
+        if hasattr(func, 'cache_clear'):
+            wrapper.cache_clear = func.cache_clear
+            wrapper.cache_info = func.cache_info
+        return wrapper
+    return decorator
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de armazenamento colunar para catálogos grandes de habilidades.
+
+Converte catálogos em CSV/JSON para um diretório binário com:
+    - habilidades.npy: array estruturado (ID, Nome, Tempo, Valor, Complexidade, Uso);
+    - pre_reqs_offsets.npy / pre_reqs_ids.npy: pré-requisitos em formato CSR;
+    - meta.json: quantidade de habilidades e hash do conteúdo.
+O diretório é aberto com memory-map e exposto como um Mapping somente leitura,
+compatível com o dicionário HABILIDADES_MESTRE.
+"""
+import csv
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+ARQUIVO_HABILIDADES = 'habilidades.npy'
+ARQUIVO_OFFSETS = 'pre_reqs_offsets.npy'
+ARQUIVO_PRE_REQS = 'pre_reqs_ids.npy'
+ARQUIVO_META = 'meta.json'
+SEPARADOR_PRE_REQS = ';'
+
+
+def _read_records(source_path):
+    """Lê o catálogo de origem como uma lista de (ID, registro)."""
+    if source_path.lower().endswith('.json'):
+        with open(source_path, encoding='utf-8') as f:
+            raw = json.load(f)
+        if isinstance(raw, dict):
+            return list(raw.items())
+        return [(record['ID'], record) for record in raw]
+
+    # CSV: colunas ID, Nome, Tempo, Valor, Complexidade, Pre_Reqs ("S1;S3"), Uso
+    records = []
+    with open(source_path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            prereqs = row.get('Pre_Reqs') or ''
+            records.append((row['ID'], {
+                'Nome': row.get('Nome', ''),
+                'Tempo': float(row['Tempo']),
+                'Valor': float(row['Valor']),
+                'Complexidade': float(row['Complexidade']),
+                'Pre_Reqs': [p for p in prereqs.split(SEPARADOR_PRE_REQS) if p],
+                'Uso': row.get('Uso', '')
+            }))
+    return records
+
+
+def _numeric_column(values):
+    """Coluna inteira quando todos os valores são inteiros, senão float."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.size and np.all(array == np.round(array)):
+        return array.astype(np.int64)
+    return array
+
+
+def _text_width(values):
+    return max([1] + [len(v) for v in values])
+
+
+def ingest_catalog(source_path, output_dir):
+    """
+    Converte um catálogo CSV/JSON para o formato colunar em 'output_dir'.
+
+    Returns:
+        str: Hash do conteúdo gravado (identifica a versão do catálogo).
+    """
+    records = _read_records(source_path)
+    ids = [str(skill_id) for skill_id, _ in records]
+    names = [str(r.get('Nome', '')) for _, r in records]
+    uses = [str(r.get('Uso', '')) for _, r in records]
+    tempo = _numeric_column([r['Tempo'] for _, r in records])
+    valor = _numeric_column([r['Valor'] for _, r in records])
+    complexidade = _numeric_column([r['Complexidade'] for _, r in records])
+
+    prereq_lists = [[str(p) for p in r.get('Pre_Reqs', [])] for _, r in records]
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in prereq_lists])
+    flat_prereqs = [p for prereqs in prereq_lists for p in prereqs]
+
+    skills = np.zeros(len(records), dtype=[
+        ('ID', f'U{_text_width(ids)}'),
+        ('Nome', f'U{_text_width(names)}'),
+        ('Tempo', tempo.dtype),
+        ('Valor', valor.dtype),
+        ('Complexidade', complexidade.dtype),
+        ('Uso', f'U{_text_width(uses)}')
+    ])
+    skills['ID'] = ids
+    skills['Nome'] = names
+    skills['Tempo'] = tempo
+    skills['Valor'] = valor
+    skills['Complexidade'] = complexidade
+    skills['Uso'] = uses
+    prereq_ids = np.array(flat_prereqs, dtype=f'U{_text_width(flat_prereqs + ids)}')
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, ARQUIVO_HABILIDADES), skills)
+    np.save(os.path.join(output_dir, ARQUIVO_OFFSETS), offsets)
+    np.save(os.path.join(output_dir, ARQUIVO_PRE_REQS), prereq_ids)
+
+    digest = hashlib.sha256()
+    for array in (skills, offsets, prereq_ids):
+        digest.update(array.tobytes())
+    content_hash = digest.hexdigest()
+
+    with open(os.path.join(output_dir, ARQUIVO_META), 'w', encoding='utf-8') as f:
+        json.dump({'content_hash': content_hash, 'count': len(records)}, f)
+    return content_hash
+
+
+class ColumnarCatalog(Mapping):
+    """
+    Visão somente leitura (Mapping ID -> registro) sobre o catálogo colunar
+    memory-mapped. Os registros no formato de HABILIDADES_MESTRE são montados
+    no primeiro acesso a cada ID e reaproveitados nos acessos seguintes; só as
+    habilidades efetivamente consultadas ocupam memória como dicionário.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, ARQUIVO_META), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.content_hash = meta['content_hash']
+        self.skills = np.load(os.path.join(directory, ARQUIVO_HABILIDADES), mmap_mode='r')
+        self.offsets = np.load(os.path.join(directory, ARQUIVO_OFFSETS), mmap_mode='r')
+        self.prereq_ids = np.load(os.path.join(directory, ARQUIVO_PRE_REQS), mmap_mode='r')
+        self._position = None
+        self._rows = {}
+
+    @property
+    def position(self):
+        """Índice ID -> linha, construído no primeiro acesso por ID."""
+        if self._position is None:
+            self._position = {str(skill_id): i for i, skill_id in enumerate(self.skills['ID'])}
+        return self._position
+
+    def __getitem__(self, skill_id):
+        record = self._rows.get(skill_id)
+        if record is not None:
+            return record
+        i = self.position[skill_id]
+        row = self.skills[i]
+        record = self._rows[skill_id] = {
+            'Nome': str(row['Nome']),
+            'Tempo': row['Tempo'].item(),
+            'Valor': row['Valor'].item(),
+            'Complexidade': row['Complexidade'].item(),
+            'Pre_Reqs': [str(p) for p in self.prereq_ids[self.offsets[i]:self.offsets[i + 1]]],
+            'Uso': str(row['Uso'])
+        }
+        return record
+
+    def __iter__(self):
+        return (str(skill_id) for skill_id in self.skills['ID'])
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill_id):
+        return skill_id in self.position
+
+    def base_skills(self):
+        """IDs das habilidades sem pré-requisitos, direto do CSR."""
+        counts = np.diff(self.offsets)
+        return [str(skill_id) for skill_id in self.skills['ID'][counts == 0]]
+
+
+def open_catalog(directory):
+    """Abre (memory-map) um catálogo gerado por ingest_catalog."""
+    return ColumnarCatalog(directory)
@@ -5,10 +5,17 @@ Utiliza Programação Dinâmica (DP) para a solução determinística e
 Simulação de Monte Carlo para a solução com incerteza.
 """
 
+import os
 import random
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
-from ..data import get_habilidades
+from ..data import get_compiled_catalog, get_habilidades, get_skill_index
+from .cache_utils import persistent_cache
+from .graph_utils import get_transitive_closure
+from .knapsack_utils import solve_precedence_knapsack
+from .pareto_utils import get_pareto_frontier
+from .stats_utils import StreamingStats
 
 # ==============================
 # Constantes
@@ -18,56 +25,56 @@ COMPLEXIDADE_MAX = 30
 NUM_CENARIOS = 1000
 TARGET_SKILL = "S6"
 
+# Monte Carlo vetorizado
+MC_CHUNK_SIZE = 100_000          # cenários simulados por bloco (limita a memória)
+MC_QUANTIS = (0.05, 0.25, 0.5, 0.75, 0.95)
+MC_BINS = 50                     # bins do histograma retornado
+MC_CONFIANCA = 0.95              # nível de confiança do modo "convergencia"
+PERTURBACAO_MIN = 0.9
+PERTURBACAO_MAX = 1.1
+
 
 # ==============================
 # 1. DP: Encontrar o conjunto de habilidades necessário
 # ==============================
+def closure_mask(position):
+    """
+    Retorna a bitmask do fecho de pré-requisitos da habilidade na posição
+    'position' do índice (incluindo a própria habilidade), calculada sob
+    demanda pelo fecho transitivo do catálogo (ver graph_utils.TransitiveClosure).
+    """
+    return get_transitive_closure().mask(position)
+
+
+@persistent_cache(
+    "challenge_1.find_optimal_path_set",
+    encode=lambda result: [*result[:3], sorted(result[3])],
+    decode=lambda data: (*data[:3], frozenset(data[3]))
+)
 @lru_cache(maxsize=None)
 def find_optimal_path_set(skill_id):
     """
-    Calcula recursivamente o conjunto de habilidades exigido para atingir 'skill_id',
+    Calcula o conjunto de habilidades exigido para atingir 'skill_id',
     retornando os acumulados: (valor_total, tempo_total, complexidade_total, conjunto_habilidades).
-    """
 
-    habilidades = get_habilidades()
-    skill = habilidades.get(skill_id)
+    O fecho é montado com operações de bitmask (closure_mask), de modo que
+    nenhuma habilidade é contada duas vezes e os totais saem de uma única
+    passada sobre os bits ligados.
+    """
+    index = get_skill_index()
+    position = index.position.get(skill_id)
 
     # Habilidade inexistente
-    if skill is None:
+    if position is None:
         return 0, 0, 0, frozenset()
 
-    valor = skill["Valor"]
-    tempo = skill["Tempo"]
-    complexidade = skill["Complexidade"]
-    prereqs = skill["Pre_Reqs"]
-
-    # Caso base: habilidade sem pré-requisitos
-    if not prereqs:
-        return valor, tempo, complexidade, frozenset({skill_id})
-
-    # Acumula valores da própria habilidade
-    total_value = valor
-    total_time = tempo
-    total_complexity = complexidade
-    path_set = {skill_id}
-
-    # Obtém resultados dos pré-requisitos (memoizados)
-    prereq_results = [find_optimal_path_set(p) for p in prereqs]
-
-    for v, t, c, req_set in prereq_results:
-        # Calcula apenas habilidades novas (evita contagem duplicada)
-        new_skills = req_set - path_set
-
-        # Soma incremental
-        if new_skills:
-            total_value += sum(habilidades[s]["Valor"] for s in new_skills)
-            total_time += sum(habilidades[s]["Tempo"] for s in new_skills)
-            total_complexity += sum(habilidades[s]["Complexidade"] for s in new_skills)
-
-        # Atualiza caminho
-        path_set.update(req_set)
-
-    return total_value, total_time, total_complexity, frozenset(path_set)
+    mask = closure_mask(position)
+    return (
+        index.total(mask, "valor"),
+        index.total(mask, "tempo"),
+        index.total(mask, "complexidade"),
+        frozenset(index.ids_of(mask))
+    )
 
 
 # ==============================
@@ -81,55 +88,250 @@ def _simulate_scenario(habilidades, path_set):
 
     # Gera uma perturbação para cada skill do caminho
     return sum(
-        habilidades[s]["Valor"] * random.uniform(0.9, 1.1)
+        habilidades[s]["Valor"] * random.uniform(PERTURBACAO_MIN, PERTURBACAO_MAX)
         for s in path_set
     )
 
 
+def _path_values(habilidades, path_set):
+    """Vetor NumPy com o 'Valor' de cada habilidade do caminho (ordem estável)."""
+    return np.array([habilidades[s]["Valor"] for s in sorted(path_set)], dtype=float)
+
+
+def simulate_batch(valores, num_cenarios, rng):
+    """
+    Simula 'num_cenarios' cenários de uma só vez.
+    Sorteia uma matriz de perturbações (num_cenarios x |caminho|) e retorna
+    o vetor com o valor total de cada cenário.
+    """
+    perturbacoes = rng.uniform(PERTURBACAO_MIN, PERTURBACAO_MAX, size=(num_cenarios, valores.size))
+    return perturbacoes @ valores
+
+
+def _value_range(valores):
+    """Suporte exato do valor total simulado: [0.9 * V, 1.1 * V]."""
+    return PERTURBACAO_MIN * valores.sum(), PERTURBACAO_MAX * valores.sum()
+
+
+def _stats_result(stats, seed, bins):
+    """Converte um StreamingStats no dicionário de resultado do Monte Carlo."""
+    return {
+        "E[Valor total]": stats.mean,
+        "Desvio Padrão": stats.std(),
+        "Número de Cenários": stats.count,
+        "Quantis": stats.quantiles(),
+        "Histograma": stats.histogram() if bins else None,
+        "Semente": seed
+    }
+
+
+def monte_carlo_vectorized(habilidades, path_set, num_cenarios=NUM_CENARIOS, seed=None,
+                           chunk_size=MC_CHUNK_SIZE, quantis=MC_QUANTIS, bins=MC_BINS,
+                           tolerancia=None, confianca=MC_CONFIANCA):
+    """
+    Simulação de Monte Carlo vetorizada e reprodutível.
+
+    Os cenários são gerados em blocos de no máximo 'chunk_size' linhas com um
+    numpy.random.Generator criado a partir de 'seed'. Nenhum valor simulado é
+    guardado: as estatísticas são acumuladas em um StreamingStats de memória
+    constante, com histograma sobre o suporte conhecido [0.9 * V, 1.1 * V].
+    Use bins=None para omitir o histograma do resultado.
+
+    Se 'tolerancia' for informada, a simulação para assim que a meia-largura do
+    intervalo de confiança de E[Valor total] ficar abaixo dela; 'num_cenarios'
+    passa a ser o limite máximo de cenários.
+    """
+    rng = np.random.default_rng(seed)
+    valores = _path_values(habilidades, path_set)
+    stats = StreamingStats(quantis, faixa=_value_range(valores), bins=bins or MC_BINS)
+
+    restantes = num_cenarios
+    convergiu = False
+
+    while restantes > 0:
+        n = min(chunk_size, restantes)
+        stats.update_batch(simulate_batch(valores, n, rng))
+        restantes -= n
+
+        if tolerancia is not None and stats.ci_half_width(confianca) <= tolerancia:
+            convergiu = True
+            break
+
+    mc_result = _stats_result(stats, seed, bins)
+
+    if tolerancia is not None:
+        mc_result["Meia-Largura IC"] = stats.ci_half_width(confianca)
+        mc_result["Convergiu"] = convergiu
+
+    return mc_result
+
+
+def _simulate_chunk(valores, num_cenarios, seed_seq, quantis, bins):
+    """
+    Tarefa executada em um processo trabalhador: simula um bloco com o seu
+    próprio fluxo aleatório e retorna apenas o acumulador parcial.
+    """
+    stats = StreamingStats(quantis, faixa=_value_range(valores), bins=bins)
+    stats.update_batch(simulate_batch(valores, num_cenarios, np.random.default_rng(seed_seq)))
+    return stats
+
+
+def monte_carlo_parallel(habilidades, path_set, num_cenarios=NUM_CENARIOS, seed=None,
+                         chunk_size=MC_CHUNK_SIZE, quantis=MC_QUANTIS, bins=MC_BINS,
+                         workers=None):
+    """
+    Simulação de Monte Carlo distribuída em um ProcessPoolExecutor.
+
+    Os cenários são divididos em blocos de 'chunk_size' e cada bloco recebe um
+    filho de numpy.random.SeedSequence(seed).spawn(...). Os acumuladores parciais
+    são combinados no processo pai na ordem dos blocos, de modo que, para a mesma
+    semente e o mesmo 'chunk_size', o resultado não depende de 'workers'.
+    """
+    valores = _path_values(habilidades, path_set)
+    bins_internos = bins or MC_BINS
+
+    tamanhos = [chunk_size] * (num_cenarios // chunk_size)
+    if num_cenarios % chunk_size:
+        tamanhos.append(num_cenarios % chunk_size)
+    fluxos = np.random.SeedSequence(seed).spawn(len(tamanhos))
+
+    stats = StreamingStats(quantis, faixa=_value_range(valores), bins=bins_internos)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parciais = executor.map(
+            _simulate_chunk,
+            [valores] * len(tamanhos),
+            tamanhos,
+            fluxos,
+            [quantis] * len(tamanhos),
+            [bins_internos] * len(tamanhos),
+            chunksize=max(1, len(tamanhos) // (4 * workers))
+        )
+        # executor.map preserva a ordem dos blocos: a combinação é determinística
+        for parcial in parciais:
+            stats.merge(parcial)
+
+    mc_result = _stats_result(stats, seed, bins)
+    mc_result["Processos"] = workers
+    return mc_result
+
+
 # ==============================
 # 3. Execução do desafio
 # ==============================
-def solve_challenge_1():
-    """Executa a solução determinística e a versão com incerteza."""
+def solve_challenge_1(modo="classico", seed=None, num_cenarios=NUM_CENARIOS,
+                      chunk_size=MC_CHUNK_SIZE, bins=MC_BINS, tolerancia=None,
+                      confianca=MC_CONFIANCA, workers=None, motor="fecho"):
+    """
+    Executa a solução determinística e a versão com incerteza.
+
+    Motores da solução determinística:
+        - "fecho": fecho de pré-requisitos de TARGET_SKILL (find_optimal_path_set),
+          apenas verificado contra TEMPO_MAX / COMPLEXIDADE_MAX.
+        - "mochila": busca o melhor subconjunto fechado por pré-requisitos dentro
+          dos orçamentos (ver knapsack_utils.solve_precedence_knapsack).
+        - "pareto": consulta a fronteira de Pareto memorizada do catálogo
+          (ver pareto_utils.get_pareto_frontier) com os orçamentos atuais.
+
+    Modos do Monte Carlo:
+        - "classico": laço Python, retorna todos os 'Valores Simulados'.
+        - "vetorizado": motor NumPy em blocos com semente (ver monte_carlo_vectorized).
+        - "convergencia": como "vetorizado", mas para quando a meia-largura do IC
+          de E[Valor total] ficar abaixo de 'tolerancia' (num_cenarios = máximo).
+        - "paralelo": blocos distribuídos em 'workers' processos com fluxos
+          SeedSequence independentes (ver monte_carlo_parallel).
+    """
 
-    # Garante cache limpo
-    find_optimal_path_set.cache_clear()
+    # Garante catálogo atualizado (o cache de find_optimal_path_set é indexado
+    # pelo hash do catálogo, ver cache_utils.persistent_cache)
+    get_compiled_catalog()
 
     habilidades = get_habilidades()
 
     # ----- Solução determinística -----
-    total_value, total_time, total_complexity, path_frozen = find_optimal_path_set(TARGET_SKILL)
-    path_set = set(path_frozen)
-
-    if total_time > TEMPO_MAX or total_complexity > COMPLEXIDADE_MAX:
+    if motor == "mochila":
+        knapsack = solve_precedence_knapsack(habilidades, TEMPO_MAX, COMPLEXIDADE_MAX)
+        path_set = set(knapsack["Conjunto"])
         det_result = {
-            "Status": "Falha: Restrições excedidas",
-            "Valor Total": 0,
-            "Tempo Total": total_time,
-            "Complexidade Total": total_complexity,
-            "Caminho (Conjunto)": sorted(path_set)
+            "Status": "Sucesso" if path_set else "Falha: Nenhum conjunto viável",
+            "Valor Total": knapsack["Valor Total"],
+            "Tempo Total": knapsack["Tempo Total"],
+            "Complexidade Total": knapsack["Complexidade Total"],
+            "Caminho (Conjunto)": knapsack["Conjunto"],
+            "Método": knapsack["Método"],
+            "Exato": knapsack["Exato"]
         }
-    else:
+        if not knapsack["Exato"]:
+            det_result["Observação"] = (
+                "Aproximação: pré-requisitos compartilhados foram agregados ao custo "
+                "de cada habilidade; o conjunto é viável, mas pode não ser ótimo."
+            )
+    elif motor == "pareto":
+        frontier = get_pareto_frontier(tempo_max=TEMPO_MAX, complexidade_max=COMPLEXIDADE_MAX)
+        best = frontier.best_within(TEMPO_MAX, COMPLEXIDADE_MAX)
+        path_set = set(best["Conjunto"]) if best else set()
         det_result = {
-            "Status": "Sucesso",
-            "Valor Total": total_value,
-            "Tempo Total": total_time,
-            "Complexidade Total": total_complexity,
-            "Caminho (Conjunto)": sorted(path_set)
+            "Status": "Sucesso" if path_set else "Falha: Nenhum conjunto viável",
+            "Valor Total": best["Valor"] if best else 0,
+            "Tempo Total": best["Tempo"] if best else 0,
+            "Complexidade Total": best["Complexidade"] if best else 0,
+            "Caminho (Conjunto)": sorted(path_set),
+            "Exato": True,
+            "Pontos na Fronteira": len(frontier)
         }
+    elif motor == "fecho":
+        total_value, total_time, total_complexity, path_frozen = find_optimal_path_set(TARGET_SKILL)
+        path_set = set(path_frozen)
+
+        if total_time > TEMPO_MAX or total_complexity > COMPLEXIDADE_MAX:
+            det_result = {
+                "Status": "Falha: Restrições excedidas",
+                "Valor Total": 0,
+                "Tempo Total": total_time,
+                "Complexidade Total": total_complexity,
+                "Caminho (Conjunto)": sorted(path_set)
+            }
+        else:
+            det_result = {
+                "Status": "Sucesso",
+                "Valor Total": total_value,
+                "Tempo Total": total_time,
+                "Complexidade Total": total_complexity,
+                "Caminho (Conjunto)": sorted(path_set)
+            }
+    else:
+        raise ValueError(f"Motor determinístico desconhecido: {motor}")
 
     # ----- Simulação de Monte Carlo -----
-    simulated_values = [
-        _simulate_scenario(habilidades, path_set)
-        for _ in range(NUM_CENARIOS)
-    ]
-
-    mc_result = {
-        "E[Valor total]": float(np.mean(simulated_values)),
-        "Desvio Padrão": float(np.std(simulated_values)),
-        "Número de Cenários": NUM_CENARIOS,
-        "Valores Simulados": simulated_values
-    }
+    if modo in ("vetorizado", "convergencia"):
+        if modo == "convergencia" and tolerancia is None:
+            raise ValueError("O modo 'convergencia' exige uma tolerancia.")
+        mc_result = monte_carlo_vectorized(
+            habilidades, path_set, num_cenarios, seed=seed,
+            chunk_size=chunk_size, bins=bins,
+            tolerancia=tolerancia if modo == "convergencia" else None,
+            confianca=confianca
+        )
+    elif modo == "paralelo":
+        mc_result = monte_carlo_parallel(
+            habilidades, path_set, num_cenarios, seed=seed,
+            chunk_size=chunk_size, bins=bins, workers=workers
+        )
+    elif modo == "classico":
+        simulated_values = [
+            _simulate_scenario(habilidades, path_set)
+            for _ in range(num_cenarios)
+        ]
+
+        mc_result = {
+            "E[Valor total]": float(np.mean(simulated_values)),
+            "Desvio Padrão": float(np.std(simulated_values)),
+            "Número de Cenários": num_cenarios,
+            "Valores Simulados": simulated_values
+        }
+    else:
+        raise ValueError(f"Modo de Monte Carlo desconhecido: {modo}")
 
     return det_result, mc_result
 
@@ -4,7 +4,12 @@ Módulo para o Desafio 2: Verificação Crítica.
 Utiliza permutações para enumerar todas as ordens de aquisição das habilidades críticas
 e calcula o custo total (Tempo de Aquisição + Espera por pré-requisitos).
 """
-from itertools import permutations
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, permutations
+from math import factorial
+import numpy as np
 from ..data import get_habilidades, get_habilidades_criticas
 from .graph_utils import validate_graph, GraphValidationError
 
@@ -44,9 +49,285 @@ def calculate_acquisition_cost(skill_order, habilidades):
         
     return total_cost, total_wait_time
 
-def solve_challenge_2():
+def _score_order(order, habilidades):
+    """Avalia uma ordem com uma única chamada a calculate_acquisition_cost."""
+    total_cost, total_wait_time = calculate_acquisition_cost(order, habilidades)
+    return {'Ordem': list(order), 'Custo Total': total_cost, 'Tempo de Espera': total_wait_time}
+
+def _score_prefix_chunk(prefix, remaining, habilidades, k):
+    """
+    Tarefa de um processo trabalhador: avalia todas as ordens que começam com
+    'prefix' (em ordem lexicográfica) e mantém apenas as K melhores (heap de
+    tamanho K, estável para empates). Os dicionários de resultado só são
+    montados para as K ordens retidas.
+    """
+    scored = (
+        (calculate_acquisition_cost(order, habilidades), order)
+        for order in (prefix + rest for rest in permutations(remaining))
+    )
+    best = heapq.nsmallest(k, scored, key=lambda item: item[0][0])
+    return [
+        {'Ordem': list(order), 'Custo Total': cost, 'Tempo de Espera': wait}
+        for (cost, wait), order in best
+    ]
+
+def _cost_view(critical_skills, habilidades):
+    """
+    Recorte do catálogo lido por calculate_acquisition_cost: Tempo e Pre_Reqs
+    das habilidades críticas e Tempo dos seus pré-requisitos. É o único dado
+    enviado aos processos trabalhadores (o catálogo completo não é serializado).
+    """
+    view = {}
+    for skill_id in critical_skills:
+        skill_data = habilidades.get(skill_id)
+        if not skill_data:
+            continue
+        view[skill_id] = {'Tempo': skill_data['Tempo'], 'Pre_Reqs': list(skill_data['Pre_Reqs'])}
+        for prereq in skill_data['Pre_Reqs']:
+            if prereq not in view and prereq in habilidades:
+                view[prereq] = {'Tempo': habilidades[prereq]['Tempo'], 'Pre_Reqs': []}
+    return view
+
+def parallel_top_k_permutations(critical_skills, habilidades, k=3, workers=None):
+    """
+    Pontua todas as permutações em fluxo, distribuídas em um ProcessPoolExecutor.
+
+    As permutações são particionadas por prefixo (o menor comprimento que gera
+    ao menos 4 tarefas por processo); cada tarefa devolve só o seu top-K e o
+    processo pai combina os parciais na ordem dos prefixos. A memória é O(K)
+    por tarefa e o resultado é idêntico ao da lista completa ordenada. Cada
+    tarefa recebe apenas o recorte do catálogo usado no custo (_cost_view).
+    """
+    workers = workers or os.cpu_count() or 1
+    view = _cost_view(critical_skills, habilidades)
+    n = len(critical_skills)
+
+    depth = 0
+    tasks = 1
+    while depth < n - 1 and tasks < 4 * workers:
+        tasks *= n - depth
+        depth += 1
+
+    prefixes = list(permutations(critical_skills, depth))
+    remaining = [tuple(s for s in critical_skills if s not in prefix) for prefix in prefixes]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(
+            _score_prefix_chunk,
+            prefixes,
+            remaining,
+            [view] * len(prefixes),
+            [k] * len(prefixes)
+        )
+        # Os parciais chegam na ordem dos prefixos: nsmallest estável preserva o desempate
+        return heapq.nsmallest(
+            k,
+            (result for partial in partials for result in partial),
+            key=lambda r: r['Custo Total']
+        )
+
+def _step_cost_model(critical_skills, habilidades):
+    """
+    Decompõe o custo de adicionar cada habilidade crítica em função apenas do
+    conjunto já adquirido (bitmask sobre 'critical_skills').
+
+    Returns:
+        list: Para cada habilidade i, (tempo_aquisicao, espera_fixa, [(bit, tempo), ...]),
+        onde 'espera_fixa' soma os pré-requisitos fora do conjunto crítico (sempre
+        faltantes) e a lista traz os pré-requisitos críticos.
+    """
+    position = {skill_id: i for i, skill_id in enumerate(critical_skills)}
+    model = []
+    for skill_id in critical_skills:
+        skill_data = habilidades.get(skill_id)
+        if not skill_data:
+            model.append((0, 0, []))
+            continue
+        fixed_wait = sum(habilidades[p]['Tempo'] for p in skill_data['Pre_Reqs'] if p not in position)
+        critical_prereqs = [
+            (1 << position[p], habilidades[p]['Tempo'])
+            for p in skill_data['Pre_Reqs'] if p in position
+        ]
+        model.append((skill_data['Tempo'], fixed_wait, critical_prereqs))
+    return model
+
+def held_karp_cost_to_go(critical_skills, habilidades):
+    """
+    DP sobre subconjuntos (Held-Karp): best[mask] é o menor custo para adquirir
+    as habilidades que faltam a partir do conjunto 'mask'. Processa as máscaras
+    em camadas de popcount decrescente, vetorizadas com NumPy (O(2^k * k)).
+    """
+    k = len(critical_skills)
+    model = _step_cost_model(critical_skills, habilidades)
+    all_int = all(
+        isinstance(x, int)
+        for tempo, wait, prereqs in model
+        for x in [tempo, wait] + [t for _, t in prereqs]
+    )
+    dtype = np.int64 if all_int else np.float64
+    inf = np.iinfo(np.int64).max // 4 if all_int else np.inf
+
+    masks = np.arange(1 << k, dtype=np.int64)
+    popcount = np.zeros(1 << k, dtype=np.int64)
+    for i in range(k):
+        popcount += (masks >> i) & 1
+
+    best = np.full(1 << k, inf, dtype=dtype)
+    best[(1 << k) - 1] = 0
+
+    for size in range(k - 1, -1, -1):
+        layer = masks[popcount == size]
+        layer_best = np.full(layer.size, inf, dtype=dtype)
+        for i, (tempo, fixed_wait, prereqs) in enumerate(model):
+            lacking = ((layer >> i) & 1) == 0
+            cost = np.full(layer.size, tempo + fixed_wait, dtype=dtype)
+            for bit, prereq_time in prereqs:
+                cost += np.where(layer & bit, 0, prereq_time).astype(dtype)
+            candidate = np.where(lacking, cost + best[layer | (1 << i)], inf)
+            layer_best = np.minimum(layer_best, candidate)
+        best[layer] = layer_best
+
+    return best, model
+
+def iter_orders_by_cost(critical_skills, habilidades):
+    """
+    Gerador preguiçoso das ordens de aquisição em ordem crescente de custo.
+
+    Busca best-first sobre prefixos com prioridade custo_prefixo + best[mask]
+    (heurística exata da DP de Held-Karp), o que equivale a um backtracking
+    K-melhores: obter as K primeiras ordens custa O(K * k^2) expansões após a DP.
+    Empates saem na ordem lexicográfica de 'critical_skills', a mesma da
+    ordenação estável das permutações em solve_challenge_2.
+    """
+    k = len(critical_skills)
+    if k == 0:
+        return
+    best, model = held_karp_cost_to_go(critical_skills, habilidades)
+    best = best.tolist()
+    full = (1 << k) - 1
+    acquisition_total = sum(tempo for tempo, _, _ in model)
+
+    heap = [(best[0], (), 0, 0)]
+    while heap:
+        _, prefix, mask, cost = heapq.heappop(heap)
+        if mask == full:
+            yield {
+                'Ordem': [critical_skills[i] for i in prefix],
+                'Custo Total': cost,
+                'Tempo de Espera': cost - acquisition_total
+            }
+            continue
+        for i, (tempo, fixed_wait, prereqs) in enumerate(model):
+            if mask >> i & 1:
+                continue
+            step = tempo + fixed_wait + sum(t for bit, t in prereqs if not mask & bit)
+            new_mask = mask | (1 << i)
+            heapq.heappush(heap, (cost + step + best[new_mask], prefix + (i,), new_mask, cost + step))
+
+def top_k_orders(critical_skills, habilidades, k=3):
+    """Retorna as K ordens de menor custo (exatas) via iter_orders_by_cost."""
+    return list(islice(iter_orders_by_cost(critical_skills, habilidades), k))
+
+def anytime_orders(critical_skills, habilidades, k=3):
+    """
+    Gerador anytime para o Desafio 2 (ver anytime_utils): produz
+    (top_k_parcial, melhor_custo, limite_inferior) a cada melhoria.
+
+    1. Ordem gulosa (menor custo do próximo passo) contra o limite trivial
+       "todos os pré-requisitos críticos já adquiridos".
+    2. A DP de Held-Karp fixa o custo ótimo; as K melhores ordens são então
+       extraídas uma a uma de iter_orders_by_cost.
+    """
+    n = len(critical_skills)
+    if n == 0:
+        yield [], 0, 0
+        return
+
+    model = _step_cost_model(critical_skills, habilidades)
+    lower_bound = sum(tempo + fixed_wait for tempo, fixed_wait, _ in model)
+
+    mask = 0
+    greedy = []
+    for _ in range(n):
+        step_costs = [
+            (tempo + fixed_wait + sum(t for bit, t in prereqs if not mask & bit), i)
+            for i, (tempo, fixed_wait, prereqs) in enumerate(model) if not mask >> i & 1
+        ]
+        _, i = min(step_costs)
+        greedy.append(critical_skills[i])
+        mask |= 1 << i
+    greedy_result = _score_order(greedy, habilidades)
+    yield [greedy_result], greedy_result['Custo Total'], lower_bound
+
+    top = []
+    for result in islice(iter_orders_by_cost(critical_skills, habilidades), k):
+        top.append(result)
+        yield list(top), top[0]['Custo Total'], top[0]['Custo Total']
+
+def dfs_top_k_orders(critical_skills, habilidades, k=3):
+    """
+    Avalia as ordens percorrendo a árvore de permutações em profundidade.
+
+    Prefixos comuns são avaliados uma única vez: cada nó carrega o custo
+    parcial, a espera parcial e a bitmask adquirida, e o passo seguinte usa o
+    modelo de custo por conjunto (_step_cost_model). Um ramo é podado quando
+    custo_parcial + soma dos custos mínimos restantes já não supera a K-ésima
+    melhor ordem. As folhas são visitadas em ordem lexicográfica, logo os
+    empates seguem a mesma ordem de solve_challenge_2.
+    """
+    n = len(critical_skills)
+    if n == 0 or k <= 0:
+        return []
+
+    model = _step_cost_model(critical_skills, habilidades)
+    # Custo mínimo de cada habilidade (todos os pré-requisitos críticos já adquiridos)
+    min_step = [tempo + fixed_wait for tempo, fixed_wait, _ in model]
+    full = (1 << n) - 1
+
+    # Heap com as K melhores: a raiz é a pior (maior custo, visitada por último)
+    best = []
+    order = [0] * n
+    leaf_counter = [0]
+
+    def visit(depth, mask, cost, wait, remaining_min):
+        if len(best) == k and cost + remaining_min >= -best[0][0]:
+            return
+        if mask == full:
+            leaf_counter[0] += 1
+            entry = (-cost, -leaf_counter[0], wait, tuple(order))
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heapreplace(best, entry)
+            return
+        for i in range(n):
+            if mask >> i & 1:
+                continue
+            tempo, fixed_wait, prereqs = model[i]
+            step_wait = fixed_wait + sum(t for bit, t in prereqs if not mask & bit)
+            order[depth] = i
+            visit(depth + 1, mask | (1 << i), cost + tempo + step_wait,
+                  wait + step_wait, remaining_min - min_step[i])
+
+    visit(0, 0, 0, 0, sum(min_step))
+
+    return [
+        {'Ordem': [critical_skills[i] for i in indices], 'Custo Total': -neg_cost, 'Tempo de Espera': wait}
+        for neg_cost, _, wait, indices in sorted(best, reverse=True)
+    ]
+
+def solve_challenge_2(metodo="permutacoes", workers=None):
     """
     Resolve o Desafio 2: Verificação Crítica.
+
+    Métodos:
+        - "permutacoes": enumera todas as k! ordens (O(k! * k)).
+        - "subconjuntos": DP de Held-Karp sobre 2^k estados com extração exata
+          das melhores ordens (ver iter_orders_by_cost), viável até ~20 habilidades.
+        - "arvore": busca em profundidade na árvore de permutações com custo
+          incremental por prefixo e poda pela K-ésima melhor (ver dfs_top_k_orders).
+        - "paralelo": pontua todas as k! ordens em 'workers' processos mantendo
+          apenas um heap top-K (para modelos de custo sem estrutura de subconjunto).
     """
     habilidades = get_habilidades()
     critical_skills = get_habilidades_criticas()
@@ -60,32 +341,38 @@ def solve_challenge_2():
             'Mensagem': str(e)
         }
         
-    # 2. Enumeração das Permutações (120 permutações para 5 habilidades)
-    all_permutations = list(permutations(critical_skills))
-    
-    # 3. Cálculo do Custo para Cada Permutação
-    # List comprehension para calcular o custo de cada ordem
-    results = [
-        {
-            'Ordem': list(order),
-            'Custo Total': calculate_acquisition_cost(order, habilidades)[0],
-            'Tempo de Espera': calculate_acquisition_cost(order, habilidades)[1]
-        }
-        for order in all_permutations
-    ]
-    
-    # Ordena os resultados pelo Custo Total (menor é melhor)
-    results.sort(key=lambda x: x['Custo Total'])
-    
-    # 4. Reporta as 3 melhores ordens
-    top_3_results = results[:3]
-    
+    if metodo == "subconjuntos":
+        top_3_results = top_k_orders(critical_skills, habilidades, 3)
+        total_permutations = factorial(len(critical_skills))
+    elif metodo == "arvore":
+        top_3_results = dfs_top_k_orders(critical_skills, habilidades, 3)
+        total_permutations = factorial(len(critical_skills))
+    elif metodo == "paralelo":
+        top_3_results = parallel_top_k_permutations(critical_skills, habilidades, 3, workers)
+        total_permutations = factorial(len(critical_skills))
+    elif metodo == "permutacoes":
+        # 2. Enumeração das Permutações (120 permutações para 5 habilidades)
+        all_permutations = list(permutations(critical_skills))
+        total_permutations = len(all_permutations)
+
+        # 3. Cálculo do Custo para Cada Permutação
+        # List comprehension para calcular o custo de cada ordem
+        results = [_score_order(order, habilidades) for order in all_permutations]
+
+        # Ordena os resultados pelo Custo Total (menor é melhor)
+        results.sort(key=lambda x: x['Custo Total'])
+
+        # 4. Reporta as 3 melhores ordens
+        top_3_results = results[:3]
+    else:
+        raise ValueError(f"Método desconhecido: {metodo}")
+
     # Cálculo do custo médio das 3 melhores
     average_cost = sum(r['Custo Total'] for r in top_3_results) / 3
     
     return {
         'Status': 'Sucesso',
-        'Total de Permutações': len(all_permutations),
+        'Total de Permutações': total_permutations,
         'Top 3 Melhores Ordens': top_3_results,
         'Custo Médio das Top 3': average_cost,
         'Heurística Observada': 'As melhores ordens tendem a priorizar habilidades com pré-requisitos já adquiridos ou com menor tempo de aquisição.'
@@ -4,11 +4,18 @@ Módulo para o Desafio 3: Pivô Mais Rápido.
 Implementa uma solução gulosa baseada na razão Valor/Tempo (V/T) e uma
 solução ótima por busca exaustiva para comparação.
 """
+import math
+from bisect import bisect_left
 from itertools import combinations
+import numpy as np
 from ..data import get_habilidades, get_base_skills
+from .pareto_utils import get_pareto_frontier
 
 # Constantes do Desafio 3
 ADAPTABILIDADE_MINIMA = 15
+DP_MAX_CELULAS = 5_000_000  # limite de N * soma(Valor) para usar a DP por valor
+GRAY_BLOCK_BITS = 16        # bits avaliados em bloco (2^16 máscaras por bloco)
+BB_PULSO_NOS = 4096         # nós do branch-and-bound entre dois sinais de progresso
 
 def greedy_selection(base_skills, habilidades):
     """
@@ -76,10 +83,335 @@ def exhaustive_search(base_skills, habilidades):
 
     return optimal_path, optimal_value, optimal_time
 
-def solve_challenge_3():
+def _decode_reversed_mask(rev_mask, base_skills):
+    """Converte a máscara invertida (bit N-1-i = habilidade i) no caminho ordenado."""
+    n = len(base_skills)
+    return [base_skills[i] for i in range(n) if (rev_mask >> (n - 1 - i)) & 1]
+
+def min_time_dp(base_skills, habilidades):
+    """
+    Solução ótima por DP indexada pelo valor (pseudo-polinomial em soma(Valor)).
+
+    dp[v] guarda a melhor chave (tempo, tamanho, -máscara_invertida) entre os
+    subconjuntos com valor exatamente v. A máscara invertida (bit N-1-i para a
+    i-ésima habilidade) faz com que a maior máscara corresponda à combinação
+    lexicograficamente menor, reproduzindo o desempate de exhaustive_search:
+    menor tempo, depois maior valor, depois a primeira combinação enumerada.
+    Exige valores inteiros não negativos.
+
+    Returns:
+        tuple: (caminho_otimo, valor_otimo, tempo_otimo)
+    """
+    n = len(base_skills)
+    total_value = sum(habilidades[s]['Valor'] for s in base_skills)
+
+    dp = [None] * (total_value + 1)
+    dp[0] = (0, 0, 0)
+
+    for i, skill_id in enumerate(base_skills):
+        value = habilidades[skill_id]['Valor']
+        time = habilidades[skill_id]['Tempo']
+        bit = 1 << (n - 1 - i)
+
+        # Percorre v em ordem decrescente (cada habilidade usada no máximo uma vez)
+        for v in range(total_value, value - 1, -1):
+            prev = dp[v - value]
+            if prev is None:
+                continue
+            candidate = (prev[0] + time, prev[1] + 1, prev[2] - bit)
+            if dp[v] is None or candidate < dp[v]:
+                dp[v] = candidate
+
+    optimal_path = []
+    optimal_time = float('inf')
+    optimal_value = 0
+
+    for v in range(max(ADAPTABILIDADE_MINIMA, 0), total_value + 1):
+        if dp[v] is None or dp[v][1] == 0:
+            continue
+        # Tempo menor, ou mesmo tempo com valor maior (v é crescente)
+        if dp[v][0] <= optimal_time:
+            optimal_time = dp[v][0]
+            optimal_value = v
+            optimal_path = _decode_reversed_mask(-dp[v][2], base_skills)
+
+    return optimal_path, optimal_value, optimal_time
+
+def _branch_and_bound_steps(base_skills, habilidades):
+    """
+    Núcleo de branch_and_bound_search como gerador: produz (caminho, valor,
+    tempo) a cada nova melhor solução e None a cada BB_PULSO_NOS nós sem
+    melhoria, para que quem consome a busca (ver anytime_utils) possa
+    interrompê-la.
+    """
+    n = len(base_skills)
+    values = [habilidades[s]['Valor'] for s in base_skills]
+    times = [habilidades[s]['Tempo'] for s in base_skills]
+
+    # Soma dos valores a partir da posição i (para a poda de viabilidade)
+    suffix_value = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_value[i] = suffix_value[i + 1] + max(values[i], 0)
+
+    # Habilidades restantes ordenadas por tempo/valor, para o limite fracionário
+    by_ratio = sorted(
+        (i for i in range(n) if values[i] > 0),
+        key=lambda i: times[i] / values[i]
+    )
+
+    def time_lower_bound(start, deficit):
+        bound = 0.0
+        for i in by_ratio:
+            if deficit <= 0:
+                break
+            if i < start:
+                continue
+            take = min(1.0, deficit / values[i])
+            bound += take * times[i]
+            deficit -= take * values[i]
+        return bound
+
+    # Chave de comparação: (tempo, -valor, tamanho, caminho em índices)
+    best = None
+    nodes = 0
+
+    stack = [(0, 0, 0, ())]
+    while stack:
+        i, value, time, chosen = stack.pop()
+        nodes += 1
+        if nodes % BB_PULSO_NOS == 0:
+            yield None
+
+        if chosen and value >= ADAPTABILIDADE_MINIMA:
+            key = (time, -value, len(chosen), chosen)
+            if best is None or key < best:
+                best = key
+                yield [base_skills[j] for j in chosen], value, time
+
+        if i == n or value + suffix_value[i] < ADAPTABILIDADE_MINIMA:
+            continue
+        if best is not None:
+            deficit = ADAPTABILIDADE_MINIMA - value
+            if time + time_lower_bound(i, deficit) > best[0]:
+                continue
+
+        # Empilha "excluir" primeiro para explorar "incluir" antes
+        stack.append((i + 1, value, time, chosen))
+        stack.append((i + 1, value + values[i], time + times[i], chosen + (i,)))
+
+def branch_and_bound_search(base_skills, habilidades):
+    """
+    Solução ótima por branch-and-bound (aceita valores reais).
+
+    Decide incluir/excluir cada habilidade na ordem de 'base_skills' e poda um
+    ramo quando o valor restante não alcança ADAPTABILIDADE_MINIMA ou quando o
+    limite inferior de tempo (relaxação fracionária da cobertura de valor)
+    excede o melhor tempo já encontrado. O desempate é o de exhaustive_search.
+
+    Returns:
+        tuple: (caminho_otimo, valor_otimo, tempo_otimo)
+    """
+    best = ([], 0, float('inf'))
+    for incumbent in _branch_and_bound_steps(base_skills, habilidades):
+        if incumbent is not None:
+            best = incumbent
+    return best
+
+def _subset_table(values):
+    """Somas de 'values' para todas as 2^k máscaras (construção por duplicação)."""
+    table = np.zeros(1, dtype=values.dtype)
+    for v in values:
+        table = np.concatenate((table, table + v))
+    return table
+
+def gray_code_search(base_skills, habilidades, block_bits=GRAY_BLOCK_BITS):
+    """
+    Busca exaustiva (verdade-base para auditoria) com enumeração por código de Gray.
+
+    As habilidades são divididas em uma parte "alta", percorrida em código de
+    Gray (cada passo liga/desliga uma única habilidade e atualiza valor/tempo em
+    O(1)), e uma parte "baixa" de até 'block_bits' habilidades, cujas 2^k somas
+    são pré-calculadas e avaliadas em bloco com NumPy. Blocos em que o menor
+    tempo entre os subconjuntos que atingem ADAPTABILIDADE_MINIMA já excede o
+    melhor tempo encontrado são podados. O resultado e o desempate são
+    idênticos aos de exhaustive_search (com valores reais, a menos de empates
+    afetados por arredondamento).
+
+    Returns:
+        tuple: (caminho_otimo, valor_otimo, tempo_otimo)
+    """
+    n = len(base_skills)
+    raw_values = [habilidades[s]['Valor'] for s in base_skills]
+    raw_times = [habilidades[s]['Tempo'] for s in base_skills]
+    dtype = np.int64 if all(isinstance(x, int) for x in raw_values + raw_times) else np.float64
+
+    # As habilidades mais demoradas ficam na parte alta (poda de blocos mais forte)
+    order = sorted(range(n), key=lambda i: raw_times[i])
+    low = order[:min(block_bits, n)]
+    high = order[len(low):]
+
+    # Máscara invertida (bit N-1-i): maior máscara = combinação lexicograficamente menor
+    rev_bit = [1 << (n - 1 - i) for i in range(n)]
+
+    low_value = _subset_table(np.array([raw_values[i] for i in low], dtype=dtype))
+    low_time = _subset_table(np.array([raw_times[i] for i in low], dtype=dtype))
+    low_size = _subset_table(np.ones(len(low), dtype=np.int64))
+    low_rev = _subset_table(np.array([rev_bit[i] for i in low], dtype=np.int64))
+
+    # Subconjuntos baixos por valor crescente, com o menor tempo a partir de
+    # cada posição: o menor tempo da parte baixa que cobre um déficit de valor
+    # sai de uma busca binária
+    by_value = np.argsort(low_value, kind='stable')
+    sorted_low_value = low_value[by_value].tolist()
+    min_time_from = np.minimum.accumulate(low_time[by_value][::-1])[::-1].tolist()
+
+    # Melhor chave: (tempo, -valor, tamanho, -máscara_invertida)
+    best = None
+
+    high_value = 0
+    high_time = 0
+    high_size = 0
+    high_rev = 0
+    gray = 0
+
+    for step in range(1 << len(high)):
+        if step:
+            # Bit que muda entre gray(step - 1) e gray(step): atualização O(1)
+            j = (step & -step).bit_length() - 1
+            gray ^= 1 << j
+            sign = 1 if (gray >> j) & 1 else -1
+            i = high[j]
+            high_value += sign * raw_values[i]
+            high_time += sign * raw_times[i]
+            high_size += sign
+            high_rev += sign * rev_bit[i]
+
+        # Poda do bloco inteiro: nenhum subconjunto baixo cobre o déficit de
+        # valor, ou o mais rápido entre os que cobrem não melhora o tempo
+        k = bisect_left(sorted_low_value, ADAPTABILIDADE_MINIMA - high_value)
+        if k == len(sorted_low_value):
+            continue
+        if best is not None and high_time + min_time_from[k] > best[0]:
+            continue
+
+        total_time = low_time + high_time
+        total_value = low_value + high_value
+        total_size = low_size + high_size
+
+        candidates = (total_value >= ADAPTABILIDADE_MINIMA) & (total_size > 0)
+        if best is not None:
+            candidates &= total_time <= best[0]
+        if not candidates.any():
+            continue
+
+        # Desempate vetorizado: menor tempo, maior valor, menor tamanho, menor combinação
+        idx = np.flatnonzero(candidates)
+        idx = idx[total_time[idx] == total_time[idx].min()]
+        idx = idx[total_value[idx] == total_value[idx].max()]
+        idx = idx[total_size[idx] == total_size[idx].min()]
+        k = idx[np.argmax(low_rev[idx])]
+
+        key = (total_time[k].item(), -total_value[k].item(), int(total_size[k]), -(int(low_rev[k]) + high_rev))
+        if best is None or key < best:
+            best = key
+
+    if best is None:
+        return [], 0, float('inf')
+
+    # Totais recalculados a partir do conjunto escolhido (as somas
+    # incrementais em ponto flutuante acumulam erro de arredondamento)
+    path = _decode_reversed_mask(-best[3], base_skills)
+    return path, sum(habilidades[s]['Valor'] for s in path), sum(habilidades[s]['Tempo'] for s in path)
+
+def _use_value_dp(base_skills, habilidades):
+    """A DP por valor exige valores inteiros e uma tabela de até DP_MAX_CELULAS."""
+    values = [habilidades[s]['Valor'] for s in base_skills]
+    integral = all(isinstance(v, int) and v >= 0 for v in values)
+    return integral and ADAPTABILIDADE_MINIMA > 0 and len(values) * sum(values) <= DP_MAX_CELULAS
+
+def exact_search(base_skills, habilidades):
+    """
+    Escolhe automaticamente o solver exato conforme o tamanho da entrada.
+
+    Returns:
+        tuple: (caminho_otimo, valor_otimo, tempo_otimo, metodo)
+    """
+    if _use_value_dp(base_skills, habilidades):
+        return (*min_time_dp(base_skills, habilidades), 'DP por Valor')
+    return (*branch_and_bound_search(base_skills, habilidades), 'Branch-and-Bound')
+
+def pareto_search(base_skills):
+    """
+    Solução ótima consultada na fronteira de Pareto das habilidades base
+    (ver pareto_utils): menor Tempo com Valor >= ADAPTABILIDADE_MINIMA.
+    A fronteira fica memorizada, então outras metas não refazem a busca.
+
+    Returns:
+        tuple: (caminho_otimo, valor_otimo, tempo_otimo, metodo)
+    """
+    point = get_pareto_frontier(candidatos=base_skills).min_time_for_value(ADAPTABILIDADE_MINIMA)
+    if point is None:
+        return [], 0, float('inf'), 'Fronteira de Pareto'
+    return point['Conjunto'], point['Valor'], point['Tempo'], 'Fronteira de Pareto'
+
+def fractional_time_bound(base_skills, habilidades):
+    """
+    Limite inferior do tempo ótimo pela relaxação contínua: habilidades em
+    ordem decrescente de Valor/Tempo, a última tomada fracionariamente até
+    atingir ADAPTABILIDADE_MINIMA. Retorna None se a meta for inatingível.
+    Habilidades sem Valor não ajudam a atingir a meta e são ignoradas.
+    """
+    skills = sorted(
+        (habilidades[s] for s in base_skills if habilidades[s]['Valor'] > 0),
+        key=lambda skill: skill['Valor'] / skill['Tempo'] if skill['Tempo'] else float('inf'),
+        reverse=True
+    )
+    missing = ADAPTABILIDADE_MINIMA
+    bound = 0
+    for skill in skills:
+        if missing <= 0:
+            break
+        fraction = min(1.0, missing / skill['Valor'])
+        bound += fraction * skill['Tempo']
+        missing -= skill['Valor']
+    return bound if missing <= 0 else None
+
+def anytime_pivot(base_skills, habilidades):
+    """
+    Gerador anytime para o Desafio 3 (ver anytime_utils): produz
+    (solução, tempo, limite_inferior) — primeiro a solução gulosa contra a
+    relaxação contínua, depois a solução ótima. Com o branch-and-bound, cada
+    nova melhor solução é produzida assim que encontrada (e None entre elas,
+    como sinal de progresso); o limite só vira o tempo ótimo ao final.
+    """
+    greedy_path, greedy_value, greedy_time = greedy_selection(base_skills, habilidades)
+    bound = fractional_time_bound(base_skills, habilidades)
+    if bound is not None:
+        yield {'Caminho': greedy_path, 'Valor': greedy_value, 'Tempo': greedy_time}, greedy_time, bound
+
+    if _use_value_dp(base_skills, habilidades):
+        path, value, optimal_time = min_time_dp(base_skills, habilidades)
+        method = 'DP por Valor'
+    else:
+        path, value, optimal_time = [], 0, float('inf')
+        method = 'Branch-and-Bound'
+        for incumbent in _branch_and_bound_steps(base_skills, habilidades):
+            if incumbent is None:
+                yield None
+                continue
+            path, value, optimal_time = incumbent
+            yield {'Caminho': path, 'Valor': value, 'Tempo': optimal_time, 'Método': method}, optimal_time, bound
+    yield {'Caminho': path, 'Valor': value, 'Tempo': optimal_time, 'Método': method}, optimal_time, optimal_time
+
+def solve_challenge_3(auditoria=False, motor="exato"):
     """
     Resolve o Desafio 3: Pivô Mais Rápido.
-    Compara a solução gulosa com a solução ótima por busca exaustiva.
+    Compara a solução gulosa com a solução ótima, obtida pelo solver exato
+    mais adequado ao tamanho da entrada (ver exact_search).
+
+    Com auditoria=True, a solução ótima também é conferida contra a busca
+    exaustiva por código de Gray (gray_code_search). Com motor="pareto", a
+    solução ótima vem da fronteira de Pareto memorizada (pareto_search).
     """
     habilidades = get_habilidades()
     base_skills = get_base_skills()
@@ -87,8 +419,13 @@ def solve_challenge_3():
     # 1. Solução Gulosa
     greedy_path, greedy_value, greedy_time = greedy_selection(base_skills, habilidades)
 
-    # 2. Solução Ótima (Busca Exaustiva)
-    optimal_path, optimal_value, optimal_time = exhaustive_search(base_skills, habilidades)
+    # 2. Solução Ótima (DP por valor, branch-and-bound ou fronteira de Pareto)
+    if motor == "exato":
+        optimal_path, optimal_value, optimal_time, optimal_method = exact_search(base_skills, habilidades)
+    elif motor == "pareto":
+        optimal_path, optimal_value, optimal_time, optimal_method = pareto_search(base_skills)
+    else:
+        raise ValueError(f"Motor desconhecido: {motor}")
 
     # 3. Comparação e Contraexemplo
     is_greedy_optimal = (greedy_time == optimal_time)
@@ -97,20 +434,34 @@ def solve_challenge_3():
     contraexemplo = None
     if not is_greedy_optimal:
         contraexemplo = {
-            'Descrição': "A solução gulosa nem sempre é ótima. Neste caso, a busca exaustiva encontrou uma combinação de habilidades com menor tempo total para atingir a adaptabilidade mínima.",
+            'Descrição': "A solução gulosa nem sempre é ótima. Neste caso, a busca exata encontrou uma combinação de habilidades com menor tempo total para atingir a adaptabilidade mínima.",
             'Solução Gulosa': {'Caminho': greedy_path, 'Valor': greedy_value, 'Tempo': greedy_time},
             'Solução Ótima': {'Caminho': optimal_path, 'Valor': optimal_value, 'Tempo': optimal_time}
         }
 
-    return {
+    result = {
         'Status': 'Sucesso',
         'Solução Gulosa': {'Caminho': greedy_path, 'Valor': greedy_value, 'Tempo': greedy_time},
         'Solução Ótima': {'Caminho': optimal_path, 'Valor': optimal_value, 'Tempo': optimal_time},
+        'Método Ótimo': optimal_method,
         'Gulosa é Ótima?': is_greedy_optimal,
         'Contraexemplo': contraexemplo,
-        'Discussão de Complexidade': "A heurística gulosa (O(N log N) devido à ordenação) é muito mais rápida que a busca exaustiva (O(2^N)), sendo aceitável para um grande número de habilidades base, onde a solução ótima é computacionalmente inviável. No entanto, não garante a otimalidade."
+        'Discussão de Complexidade': "A heurística gulosa (O(N log N) devido à ordenação) é muito mais rápida que a busca exaustiva (O(2^N)), sendo aceitável para um grande número de habilidades base, onde a solução ótima é computacionalmente inviável. No entanto, não garante a otimalidade. A solução ótima é obtida por DP indexada pelo valor (O(N * soma(Valor))) ou, para entradas grandes ou com valores reais, por branch-and-bound."
     }
 
+    if auditoria:
+        audit_path, audit_value, audit_time = gray_code_search(base_skills, habilidades)
+        result['Auditoria'] = {
+            'Caminho': audit_path,
+            'Valor': audit_value,
+            'Tempo': audit_time,
+            # Tolerância: com valores reais, somas em ordens diferentes divergem no último dígito
+            'Confere?': (math.isclose(audit_time, optimal_time, rel_tol=1e-9, abs_tol=1e-9)
+                         and math.isclose(audit_value, optimal_value, rel_tol=1e-9, abs_tol=1e-9))
+        }
+
+    return result
+
 import matplotlib.pyplot as plt
 
 def plot_greedy_vs_optimal(time_greedy, time_optimal):
@@ -7,8 +7,17 @@ Objetivo:
     Comparar o tempo do algoritmo implementado com o sort nativo do Python.
 """
 
+import heapq
 import time
+from functools import lru_cache
+
+import numpy as np
+
 from ..data import get_habilidades
+from .schedule_utils import schedule_tracks
+
+INITIAL_RUN_WIDTH = 1024  # corridas iniciais formadas pela rede de Batcher (potência de 2)
+NUMPY_MIN_N = 256         # abaixo disso, o custo fixo das chamadas NumPy domina
 
 
 # ------------------------------------------------------------
@@ -44,17 +53,223 @@ def merge(left, right, key):
     return result
 
 
+# ------------------------------------------------------------
+# MERGE SORT ITERATIVO (BOTTOM-UP) E NATURAL (K-WAY)
+# ------------------------------------------------------------
+def _merge_pass_numpy(src, dst, free, width, offset):
+    """
+    Uma passada bottom-up vetorizada: mescla todos os pares de corridas
+    adjacentes de tamanho 'width' de uma vez.
+
+    Cada bloco (par de corridas) é deslocado por bloco * offset, de modo que a
+    concatenação de todas as corridas esquerdas (e a de todas as direitas)
+    fica globalmente ordenada. A posição final de cada elemento da esquerda é
+    a sua posição t mais um searchsorted na direita; os da direita ocupam, em
+    ordem, as posições que sobraram ('free' é um buffer booleano reutilizado).
+    """
+    blocks = src.reshape(-1, 2, width)
+    shift = (np.arange(blocks.shape[0], dtype=np.int64) * offset)[:, None]
+    left = (blocks[:, 0, :] + shift).ravel()
+    right = (blocks[:, 1, :] + shift).ravel()
+
+    left_pos = np.searchsorted(right, left)
+    left_pos += np.arange(left.size, dtype=np.int64)
+    dst[left_pos] = blocks[:, 0, :].ravel()
+
+    free.fill(True)
+    free[left_pos] = False
+    dst[free] = blocks[:, 1, :].ravel()
+
+
+@lru_cache(maxsize=None)
+def _odd_even_merge_pairs(width):
+    """Comparadores da rede de Batcher (odd-even merge sort) para 'width' = 2^k."""
+    pairs = []
+    p = 1
+    while p < width:
+        k = p
+        while k >= 1:
+            for j in range(k % p, width - k, 2 * k):
+                for i in range(min(k, width - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return tuple(pairs)
+
+
+def _initial_runs(src, width):
+    """
+    Forma corridas ordenadas de tamanho 'width' aplicando a rede de Batcher a
+    todos os blocos ao mesmo tempo (cada comparador é um min/max vetorizado
+    sobre uma linha contígua da matriz transposta). Substitui as primeiras
+    log2(width) passadas, como as corridas mínimas do Timsort.
+    """
+    columns = np.ascontiguousarray(src.reshape(-1, width).T)
+    low = np.empty_like(columns[0])
+    for a, b in _odd_even_merge_pairs(width):
+        np.minimum(columns[a], columns[b], out=low)
+        np.maximum(columns[a], columns[b], out=columns[b])
+        columns[a] = low
+    src.reshape(-1, width)[:] = columns.T
+
+
+def _bottom_up_numpy(keys, span):
+    """
+    Ordem estável das chaves inteiras (já deslocadas para [0, span)).
+
+    A chave composta chave * n + índice é única, o que torna a mesclagem
+    estável sem tratamento de empates; o vetor é completado até uma potência
+    de 2 com sentinelas maiores que qualquer chave real.
+    """
+    n = keys.size
+    size = 1 << (n - 1).bit_length()
+    limit = span * n
+    src = np.empty(size, dtype=np.int64)
+    src[:n] = keys * n + np.arange(n, dtype=np.int64)
+    src[n:] = limit + np.arange(size - n, dtype=np.int64)
+    dst = np.empty_like(src)
+    free = np.empty(size, dtype=bool)
+
+    offset = limit + size
+    # Cada comparador da rede opera sobre uma linha de size / width blocos:
+    # corridas iniciais menores mantêm as linhas longas (>= 1024) em vetores médios
+    width = min(INITIAL_RUN_WIDTH, max(1, size >> 10))
+    _initial_runs(src, width)
+    while width < size:
+        _merge_pass_numpy(src, dst, free, width, offset)
+        src, dst = dst, src
+        width *= 2
+    return src[:n] % n
+
+
+def _merge_pass_python(src_keys, src_idx, dst_keys, dst_idx, width):
+    """Uma passada bottom-up em Python puro (chaves não inteiras)."""
+    n = len(src_keys)
+    for lo in range(0, n, 2 * width):
+        mid = min(lo + width, n)
+        hi = min(lo + 2 * width, n)
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+            if src_keys[i] <= src_keys[j]:
+                dst_keys[k] = src_keys[i]
+                dst_idx[k] = src_idx[i]
+                i += 1
+            else:
+                dst_keys[k] = src_keys[j]
+                dst_idx[k] = src_idx[j]
+                j += 1
+            k += 1
+        dst_keys[k:k + mid - i] = src_keys[i:mid]
+        dst_idx[k:k + mid - i] = src_idx[i:mid]
+        k += mid - i
+        dst_keys[k:k + hi - j] = src_keys[j:hi]
+        dst_idx[k:k + hi - j] = src_idx[j:hi]
+
+
+def merge_sort_bottom_up(data, key=lambda x: x):
+    """
+    Merge Sort iterativo (bottom-up) e estável.
+
+    As chaves são calculadas uma única vez (decorate-sort-undecorate) e as
+    passadas alternam entre dois buffers pré-alocados (ping-pong), sem
+    recursão nem fatiamento por nível. Chaves inteiras a partir de
+    NUMPY_MIN_N elementos usam passadas vetorizadas em NumPy; as demais
+    entradas usam a mesclagem simples em Python puro, que, como toda
+    mesclagem interpretada, fica uma ordem de grandeza atrás de sorted()
+    (ver SORT_ALGORITHMS e o comparativo de solve_challenge_4).
+    """
+    n = len(data)
+    if n <= 1:
+        return list(data)
+
+    keys = [key(x) for x in data]
+    array = np.asarray(keys) if n >= NUMPY_MIN_N else None
+    if array is not None and array.dtype.kind in 'iu':
+        k_min = int(array.min())
+        span = int(array.max()) - k_min + 1
+        # O deslocamento bloco * offset precisa caber em int64
+        if (span * n + 2 * n) * n < (1 << 62):
+            order = _bottom_up_numpy(array.astype(np.int64) - k_min, span)
+            return [data[i] for i in order.tolist()]
+
+    src_keys, src_idx = keys, list(range(n))
+    dst_keys, dst_idx = [None] * n, [0] * n
+    width = 1
+    while width < n:
+        _merge_pass_python(src_keys, src_idx, dst_keys, dst_idx, width)
+        src_keys, dst_keys = dst_keys, src_keys
+        src_idx, dst_idx = dst_idx, src_idx
+        width *= 2
+    return [data[i] for i in src_idx]
+
+
+def detect_runs(keys):
+    """
+    Divide a sequência em corridas naturais (estilo Timsort): trechos não
+    decrescentes ou estritamente decrescentes (invertidos, o que preserva a
+    estabilidade). Retorna a lista de (inicio, fim, decrescente).
+    """
+    runs = []
+    n = len(keys)
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and keys[hi] < keys[lo]:
+            while hi < n and keys[hi] < keys[hi - 1]:
+                hi += 1
+            runs.append((lo, hi, True))
+        else:
+            while hi < n and keys[hi] >= keys[hi - 1]:
+                hi += 1
+            runs.append((lo, hi, False))
+        lo = hi
+    return runs
+
+
+def natural_merge_sort(data, key=lambda x: x):
+    """
+    Merge Sort natural: detecta as corridas já ordenadas e as mescla de uma
+    vez com heapq.merge (k-way, O(N log k)). Ideal para entradas formadas por
+    poucos blocos pré-ordenados; heapq.merge resolve empates em favor da
+    corrida anterior, mantendo a ordenação estável.
+    """
+    keys = [key(x) for x in data]
+    iterables = []
+    for lo, hi, descending in detect_runs(keys):
+        if descending:
+            iterables.append([(keys[i], i) for i in range(hi - 1, lo - 1, -1)])
+        else:
+            iterables.append(zip(keys[lo:hi], range(lo, hi)))
+
+    return [data[i] for _, i in heapq.merge(*iterables, key=lambda pair: pair[0])]
+
+
+SORT_ALGORITHMS = {
+    'recursivo': ('Merge Sort (Implementação Própria)', merge_sort),
+    'iterativo': ('Merge Sort Bottom-Up (Implementação Própria)', merge_sort_bottom_up),
+    'natural': ('Merge Sort Natural K-Way (Implementação Própria)', natural_merge_sort),
+}
+
+
 # ------------------------------------------------------------
 # SOLUÇÃO DO DESAFIO
 # ------------------------------------------------------------
-def solve_challenge_4():
+def solve_challenge_4(algoritmo="recursivo", num_trilhas=2, agendamento="lista"):
     """
     Resolve o Desafio 4:
         - Lê as habilidades
         - Ordena por 'Complexidade' usando Merge Sort
-        - Divide em Sprint A / Sprint B
+          ("recursivo", "iterativo" bottom-up ou "natural" k-way)
+        - Agenda as habilidades em 'num_trilhas' trilhas paralelas respeitando
+          os pré-requisitos e minimizando o makespan (ver schedule_utils);
+          Sprint A / Sprint B são as duas primeiras trilhas
         - Compara tempo com sort nativo
     """
+    if algoritmo not in SORT_ALGORITHMS:
+        raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+    algorithm_name, sort_func = SORT_ALGORITHMS[algoritmo]
+
     habilidades = get_habilidades()
 
     # prepara lista de objetos para ordenar
@@ -73,7 +288,7 @@ def solve_challenge_4():
     # Tempo – Merge Sort próprio
     # ------------------------------
     t0 = time.perf_counter()
-    sorted_merge = merge_sort(dataset, key=key_func)
+    sorted_merge = sort_func(dataset, key=key_func)
     t1 = time.perf_counter()
     time_merge = t1 - t0
 
@@ -85,17 +300,29 @@ def solve_challenge_4():
     t3 = time.perf_counter()
     time_native = t3 - t2
 
-    # divide em sprints
-    sprint_a = sorted_merge[:6]
-    sprint_b = sorted_merge[6:]
+    # agenda as trilhas paralelas (substitui a divisão fixa 6/6, que ignorava
+    # pré-requisitos e tempo)
+    cronograma = schedule_tracks(num_trilhas, agendamento)
+    records = {item['ID']: item for item in dataset}
+    trilhas = [
+        [dict(records[etapa['ID']], **etapa) for etapa in trilha]
+        for trilha in cronograma['Trilhas']
+    ]
+    sprint_a = trilhas[0]
+    sprint_b = trilhas[1] if len(trilhas) > 1 else []
 
     return {
         'Status': 'Sucesso',
-        'Algoritmo': 'Merge Sort (Implementação Própria)',
+        'Algoritmo': algorithm_name,
         'Complexidade': 'O(N log N)',
         'Ordenado por Complexidade': sorted_merge,
         'Sprint A': sprint_a,
         'Sprint B': sprint_b,
+        'Trilhas': trilhas,
+        'Makespan': cronograma['Makespan'],
+        'Limite Inferior do Makespan': cronograma['Limite Inferior'],
+        'Agendamento': cronograma['Método'],
+        'Agendamento Ótimo?': cronograma['Exato'],
         'Tempo Merge Sort': time_merge,
         'Tempo Sort Nativo': time_native
     }
\ No newline at end of file
@@ -6,12 +6,28 @@ Módulo para o Desafio 5: Recomendar Próximas Habilidades.
 Utiliza Programação Dinâmica (DP) com "look ahead" para sugerir as próximas
 habilidades que maximizam o valor esperado em um horizonte de 5 anos.
 """
+import heapq
+import time
 from functools import lru_cache
-from ..data import get_habilidades
+import numpy as np
+from ..data import get_compiled_catalog, get_habilidades, get_skill_index
+from .cache_utils import persistent_cache
+from .graph_utils import AvailabilityFrontier, build_prerequisite_graph, get_transitive_closure
 
 # Constantes do Desafio 5
 HORIZONTE_ANOS = 5
 MAX_SKILLS_TO_RECOMMEND = 3
+DP_CACHE_MAXSIZE = 1 << 16  # limite de estados memorizados por dp_recommendation
+BEAM_WIDTH = 64             # estados mantidos por camada na busca em feixe
+ASTAR_PULSO_EXPANSOES = 256 # expansões do A* entre duas soluções parciais (ver _astar_steps)
+
+# Simulação de Probabilidades de Transição de Mercado (fictício para demonstração)
+MARKET_TRANSITION_PROB = {
+    'S6': 1.5, # IA Generativa (Objetivo Final)
+    'S9': 1.3, # DevOps & CI/CD (Crítica)
+    'S7': 1.2, # Estruturas em Nuvem (Crítica)
+    'S4': 1.1, # ML (Não Crítica, mas alta Complexidade)
+}
 
 def get_available_skills(acquired_skills, habilidades):
     """
@@ -24,14 +40,37 @@ def get_available_skills(acquired_skills, habilidades):
     ]
     return available
 
+def available_skills_mask(acquired_mask, index):
+    """
+    Versão em bitmask de get_available_skills: retorna a máscara das habilidades
+    ainda não adquiridas cujos pré-requisitos estão todos em 'acquired_mask'.
+    """
+    available = 0
+    for i, prereq_mask in enumerate(index.prereq_mask):
+        if not (acquired_mask >> i) & 1 and prereq_mask & ~acquired_mask == 0:
+            available |= 1 << i
+    return available & ~index.orphan_mask
+
+def _market_weights(market_transition_prob_tuple):
+    """Converte a tupla de probabilidades de mercado em pesos por posição do índice."""
+    return _market_weights_for(market_transition_prob_tuple, get_compiled_catalog().content_hash)
+
 @lru_cache(maxsize=None)
-def dp_recommendation(current_skills_tuple, remaining_steps, market_transition_prob_tuple):
+def _market_weights_for(market_transition_prob_tuple, content_hash):
+    """Pesos por posição, memorizados por (mercado, hash do conteúdo do catálogo)."""
+    index = get_compiled_catalog()
+    market_transition_prob = dict(market_transition_prob_tuple)
+    return [market_transition_prob.get(skill_id, 1.0) for skill_id in index.ids]
+
+@persistent_cache("challenge_5.dp_recommendation", decode=tuple)
+@lru_cache(maxsize=DP_CACHE_MAXSIZE)
+def dp_recommendation(current_skills_mask, remaining_steps, market_transition_prob_tuple):
     """
     Função recursiva com memoização (DP) para encontrar o valor máximo esperado
     em um horizonte de tempo (remaining_steps).
     
     Args:
-        current_skills_tuple (tuple): Tupla de IDs das habilidades adquiridas (estado hashable).
+        current_skills_mask (int): Bitmask das habilidades adquiridas (ver data.SkillIndex).
         remaining_steps (int): Número de habilidades restantes para recomendar.
         market_transition_prob_tuple (tuple): Tupla hashable das probabilidades de mercado.
         
@@ -41,96 +80,670 @@ def dp_recommendation(current_skills_tuple, remaining_steps, market_transition_p
     if remaining_steps == 0:
         return 0, None
 
-    habilidades = get_habilidades() # Acessa o dicionário de habilidades aqui
-    current_skills = set(current_skills_tuple)
-    available_skills = get_available_skills(current_skills, habilidades)
-    
-    # Converte a tupla de probabilidades de volta para um dicionário para fácil acesso
-    market_transition_prob = dict(market_transition_prob_tuple)
-    
-    max_expected_value = -1
-    best_next_skill = None
+    index = get_skill_index()
+    available_mask = available_skills_mask(current_skills_mask, index)
 
     # Se não houver habilidades disponíveis, retorna 0
-    if not available_skills:
+    if not available_mask:
         return 0, None
 
-    for next_skill in available_skills:
-        skill_data = habilidades[next_skill]
-        
-        # Valor da habilidade atual
-        base_value = skill_data['Valor']
-        
-        # Fator de ponderação (probabilidade de transição de mercado)
-        prob_factor = market_transition_prob.get(next_skill, 1.0)
-        
-        # Novo estado após adquirir a habilidade (deve ser hashable)
-        new_skills_tuple = tuple(sorted(list(current_skills) + [next_skill]))
-        
-        # Chamada recursiva (look ahead) ajustada
+    # Pesos de mercado por posição (calculados uma vez por tupla de mercado)
+    weights = _market_weights(market_transition_prob_tuple)
+    
+    max_expected_value = -1
+    best_next_skill = None
+
+    for i in index.bits(available_mask):
+        # Chamada recursiva (look ahead): o novo estado é apenas um OR de bits
         future_expected_value, _ = dp_recommendation(
-            new_skills_tuple,
+            current_skills_mask | (1 << i),
             remaining_steps - 1,
             market_transition_prob_tuple
         )
         
         # Valor esperado total: (Valor Base * Fator Prob.) + Valor Esperado Futuro
-        expected_value = (base_value * prob_factor) + future_expected_value
+        expected_value = (index.valor[i] * weights[i]) + future_expected_value
         
         if expected_value > max_expected_value:
             max_expected_value = expected_value
-            best_next_skill = next_skill
+            best_next_skill = index.ids[i]
 
     return max_expected_value, best_next_skill
 
-def solve_challenge_5(current_skills_list=None):
+def _reachable_layers(start_mask, horizon, index):
+    """
+    Estados alcançáveis a partir de 'start_mask' em menos de 'horizon' passos,
+    por profundidade ({mask: fronteira disponível}). Busca em profundidade
+    iterativa sobre um AvailabilityFrontier (add ao descer, remove ao voltar);
+    cada estado é expandido uma única vez.
+    """
+    frontier = AvailabilityFrontier(
+        build_prerequisite_graph(get_habilidades()), index.ids_of(start_mask)
+    )
+    layers = [{} for _ in range(horizon)]
+    if horizon == 0:
+        return layers
+
+    layers[0][start_mask] = index.mask_of(frontier.available)
+    # Pilha: (profundidade, estado, habilidades a expandir, habilidade adicionada)
+    stack = [(0, start_mask, frontier.available_skills()[::-1], None)]
+    while stack:
+        depth, mask, pending, added = stack[-1]
+        if depth + 1 == horizon or not pending:
+            stack.pop()
+            if added is not None:
+                frontier.remove(added)
+            continue
+        skill_id = pending.pop()
+        new_mask = mask | (1 << index.position[skill_id])
+        if new_mask in layers[depth + 1]:
+            continue
+        frontier.add(skill_id)
+        layers[depth + 1][new_mask] = index.mask_of(frontier.available)
+        stack.append((depth + 1, new_mask, frontier.available_skills()[::-1], skill_id))
+    return layers
+
+def iterative_recommendation(start_mask, horizon, market_transition_prob_tuple):
+    """
+    Versão iterativa (bottom-up) de dp_recommendation, sem recursão.
+
+    1. Passada para frente: gera os estados alcançáveis em 'horizon' passos
+       com a fronteira disponível de cada estado (ver _reachable_layers).
+    2. Passada para trás: calcula o valor ótimo de cada camada a partir da
+       seguinte, mantendo apenas duas camadas de valores vivas, e registra a
+       melhor próxima habilidade de cada estado.
+
+    O desempate é o mesmo de dp_recommendation (primeira habilidade, na ordem
+    do catálogo, com o maior valor esperado).
+
+    Returns:
+        list: Política por profundidade, {mask: (valor_esperado, posicao_escolhida)}.
+    """
+    index = get_compiled_catalog()
+    weights = _market_weights(market_transition_prob_tuple)
+    gain = [valor * weight for valor, weight in zip(index.valor, weights)]
+
+    # 1. Estados alcançáveis por profundidade: {mask: fronteira disponível}
+    layers = _reachable_layers(start_mask, horizon, index)
+
+    # 2. Valores de trás para frente (V_0 = 0 fora do horizonte)
+    policy = [None] * horizon
+    next_values = {}
+    for depth in range(horizon - 1, -1, -1):
+        values = {}
+        choices = {}
+        for mask, available in layers[depth].items():
+            max_expected_value = -1
+            best_next = None
+            for i in index.bits(available):
+                expected_value = gain[i] + next_values.get(mask | (1 << i), 0)
+                if expected_value > max_expected_value:
+                    max_expected_value = expected_value
+                    best_next = i
+            if best_next is None:
+                values[mask] = 0
+            else:
+                values[mask] = max_expected_value
+                choices[mask] = (max_expected_value, best_next)
+        policy[depth] = choices
+        next_values = values
+        layers[depth] = None
+
+    return policy
+
+def _fill_shared_table(start_mask, horizon, gain, table, frontier, index):
+    """
+    Resolve um perfil gravando na tabela compartilhada {(passos_restantes, mask):
+    (valor, posicao_escolhida)}. Estados já presentes na tabela (calculados
+    para outro perfil) não são expandidos nem recalculados. 'frontier' deve
+    estar posicionado em 'start_mask' e volta a ele ao final.
+    """
+    if horizon == 0 or (horizon, start_mask) in table:
+        return 0
+
+    # Passada para frente: apenas estados ainda ausentes da tabela
+    layers = [{} for _ in range(horizon)]
+    layers[0][start_mask] = index.mask_of(frontier.available)
+    stack = [(0, start_mask, frontier.available_skills()[::-1], None)]
+    while stack:
+        depth, mask, pending, added = stack[-1]
+        if depth + 1 == horizon or not pending:
+            stack.pop()
+            if added is not None:
+                frontier.remove(added)
+            continue
+        skill_id = pending.pop()
+        new_mask = mask | (1 << index.position[skill_id])
+        if new_mask in layers[depth + 1] or (horizon - depth - 1, new_mask) in table:
+            continue
+        frontier.add(skill_id)
+        layers[depth + 1][new_mask] = index.mask_of(frontier.available)
+        stack.append((depth + 1, new_mask, frontier.available_skills()[::-1], skill_id))
+
+    # Passada para trás, lendo os sucessores da tabela compartilhada
+    new_states = 0
+    for depth in range(horizon - 1, -1, -1):
+        remaining = horizon - depth
+        for mask, available in layers[depth].items():
+            max_expected_value = -1
+            best_next = None
+            for i in index.bits(available):
+                future = table[(remaining - 1, mask | (1 << i))][0] if remaining > 1 else 0
+                expected_value = gain[i] + future
+                if expected_value > max_expected_value:
+                    max_expected_value = expected_value
+                    best_next = i
+            table[(remaining, mask)] = (max_expected_value, best_next) if best_next is not None else (0, None)
+            new_states += 1
+    return new_states
+
+def solve_challenge_5_batch(profiles, market_transition_prob=None, max_estados=None):
+    """
+    Recomendações para vários perfis com uma única tabela de DP compartilhada.
+
+    Perfis idênticos são resolvidos uma só vez e os perfis são processados em
+    ordem de bitmask, de modo que perfis vizinhos (que compartilham sub-estados)
+    fiquem adjacentes. Se 'max_estados' for informado, a tabela é descartada
+    entre perfis quando ultrapassar esse tamanho.
+
+    Returns:
+        dict: Resultado colunar; as listas seguem a ordem de 'profiles'.
+    """
+    if market_transition_prob is None:
+        market_transition_prob = MARKET_TRANSITION_PROB
+    market_transition_prob_tuple = tuple(sorted(market_transition_prob.items()))
+
+    index = get_compiled_catalog()
+    weights = _market_weights(market_transition_prob_tuple)
+    gain = [valor * weight for valor, weight in zip(index.valor, weights)]
+    horizon = MAX_SKILLS_TO_RECOMMEND
+
+    masks = [index.mask_of(s for s in profile if s in index.position) for profile in profiles]
+    frontier = AvailabilityFrontier(build_prerequisite_graph(get_habilidades()))
+
+    table = {}
+    total_states = 0
+    answers = {}
+    for start_mask in sorted(set(masks)):
+        if max_estados is not None and len(table) > max_estados:
+            table.clear()
+
+        profile_skills = index.ids_of(start_mask)
+        for skill_id in profile_skills:
+            frontier.add(skill_id)
+        total_states += _fill_shared_table(start_mask, horizon, gain, table, frontier, index)
+        for skill_id in reversed(profile_skills):
+            frontier.remove(skill_id)
+
+        # Segue a política gravada na tabela
+        recommendations = []
+        current_state = start_mask
+        max_expected_value = 0
+        for step in range(horizon):
+            max_expected_value, best_next = table[(horizon - step, current_state)]
+            if best_next is None:
+                break
+            recommendations.append(index.ids[best_next])
+            current_state |= 1 << best_next
+        answers[start_mask] = (recommendations, max_expected_value)
+
+    return {
+        'Status': 'Sucesso',
+        'Horizonte de Recomendação': f'{HORIZONTE_ANOS} anos ({horizon} habilidades)',
+        'Perfil Atual': [list(profile) for profile in profiles],
+        'Habilidades Recomendadas': [answers[mask][0] for mask in masks],
+        'Valor Esperado Máximo (Estimado)': [answers[mask][1] for mask in masks],
+        'Estados Calculados': total_states
+    }
+
+def _scenario_gain_matrix(market_scenarios, index):
+    """
+    Converte os cenários de mercado em uma matriz de ganhos (n_habilidades x M):
+    ganho[i, m] = Valor_i * fator_i no cenário m. Aceita uma matriz M x n
+    (colunas na ordem do índice) ou uma lista de dicionários {ID: fator}.
+    Levanta ValueError se não houver cenários ou se a matriz não for M x n.
+    """
+    if isinstance(market_scenarios, np.ndarray):
+        factors = np.asarray(market_scenarios, dtype=float)
+        if factors.ndim != 2 or factors.shape[1] != len(index.ids):
+            raise ValueError(
+                f"Matriz de cenários com formato {factors.shape}; esperado (M, {len(index.ids)})."
+            )
+    else:
+        factors = np.array([
+            [scenario.get(skill_id, 1.0) for skill_id in index.ids]
+            for scenario in market_scenarios
+        ], dtype=float).reshape(-1, len(index.ids))
+    if factors.shape[0] == 0:
+        raise ValueError("Nenhum cenário de mercado informado.")
+    return np.asarray(index.valor, dtype=float)[:, None] * factors.T
+
+def market_scenario_sweep(market_scenarios, current_skills_list=None):
+    """
+    Avalia a DP de recomendação para M cenários de mercado em uma só passada.
+
+    A função valor de cada estado é um vetor NumPy de tamanho M; em cada estado
+    o melhor sucessor é escolhido por cenário (np.argmax, mesmo desempate do
+    catálogo de dp_recommendation). Apenas duas camadas de valores ficam vivas.
+
+    Returns:
+        dict: Melhor próxima habilidade e valor esperado (horizonte completo) por
+        cenário, além de estatísticas de robustez da recomendação.
+    """
+    if current_skills_list is None:
+        current_skills_list = ['S1', 'S2']
+
+    index = get_compiled_catalog()
+    horizon = MAX_SKILLS_TO_RECOMMEND
+    start_mask = index.mask_of(s for s in current_skills_list if s in index.position)
+    gain = _scenario_gain_matrix(market_scenarios, index)
+    num_scenarios = gain.shape[1]
+
+    layers = _reachable_layers(start_mask, horizon, index)
+    zeros = np.zeros(num_scenarios)
+    next_values = {}
+    first_step_values = {}
+
+    for depth in range(horizon - 1, -1, -1):
+        values = {}
+        for mask, available in layers[depth].items():
+            positions = list(index.bits(available))
+            if not positions:
+                values[mask] = zeros
+                continue
+            candidates = np.stack([
+                gain[i] + next_values.get(mask | (1 << i), zeros) for i in positions
+            ])
+            if depth == 0:
+                best_positions = np.asarray(positions)[np.argmax(candidates, axis=0)]
+                first_step_values = dict(zip(positions, candidates))
+            values[mask] = candidates.max(axis=0)
+        next_values = values
+        layers[depth] = None
+
+    horizon_values = next_values.get(start_mask, zeros) if horizon else zeros
+    if not first_step_values:
+        return {
+            'Status': 'Sem habilidades disponíveis',
+            'Perfil Atual': current_skills_list,
+            'Número de Cenários': num_scenarios,
+            'Melhor Próxima Habilidade': [None] * num_scenarios,
+            'Valor Esperado': horizon_values.tolist()
+        }
+
+    best_ids = [index.ids[i] for i in best_positions]
+    counts = {}
+    for skill_id in best_ids:
+        counts[skill_id] = counts.get(skill_id, 0) + 1
+    robust_skill = max(counts, key=counts.get)
+
+    # Arrependimento de seguir a recomendação mais frequente em todos os cenários
+    regret = horizon_values - first_step_values[index.position[robust_skill]]
+
+    return {
+        'Status': 'Sucesso',
+        'Perfil Atual': current_skills_list,
+        'Horizonte de Recomendação': f'{HORIZONTE_ANOS} anos ({horizon} habilidades)',
+        'Número de Cenários': num_scenarios,
+        'Melhor Próxima Habilidade': best_ids,
+        'Valor Esperado': horizon_values.tolist(),
+        'Robustez': {
+            'Frequência da Melhor Habilidade': {k: v / num_scenarios for k, v in counts.items()},
+            'Recomendação Mais Robusta': robust_skill,
+            'Valor Esperado Médio': float(horizon_values.mean()),
+            'Desvio Padrão do Valor': float(horizon_values.std()),
+            'Valor P5': float(np.quantile(horizon_values, 0.05)),
+            'Valor P95': float(np.quantile(horizon_values, 0.95)),
+            'Arrependimento Máximo': float(regret.max()),
+            'Arrependimento Médio': float(regret.mean())
+        }
+    }
+
+class _GainBound:
+    """
+    Limite superior admissível do ganho restante de um estado: a soma dos
+    'r' maiores ganhos entre as habilidades alcançáveis em até 'r' passos
+    (cujo fecho de pré-requisitos ainda não adquirido tem no máximo 'r'
+    habilidades). Habilidades presas a pré-requisitos inexistentes são
+    descartadas.
+    """
+
+    def __init__(self, gain, index):
+        self.gain = gain
+        # Grafo com ciclo: sem fecho, o limite considera todas as habilidades
+        self.closure = None
+        if index.topological_order is not None:
+            closure = get_transitive_closure()
+            self.closure = [closure.mask(i) for i in range(len(gain))]
+        reach = self.closure or [1 << i for i in range(len(gain))]
+        self.candidates = [
+            i for i in sorted(range(len(gain)), key=lambda i: -gain[i])
+            if not reach[i] & index.orphan_mask
+        ]
+
+    def __call__(self, mask, remaining):
+        total = 0
+        taken = 0
+        if remaining <= 0:
+            return 0
+        for i in self.candidates:
+            if mask >> i & 1:
+                continue
+            if self.closure is not None and bin(self.closure[i] & ~mask).count('1') > remaining:
+                continue
+            total += self.gain[i]
+            taken += 1
+            if taken == remaining:
+                break
+        return total
+
+def _expand(mask, available, i, index):
+    """Estado e fronteira disponível após adquirir a posição i (incremental)."""
+    new_mask = mask | (1 << i)
+    new_available = available & ~(1 << i)
+    for d in index.bits(index.dependent_mask[i] & ~new_mask & ~index.orphan_mask):
+        if index.prereq_mask[d] & ~new_mask == 0:
+            new_available |= 1 << d
+    return new_mask, new_available
+
+def _canonical_sequence(start_mask, chosen_mask, index):
+    """
+    Ordena o conjunto escolhido como dp_recommendation faria: a cada passo, a
+    primeira habilidade do conjunto (ordem do catálogo) já disponível.
+    """
+    sequence = []
+    acquired = start_mask
+    remaining = chosen_mask
+    while remaining:
+        for i in index.bits(remaining):
+            if index.prereq_mask[i] & ~acquired == 0:
+                sequence.append(i)
+                acquired |= 1 << i
+                remaining &= ~(1 << i)
+                break
+        else:
+            break
+    return sequence
+
+def _greedy_completion(mask, available, steps, gain, index):
+    """Completa um estado escolhendo sempre o maior ganho disponível."""
+    value = 0
+    for _ in range(steps):
+        if not available:
+            break
+        i = max(index.bits(available), key=lambda j: (gain[j], -j))
+        value += gain[i]
+        mask, available = _expand(mask, available, i, index)
+    return mask, value
+
+def _search_result(start_mask, best_mask, best_value, bound, exact, expanded, index):
+    sequence = _canonical_sequence(start_mask, best_mask & ~start_mask, index)
+    return {
+        'Caminho': sequence,
+        'Valor': best_value,
+        'Limite Superior': max(bound, best_value),
+        'Gap': (max(bound, best_value) - best_value) / max(bound, best_value) if bound > 0 else 0.0,
+        'Exato': exact,
+        'Estados Expandidos': expanded
+    }
+
+def _astar_steps(start_mask, horizon, market_transition_prob_tuple,
+                 max_expansoes=None, tempo_limite=None):
+    """
+    Núcleo de astar_recommendation como gerador. A cada ASTAR_PULSO_EXPANSOES
+    expansões, completa de forma gulosa o estado no topo da fila: se a
+    solução melhora, produz um resultado parcial ('Exato' = False, limite =
+    maior g + h aberto); senão, produz None como sinal de progresso. O último
+    item é sempre o resultado final.
+    """
+    index = get_compiled_catalog()
+    weights = _market_weights(market_transition_prob_tuple)
+    gain = [valor * weight for valor, weight in zip(index.valor, weights)]
+    bound = _GainBound(gain, index)
+    deadline = None if tempo_limite is None else time.perf_counter() + tempo_limite
+
+    start_available = available_skills_mask(start_mask, index)
+    root_bound = bound(start_mask, horizon) if start_available else 0
+    # Fila: (-(g + h), profundidade negativa, mask, g, disponíveis)
+    heap = [(-root_bound, 0, start_mask, 0, start_available)]
+    seen = {start_mask}
+    expanded = 0
+    incumbent = None  # (valor, mask) da melhor solução completa já vista
+
+    while heap:
+        neg_f, neg_depth, mask, g, available = heapq.heappop(heap)
+        depth = -neg_depth
+        if depth == horizon or not available:
+            yield _search_result(start_mask, mask, g, -neg_f, True, expanded, index)
+            return
+
+        if (max_expansoes is not None and expanded >= max_expansoes) or \
+                (deadline is not None and time.perf_counter() > deadline):
+            # Orçamento esgotado: completa o melhor estado aberto
+            final_mask, extra = _greedy_completion(mask, available, horizon - depth, gain, index)
+            if incumbent is not None and incumbent[0] > g + extra:
+                final_mask, extra = incumbent[1], incumbent[0] - g
+            yield _search_result(start_mask, final_mask, g + extra, -neg_f, False, expanded, index)
+            return
+
+        if expanded % ASTAR_PULSO_EXPANSOES == 0:
+            final_mask, extra = _greedy_completion(mask, available, horizon - depth, gain, index)
+            if incumbent is None or g + extra > incumbent[0]:
+                incumbent = (g + extra, final_mask)
+                yield _search_result(start_mask, final_mask, g + extra, -neg_f, False, expanded, index)
+            else:
+                yield None
+
+        expanded += 1
+        for i in index.bits(available):
+            new_mask, new_available = _expand(mask, available, i, index)
+            if new_mask in seen:
+                continue
+            seen.add(new_mask)
+            new_g = g + gain[i]
+            h = bound(new_mask, horizon - depth - 1) if new_available else 0
+            heapq.heappush(heap, (-(new_g + h), -(depth + 1), new_mask, new_g, new_available))
+
+    yield _search_result(start_mask, start_mask, 0, 0, True, expanded, index)
+
+def astar_recommendation(start_mask, horizon, market_transition_prob_tuple,
+                         max_expansoes=None, tempo_limite=None):
+    """
+    Busca best-first (A*) sobre os conjuntos de habilidades adquiridas.
+
+    O valor de uma sequência depende apenas do conjunto escolhido, então
+    cada estado (bitmask) é gerado uma única vez. A prioridade é
+    g + h, com g o ganho acumulado e h o limite admissível de _GainBound; o
+    primeiro estado terminal retirado da fila é ótimo. Ao esgotar
+    'max_expansoes' ou 'tempo_limite' (segundos), o melhor estado aberto é
+    completado de forma gulosa e o gap é medido contra o maior g + h aberto.
+    Empates entre conjuntos ótimos distintos podem ser resolvidos de forma
+    diferente da DP; dentro do conjunto, a ordem é a de dp_recommendation.
+
+    Returns:
+        dict: Caminho (posições), Valor, Limite Superior, Gap, Exato e
+        Estados Expandidos.
+    """
+    result = None
+    for step in _astar_steps(start_mask, horizon, market_transition_prob_tuple, max_expansoes, tempo_limite):
+        if step is not None:
+            result = step
+    return result
+
+def beam_recommendation(start_mask, horizon, market_transition_prob_tuple, largura=BEAM_WIDTH):
+    """
+    Busca em feixe: a cada camada mantém apenas os 'largura' estados de maior
+    g + h. Custo O(horizonte * largura * |disponíveis|), independente do
+    tamanho do espaço de estados.
+
+    O limite superior reportado é o maior entre o valor encontrado e o g + h
+    de todos os estados descartados: todo caminho não explorado passa por
+    algum deles, então o gap é um certificado válido.
+
+    Returns:
+        dict: Mesmo formato de astar_recommendation.
+    """
+    index = get_compiled_catalog()
+    weights = _market_weights(market_transition_prob_tuple)
+    gain = [valor * weight for valor, weight in zip(index.valor, weights)]
+    bound = _GainBound(gain, index)
+
+    beam = [(start_mask, 0, available_skills_mask(start_mask, index))]
+    best_mask, best_value = start_mask, 0
+    pruned_bound = 0
+    expanded = 0
+
+    for depth in range(horizon):
+        layer = {}
+        for mask, g, available in beam:
+            if not available:
+                # Estado terminal antes do horizonte
+                if g > best_value:
+                    best_mask, best_value = mask, g
+                continue
+            expanded += 1
+            for i in index.bits(available):
+                new_mask, new_available = _expand(mask, available, i, index)
+                if new_mask not in layer:
+                    layer[new_mask] = (g + gain[i], new_available)
+
+        remaining = horizon - depth - 1
+        scored = sorted(
+            ((g + (bound(mask, remaining) if available else 0), mask, g, available)
+             for mask, (g, available) in layer.items()),
+            key=lambda item: (-item[0], item[1])
+        )
+        if len(scored) > largura:
+            pruned_bound = max(pruned_bound, scored[largura][0])
+        beam = [(mask, g, available) for _, mask, g, available in scored[:largura]]
+        if not beam:
+            break
+
+    for mask, g, _ in beam:
+        if g > best_value:
+            best_mask, best_value = mask, g
+
+    return _search_result(
+        start_mask, best_mask, best_value, pruned_bound, pruned_bound <= best_value, expanded, index
+    )
+
+def anytime_recommendation(start_mask, horizon, market_transition_prob_tuple):
+    """
+    Gerador anytime para o Desafio 5 (ver anytime_utils): produz
+    (solução, valor, limite_superior) com feixes cada vez mais largos e, por
+    fim, as soluções parciais e a final da busca A* exata (None entre elas,
+    como sinal de progresso). Interrompe assim que uma etapa prova otimalidade.
+    """
+    index = get_compiled_catalog()
+
+    def as_item(search):
+        solution = {
+            'Habilidades Recomendadas': [index.ids[i] for i in search['Caminho']],
+            'Estados Expandidos': search['Estados Expandidos']
+        }
+        return solution, search['Valor'], search['Limite Superior']
+
+    for largura in (1, BEAM_WIDTH):
+        search = beam_recommendation(start_mask, horizon, market_transition_prob_tuple, largura)
+        yield as_item(search)
+        if search['Exato']:
+            return
+
+    for search in _astar_steps(start_mask, horizon, market_transition_prob_tuple):
+        yield None if search is None else as_item(search)
+
+def solve_challenge_5(current_skills_list=None, motor="iterativo", largura_feixe=BEAM_WIDTH,
+                      max_expansoes=None, tempo_limite=None):
     """
     Resolve o Desafio 5: Recomendar Próximas Habilidades.
+
+    Motores:
+        - "iterativo": DP bottom-up por camadas (ver iterative_recommendation).
+        - "recursivo": dp_recommendation com memoização (lru_cache limitado e
+          cache persistente opcional por catálogo, ver cache_utils).
+        - "astar": busca best-first com limite admissível, opcionalmente
+          limitada por 'max_expansoes' / 'tempo_limite' (ver astar_recommendation).
+        - "feixe": busca em feixe de largura 'largura_feixe' (ver beam_recommendation).
+    Os motores de busca incluem em 'Busca' o limite superior e o gap.
     """
-    # Limpa o cache da DP antes de resolver
-    dp_recommendation.cache_clear()
-    
     # Define o perfil atual (exemplo: S1 e S2 adquiridas)
     if current_skills_list is None:
         current_skills_list = ['S1', 'S2']
         
-    current_skills_tuple = tuple(sorted(current_skills_list))
+    index = get_compiled_catalog()
+    current_skills_mask = index.mask_of(s for s in current_skills_list if s in index.position)
     
-    # Simulação de Probabilidades de Transição de Mercado (fictício para demonstração)
-    market_transition_prob = {
-        'S6': 1.5, # IA Generativa (Objetivo Final)
-        'S9': 1.3, # DevOps & CI/CD (Crítica)
-        'S7': 1.2, # Estruturas em Nuvem (Crítica)
-        'S4': 1.1, # ML (Não Crítica, mas alta Complexidade)
-    }
+    market_transition_prob = MARKET_TRANSITION_PROB
     
     # Converte o dicionário de probabilidades para uma tupla de tuplas (hashable)
     market_transition_prob_tuple = tuple(sorted(market_transition_prob.items()))
     
     recommendations = []
-    current_state = current_skills_tuple
+    current_state = current_skills_mask
     max_expected_value = 0
+
+    if motor == "iterativo":
+        policy = iterative_recommendation(
+            current_skills_mask, MAX_SKILLS_TO_RECOMMEND, market_transition_prob_tuple
+        )
+    elif motor in ("astar", "feixe"):
+        if motor == "astar":
+            search = astar_recommendation(
+                current_skills_mask, MAX_SKILLS_TO_RECOMMEND, market_transition_prob_tuple,
+                max_expansoes, tempo_limite
+            )
+        else:
+            search = beam_recommendation(
+                current_skills_mask, MAX_SKILLS_TO_RECOMMEND, market_transition_prob_tuple,
+                largura_feixe
+            )
+        weights = _market_weights(market_transition_prob_tuple)
+        path = search['Caminho']
+        # Valor restante do plano a partir de cada passo (como a DP reporta)
+        remaining_values = [
+            sum(index.valor[i] * weights[i] for i in path[step:]) for step in range(len(path))
+        ]
+    elif motor != "recursivo":
+        raise ValueError(f"Motor desconhecido: {motor}")
     
     # Loop para encontrar as 3 melhores habilidades em sequência
     for step in range(MAX_SKILLS_TO_RECOMMEND):
-        # Chamada ajustada
-        max_expected_value, best_next_skill = dp_recommendation(
-            current_state,
-            MAX_SKILLS_TO_RECOMMEND - step, # Passos restantes
-            market_transition_prob_tuple
-        )
+        if motor == "iterativo":
+            max_expected_value, best_position = policy[step].get(current_state, (0, None))
+            best_next_skill = index.ids[best_position] if best_position is not None else None
+        elif motor in ("astar", "feixe"):
+            if step < len(path):
+                max_expected_value, best_next_skill = remaining_values[step], index.ids[path[step]]
+            else:
+                max_expected_value, best_next_skill = 0, None
+        else:
+            # Chamada ajustada
+            max_expected_value, best_next_skill = dp_recommendation(
+                current_state,
+                MAX_SKILLS_TO_RECOMMEND - step, # Passos restantes
+                market_transition_prob_tuple
+            )
         
         if best_next_skill:
             recommendations.append(best_next_skill)
             # Atualiza o estado para a próxima iteração
-            current_state = tuple(sorted(list(current_state) + [best_next_skill]))
+            current_state |= 1 << index.position[best_next_skill]
         else:
             break
             
-    return {
+    result = {
         'Status': 'Sucesso',
         'Perfil Atual': current_skills_list,
         'Horizonte de Recomendação': f'{HORIZONTE_ANOS} anos ({MAX_SKILLS_TO_RECOMMEND} habilidades)',
         'Habilidades Recomendadas': recommendations,
         'Valor Esperado Máximo (Estimado)': max_expected_value
     }
+    if motor in ("astar", "feixe"):
+        result['Busca'] = {
+            'Valor Total': search['Valor'],
+            'Limite Superior': search['Limite Superior'],
+            'Gap': search['Gap'],
+            'Exato': search['Exato'],
+            'Estados Expandidos': search['Estados Expandidos']
+        }
+    return result
@@ -3,7 +3,13 @@
 Módulo de utilidades para manipulação e validação do grafo de habilidades.
 Inclui funções para detecção de ciclos e nós órfãos.
 """
-from ..data import get_habilidades
+import json
+import os
+from collections import deque
+
+import numpy as np
+
+from ..data import catalog_version, get_compiled_catalog, get_habilidades, update_skill
 
 class GraphValidationError(Exception):
     """Exceção personalizada para erros de validação do grafo."""
@@ -19,50 +25,475 @@ def build_prerequisite_graph(habilidades):
     graph = {skill_id: data['Pre_Reqs'] for skill_id, data in habilidades.items()}
     return graph
 
-def _dfs_cycle_check(node, graph, visited, recursion_stack, path):
+def eligible_topological_order(habilidades, candidatos):
     """
-    Função auxiliar recursiva para detecção de ciclos usando DFS.
-    
-    visited: set de nós visitados (totalmente processados).
-    recursion_stack: set de nós na pilha de recursão atual (em processamento).
-    path: lista de nós no caminho atual para reportar o ciclo.
-    """
-    visited.add(node)
-    recursion_stack.add(node)
-    path.append(node)
-
-    for neighbor in graph.get(node, []):
-        if neighbor not in visited:
-            # Chamada recursiva
-            if _dfs_cycle_check(neighbor, graph, visited, recursion_stack, path):
-                return True
-        elif neighbor in recursion_stack:
-            # Ciclo detectado. neighbor é o nó que já está na pilha de recursão.
-            cycle_start_index = path.index(neighbor)
-            cycle = path[cycle_start_index:]
-            raise GraphValidationError(f"Ciclo detectado: {' -> '.join(cycle)} -> {neighbor}")
-
-    recursion_stack.remove(node)
-    path.pop()
-    return False
+    Ordem topológica (Kahn) das habilidades candidatas cujos pré-requisitos
+    também são candidatos. Habilidades que dependem, direta ou
+    transitivamente, de algo fora do conjunto nunca atingem grau zero e
+    ficam de fora, pois não formariam um conjunto fechado. O(V+E).
+    """
+    candidatos = set(candidatos)
+    indegree = {s: len(habilidades[s]['Pre_Reqs']) for s in candidatos}
+    dependents = {s: [] for s in candidatos}
+    for s in candidatos:
+        for p in habilidades[s]['Pre_Reqs']:
+            if p in dependents:
+                dependents[p].append(s)
+
+    queue = deque(sorted(s for s, d in indegree.items() if d == 0))
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for dep in sorted(dependents[node]):
+            indegree[dep] -= 1
+            if indegree[dep] == 0:
+                queue.append(dep)
+    return order
+
+class AvailabilityFrontier:
+    """
+    Índice incremental da fronteira de habilidades disponíveis.
+
+    Construído uma vez a partir de build_prerequisite_graph, guarda para cada
+    habilidade o número de pré-requisitos ainda não adquiridos e a lista de
+    dependentes (adjacência reversa). add/remove atualizam a fronteira em
+    O(grau de saída); remove desfaz exatamente um add (uso em pilha/backtracking).
+    Pré-requisitos inexistentes (órfãos) nunca são satisfeitos.
+    """
+
+    def __init__(self, graph, acquired=()):
+        self.order = {skill: i for i, skill in enumerate(graph)}
+        self.dependents = {skill: [] for skill in graph}
+        self.unmet = {}
+        for skill, prereqs in graph.items():
+            self.unmet[skill] = len(prereqs)
+            for prereq in prereqs:
+                if prereq in self.dependents:
+                    self.dependents[prereq].append(skill)
+
+        self.acquired = set()
+        self.available = {skill for skill, count in self.unmet.items() if count == 0}
+        for skill in acquired:
+            self.add(skill)
+
+    def add(self, skill):
+        """Marca 'skill' como adquirida e libera os dependentes completos."""
+        self.acquired.add(skill)
+        self.available.discard(skill)
+        for dependent in self.dependents.get(skill, []):
+            self.unmet[dependent] -= 1
+            if self.unmet[dependent] == 0 and dependent not in self.acquired:
+                self.available.add(dependent)
+
+    def remove(self, skill):
+        """Desfaz add(skill)."""
+        for dependent in self.dependents.get(skill, []):
+            if self.unmet[dependent] == 0:
+                self.available.discard(dependent)
+            self.unmet[dependent] += 1
+        self.acquired.discard(skill)
+        if self.unmet.get(skill) == 0:
+            self.available.add(skill)
+
+    def available_skills(self):
+        """Habilidades disponíveis, na ordem do catálogo."""
+        return sorted(self.available, key=self.order.__getitem__)
+
+class TransitiveClosure:
+    """
+    Fecho transitivo de pré-requisitos do catálogo compilado (fonte única
+    de fechos do projeto).
+
+    Consultas pontuais (mask) calculam apenas o fecho da habilidade pedida,
+    por uma busca sobre a adjacência CSR, e memorizam os fechos visitados
+    como bitmasks. A tabela bit-paralela completa (uma linha uint64 por
+    habilidade, O(n^2 / 64) palavras) só é montada quando 'rows' é acessado
+    ou quando a tabela é salva; ela pode ser reaberta com memory-map,
+    validada pelo hash do catálogo.
+    """
+
+    def __init__(self, catalog, rows=None):
+        if catalog.topological_order is None:
+            raise GraphValidationError("Ciclo detectado: o fecho transitivo não está definido.")
+        self.catalog = catalog
+        self.n = len(catalog.ids)
+        self.words = max(1, (self.n + 63) // 64)
+        self._rows = rows
+        self._masks = {}
+
+    @property
+    def rows(self):
+        """Tabela completa (n x palavras), montada na primeira consulta."""
+        if self._rows is None:
+            self._rows = self._build()
+        return self._rows
+
+    def _build(self):
+        catalog = self.catalog
+        rows = np.zeros((self.n, self.words), dtype=np.uint64)
+        for v in catalog.topological_order:
+            prereqs = catalog.prereq_targets[catalog.prereq_offsets[v]:catalog.prereq_offsets[v + 1]]
+            if prereqs:
+                rows[v] = np.bitwise_or.reduce(rows[prereqs], axis=0)
+            rows[v, v >> 6] |= np.uint64(1 << (v & 63))
+        return rows
+
+    def mask(self, position):
+        """Bitmask do fecho da habilidade na posição 'position' (incluindo ela própria)."""
+        masks = self._masks
+        if position in masks:
+            return masks[position]
+        if self._rows is not None:
+            masks[position] = int.from_bytes(self._rows[position].tobytes(), 'little')
+            return masks[position]
+
+        # Pós-ordem iterativa: cada fecho é o OR dos fechos dos pré-requisitos
+        catalog = self.catalog
+        stack = [(position, False)]
+        while stack:
+            v, ready = stack.pop()
+            if v in masks:
+                continue
+            prereqs = catalog.prereq_targets[catalog.prereq_offsets[v]:catalog.prereq_offsets[v + 1]]
+            if ready:
+                mask = 1 << v
+                for p in prereqs:
+                    mask |= masks[p]
+                masks[v] = mask
+            else:
+                stack.append((v, True))
+                stack.extend((p, False) for p in prereqs if p not in masks)
+        return masks[position]
+
+    def prerequisites(self, skill_id, include_self=False):
+        """Todos os pré-requisitos (diretos e indiretos) de 'skill_id', na ordem do catálogo."""
+        position = self.catalog.position[skill_id]
+        return [
+            self.catalog.ids[i] for i in self.catalog.bits(self.mask(position))
+            if include_self or i != position
+        ]
+
+    def requires(self, skill_id, prereq_id):
+        """True se 'prereq_id' é alcançável a partir de 'skill_id' pelos pré-requisitos."""
+        return bool(self.mask(self.catalog.position[skill_id]) >> self.catalog.position[prereq_id] & 1)
+
+    def closure_cost(self, skill_ids, column='Tempo'):
+        """Soma de 'column' sobre o fecho de pré-requisitos do conjunto (sem duplicatas)."""
+        mask = 0
+        for skill_id in skill_ids:
+            mask |= self.mask(self.catalog.position[skill_id])
+        members = list(self.catalog.bits(mask))
+        return self.catalog.columns[column][members].sum().item()
+
+    def save(self, path):
+        """Salva a tabela completa em '<path>.npy' e os metadados em '<path>.json'."""
+        np.save(f"{path}.npy", self.rows)
+        with open(f"{path}.json", 'w', encoding='utf-8') as f:
+            json.dump({'content_hash': self.catalog.content_hash, 'n': self.n}, f)
+
+    @classmethod
+    def load(cls, path, catalog):
+        """
+        Abre uma tabela salva com memory-map. Retorna None se ela não existir
+        ou tiver sido gerada para outra versão do catálogo.
+        """
+        try:
+            with open(f"{path}.json", encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('content_hash') != catalog.content_hash or not os.path.exists(f"{path}.npy"):
+            return None
+        return cls(catalog, rows=np.load(f"{path}.npy", mmap_mode='r'))
+
+_TRANSITIVE_CLOSURE = None
+
+def get_transitive_closure(cache_path=None):
+    """
+    Fecho transitivo do catálogo atual, compartilhado enquanto o catálogo
+    não muda. Com 'cache_path', reaproveita a tabela em disco quando o hash
+    confere e a regrava (completa) quando não confere.
+    """
+    global _TRANSITIVE_CLOSURE
+    catalog = get_compiled_catalog()
+    table = _TRANSITIVE_CLOSURE
+    if table is None or table.catalog is not catalog:
+        table = None
+        if cache_path is not None:
+            table = TransitiveClosure.load(cache_path, catalog)
+        if table is None:
+            table = TransitiveClosure(catalog)
+            if cache_path is not None:
+                table.save(cache_path)
+        _TRANSITIVE_CLOSURE = table
+    elif cache_path is not None and TransitiveClosure.load(cache_path, catalog) is None:
+        table.save(cache_path)
+    return table
+
+def compile_adjacency(graph):
+    """
+    Converte o grafo {habilidade: [pré-requisitos]} em adjacência CSR indexada
+    por inteiros (arestas habilidade -> pré-requisito).
+
+    Returns:
+        tuple: (ids, offsets, targets, orfaos), onde 'orfaos' lista os pares
+        (habilidade, pré-requisito inexistente).
+    """
+    ids = list(graph)
+    position = {skill: i for i, skill in enumerate(ids)}
+    offsets = [0]
+    targets = []
+    orphans = []
+    for skill in ids:
+        for prereq in graph[skill]:
+            if prereq in position:
+                targets.append(position[prereq])
+            else:
+                orphans.append((skill, prereq))
+        offsets.append(len(targets))
+    return ids, offsets, targets, orphans
+
+def strongly_connected_components(offsets, targets):
+    """
+    Componentes fortemente conexas (Tarjan iterativo, O(V+E), sem recursão).
+    Retorna a lista de componentes (listas de índices).
+    """
+    n = len(offsets) - 1
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, offsets[root])]
+
+        while work:
+            v, edge = work[-1]
+            if edge < offsets[v + 1]:
+                w = targets[edge]
+                work[-1] = (v, edge + 1)
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, offsets[w]))
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+
+    return components
+
+def _cycle_in_component(component, offsets, targets):
+    """Encontra um ciclo (lista de índices) dentro de uma componente cíclica (BFS)."""
+    members = set(component)
+    start = component[0]
+    parent = {start: None}
+    queue = [start]
+    for v in queue:
+        for w in targets[offsets[v]:offsets[v + 1]]:
+            if w == start:
+                path = [v]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            if w in members and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    return [start]
+
+def analyze_graph(graph):
+    """
+    Valida o grafo inteiro em uma única passada O(V+E), sem lançar exceções.
+
+    Returns:
+        dict: {'Ciclos': [[h1, h2, ..., h1], ...], 'Órfãos': [(habilidade, pré-requisito), ...]}
+    """
+    return analyze_adjacency(*compile_adjacency(graph))
+
+def analyze_adjacency(ids, offsets, targets, orphans):
+    """analyze_graph sobre uma adjacência CSR já compilada."""
+    cycles = []
+    for component in strongly_connected_components(offsets, targets):
+        v = component[0]
+        if len(component) > 1 or v in targets[offsets[v]:offsets[v + 1]]:
+            cycle = [ids[i] for i in _cycle_in_component(component, offsets, targets)]
+            cycles.append(cycle + [cycle[0]])
+    return {'Ciclos': cycles, 'Órfãos': orphans}
 
 def check_for_cycles(graph):
     """
     Verifica a existência de ciclos no grafo de pré-requisitos.
-    Utiliza DFS e recursão.
+    Utiliza Tarjan iterativo (sem limite de profundidade de recursão).
     """
-    visited = set()
-    recursion_stack = set()
+    cycles = analyze_graph(graph)['Ciclos']
+    if cycles:
+        raise GraphValidationError(f"Ciclo detectado: {' -> '.join(cycles[0])}")
     
-    for node in graph:
-        if node not in visited:
+    return "Nenhum ciclo detectado."
+
+class IncrementalGraphValidator:
+    """
+    Validação incremental do grafo a cada edição (inclusão de habilidade ou aresta).
+
+    Mantém uma ordem topológica dinâmica (Pearce-Kelly): ao incluir a aresta
+    habilidade -> pré-requisito, apenas os nós cuja posição está entre as duas
+    pontas são visitados. Uma aresta que fecharia um ciclo é rejeitada com
+    GraphValidationError e o grafo permanece inalterado. Pré-requisitos ainda
+    inexistentes ficam registrados como órfãos até a habilidade ser incluída.
+    """
+
+    def __init__(self, graph=None):
+        self.ids = []
+        self.position = {}
+        self.prereqs = []       # índice -> índices dos pré-requisitos
+        self.dependents = []    # índice -> índices dos dependentes
+        self.order = []         # índice -> posição topológica
+        self.orphans = {}       # pré-requisito inexistente -> habilidades que o exigem
+
+        if graph is not None:
+            ids, offsets, targets, orphans = compile_adjacency(graph)
+            result = analyze_adjacency(ids, offsets, targets, orphans)
+            if result['Ciclos']:
+                raise GraphValidationError(f"Ciclo detectado: {' -> '.join(result['Ciclos'][0])}")
+            for skill in ids:
+                self._add_node(skill)
+            for v in range(len(ids)):
+                for p in targets[offsets[v]:offsets[v + 1]]:
+                    self.prereqs[v].append(p)
+                    self.dependents[p].append(v)
+            for skill, prereq in orphans:
+                self.orphans.setdefault(prereq, []).append(skill)
+
+            # Ordem inicial já topológica (Kahn): as arestas existentes não reordenam nada
+            pending = [len(prereqs) for prereqs in self.prereqs]
+            queue = [v for v in range(len(ids)) if pending[v] == 0]
+            for slot, v in enumerate(queue):
+                self.order[v] = slot
+                for w in self.dependents[v]:
+                    pending[w] -= 1
+                    if pending[w] == 0:
+                        queue.append(w)
+
+    def _add_node(self, skill):
+        i = len(self.ids)
+        self.ids.append(skill)
+        self.position[skill] = i
+        self.prereqs.append([])
+        self.dependents.append([])
+        self.order.append(i)
+        return i
+
+    def add_skill(self, skill, prereqs=()):
+        """Inclui uma habilidade e suas arestas; resolve órfãos que a referenciavam."""
+        if skill not in self.position:
+            self._add_node(skill)
+        for prereq in prereqs:
+            self.add_edge(skill, prereq)
+        # Tenta todas as arestas pendentes; as que fechariam ciclo são rejeitadas
+        rejected = None
+        for dependent in self.orphans.pop(skill, []):
             try:
-                _dfs_cycle_check(node, graph, visited, recursion_stack, [])
+                self.add_edge(dependent, skill)
             except GraphValidationError as e:
-                # Re-lança a exceção para ser tratada externamente
-                raise e
-    
-    return "Nenhum ciclo detectado."
+                rejected = rejected or e
+        if rejected is not None:
+            raise rejected
+        return self.status()
+
+    def add_edge(self, skill, prereq):
+        """Inclui a aresta 'skill' exige 'prereq', reordenando só a região afetada."""
+        if prereq not in self.position:
+            self.orphans.setdefault(prereq, []).append(skill)
+            return self.status()
+
+        u = self.position[skill]
+        p = self.position[prereq]
+        if u == p:
+            raise GraphValidationError(f"Ciclo detectado: {skill} -> {skill}")
+
+        order_p, order_u = self.order[p], self.order[u]
+        if order_p > order_u:
+            # Região afetada: dependentes de 'skill' até a posição de 'prereq' ...
+            forward = self._search(u, self.dependents, lambda w: self.order[w] <= order_p, target=p)
+            if forward is None:
+                cycle = self._cycle_path(p, u)
+                raise GraphValidationError(f"Ciclo detectado: {' -> '.join(self.ids[i] for i in cycle)}")
+            # ... e pré-requisitos de 'prereq' a partir da posição de 'skill'
+            backward = self._search(p, self.prereqs, lambda w: self.order[w] >= order_u)
+            self._reorder(backward, forward)
+
+        self.prereqs[u].append(p)
+        self.dependents[p].append(u)
+        return self.status()
+
+    def _search(self, start, adjacency, inside, target=None):
+        """Busca iterativa restrita à região afetada; None se alcançar 'target'."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for w in adjacency[v]:
+                if w == target:
+                    return None
+                if w not in seen and inside(w):
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    def _cycle_path(self, prereq, skill):
+        """Caminho skill -> prereq -> ... -> skill para a mensagem de erro."""
+        parent = {prereq: None}
+        queue = [prereq]
+        for v in queue:
+            if v == skill:
+                break
+            for w in self.prereqs[v]:
+                if w not in parent:
+                    parent[w] = v
+                    queue.append(w)
+        path = [skill]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        return [skill] + path[::-1]
+
+    def _reorder(self, backward, forward):
+        """Reaproveita as posições da região: pré-requisitos antes dos dependentes."""
+        back = sorted(backward, key=self.order.__getitem__)
+        front = sorted(forward, key=self.order.__getitem__)
+        slots = sorted(self.order[i] for i in back + front)
+        for node, slot in zip(back + front, slots):
+            self.order[node] = slot
+
+    def status(self):
+        """Órfãos pendentes (habilidade, pré-requisito inexistente); o grafo é sempre acíclico."""
+        return {
+            'Ciclos': [],
+            'Órfãos': sorted((skill, prereq) for prereq, skills in self.orphans.items() for skill in skills)
+        }
 
 def check_for_orphan_nodes(graph, all_skills):
     """
@@ -75,22 +506,86 @@ def check_for_orphan_nodes(graph, all_skills):
         orphan_nodes.update(orphans)
         
     if orphan_nodes:
-        raise GraphValidationError(f"Nós órfãos detectados (pré-requisitos inexistentes): {', '.join(orphan_nodes)}")
+        raise GraphValidationError(f"Nós órfãos detectados (pré-requisitos inexistentes): {', '.join(sorted(orphan_nodes))}")
     
     return "Nenhum nó órfão detectado."
 
-def validate_graph():
+# Validação memorizada por versão do catálogo e validador incremental
+# correspondente (montado na primeira edição feita por edit_skill)
+_VALIDATION = {'version': None, 'result': None, 'validator': None}
+
+def _current_validation():
+    """Resultado de analyze_graph para a versão atual do catálogo (O(V+E), sem compilar o índice)."""
+    version = catalog_version()
+    if _VALIDATION['version'] != version:
+        result = analyze_graph(build_prerequisite_graph(get_habilidades()))
+        _VALIDATION.update(version=version, result=result, validator=None)
+    return _VALIDATION['result']
+
+def edit_skill(skill_id, dados):
     """
-    Função principal para validar o grafo de habilidades.
+    Inclui ou altera uma habilidade do catálogo ativo com validação
+    incremental. Habilidades novas e edições que só acrescentam
+    pré-requisitos passam pelo IncrementalGraphValidator (apenas a região
+    afetada da ordem topológica é visitada); edições que removem
+    pré-requisitos revalidam o grafo inteiro em O(V+E). Uma edição que
+    fecharia um ciclo passando por 'skill_id' é rejeitada com
+    GraphValidationError e o catálogo fica inalterado. Trocas de catálogo
+    (use_catalog / load_catalog) descartam o validador, remontado na
+    próxima edição.
+
+    Returns:
+        dict: {'Ciclos': [...], 'Órfãos': [...]} após a edição.
     """
+    result = _current_validation()
     habilidades = get_habilidades()
+    previous = habilidades.get(skill_id)
+    prereqs = list(dados['Pre_Reqs'])
+    added = [p for p in prereqs if previous is None or p not in previous['Pre_Reqs']]
+    removes = previous is not None and any(p not in prereqs for p in previous['Pre_Reqs'])
+
+    if not result['Ciclos'] and not removes:
+        validator = _VALIDATION['validator']
+        if validator is None:
+            validator = IncrementalGraphValidator(build_prerequisite_graph(habilidades))
+        try:
+            status = validator.add_skill(skill_id, added)
+        except GraphValidationError:
+            # O validador pode ter ficado com parte das arestas: é descartado
+            _VALIDATION['validator'] = None
+            raise
+        update_skill(skill_id, dados)
+        _VALIDATION.update(version=catalog_version(), result=status, validator=validator)
+        return status
+
     graph = build_prerequisite_graph(habilidades)
-    all_skills = set(habilidades.keys())
+    graph[skill_id] = prereqs
+    new_result = analyze_graph(graph)
+    for cycle in new_result['Ciclos']:
+        if skill_id in cycle:
+            raise GraphValidationError(f"Ciclo detectado: {' -> '.join(cycle)}")
+    update_skill(skill_id, dados)
+    _VALIDATION.update(version=catalog_version(), result=new_result, validator=None)
+    return new_result
+
+def validate_graph():
+    """
+    Função principal para validar o grafo de habilidades.
+    Analisa a adjacência CSR montada direto do catálogo (sem compilar o
+    índice) e memoriza o resultado por versão do catálogo; após edit_skill,
+    o resultado já vem do validador incremental.
+    """
+    result = _current_validation()
     
     # 1. Checar nós órfãos
-    orphan_result = check_for_orphan_nodes(graph, all_skills)
+    if result['Órfãos']:
+        orphan_nodes = sorted({prereq for _, prereq in result['Órfãos']})
+        raise GraphValidationError(f"Nós órfãos detectados (pré-requisitos inexistentes): {', '.join(orphan_nodes)}")
+    orphan_result = "Nenhum nó órfão detectado."
     
     # 2. Checar ciclos
-    cycle_result = check_for_cycles(graph)
+    if result['Ciclos']:
+        raise GraphValidationError(f"Ciclo detectado: {' -> '.join(result['Ciclos'][0])}")
+    cycle_result = "Nenhum ciclo detectado."
     
     return orphan_result, cycle_result
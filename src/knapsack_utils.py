@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo com o motor de Mochila 2-D (Tempo x Complexidade) com restrição de
+precedência: o conjunto escolhido deve ser fechado por pré-requisitos.
+
+A DP percorre as habilidades em pré-ordem de uma floresta geradora do grafo
+de pré-requisitos ("pegar o nó" ou "pular a subárvore inteira"), com tabelas
+NumPy densas indexadas pelo orçamento restante. Quando o grafo não é uma
+floresta, a solução exata vem da busca por rótulos de pareto_utils.
+"""
+import numpy as np
+
+from .graph_utils import eligible_topological_order
+from .pareto_utils import compute_pareto_frontier
+
+KNAPSACK_MAX_ROTULOS = 200_000  # rótulos da busca exata; acima disso, DP em floresta aproximada
+
+
+def build_spanning_forest(habilidades, candidatos):
+    """
+    Constrói uma floresta geradora do DAG de pré-requisitos.
+
+    Cada habilidade recebe como pai o pré-requisito mais profundo (maior posição
+    topológica). Pré-requisitos que não são ancestrais na floresta ficam em
+    'extras' e são incorporados ao custo do nó; se nenhum nó tiver extras, o
+    grafo é uma floresta (após redução transitiva) e a DP é exata.
+
+    Returns:
+        tuple: (ordem_pre_ordem, fim_subarvore, extras)
+    """
+    topo = eligible_topological_order(habilidades, candidatos)
+    position = {s: i for i, s in enumerate(topo)}
+
+    parent = {}
+    children = {s: [] for s in topo}
+    for s in topo:
+        prereqs = habilidades[s]['Pre_Reqs']
+        if prereqs:
+            parent[s] = max(prereqs, key=position.__getitem__)
+            children[parent[s]].append(s)
+
+    # Ancestrais no DAG e na floresta, em ordem topológica
+    dag_ancestors = {}
+    forest_ancestors = {}
+    extras = {}
+    for s in topo:
+        ancestors = set()
+        for p in habilidades[s]['Pre_Reqs']:
+            ancestors.add(p)
+            ancestors |= dag_ancestors[p]
+        dag_ancestors[s] = ancestors
+
+        if s in parent:
+            forest_ancestors[s] = forest_ancestors[parent[s]] | {parent[s]}
+        else:
+            forest_ancestors[s] = set()
+        extras[s] = ancestors - forest_ancestors[s]
+
+    # Pré-ordem iterativa com o índice de fim de cada subárvore
+    preorder = []
+    end = {}
+    roots = [s for s in topo if s not in parent]
+    stack = [(s, False) for s in reversed(roots)]
+    while stack:
+        node, closing = stack.pop()
+        if closing:
+            end[node] = len(preorder)
+            continue
+        preorder.append(node)
+        stack.append((node, True))
+        for child in reversed(children[node]):
+            stack.append((child, False))
+
+    return preorder, [end[s] for s in preorder], extras
+
+
+def _forest_knapsack(habilidades, tempo_max, complexidade_max, preorder, end, extras):
+    """
+    DP "pegar o nó / pular a subárvore" sobre a pré-ordem da floresta.
+
+    Cada item custa o Tempo/Complexidade do nó mais os dos seus extras, mas
+    vale apenas o Valor do próprio nó: um extra que também seja escolhido
+    como nó da floresta nunca tem o valor contado duas vezes (seu custo
+    pode ser, o que mantém o conjunto viável). Sem extras, a DP é exata.
+
+    Returns:
+        set: Conjunto escolhido (fechado por pré-requisitos).
+    """
+    n = len(preorder)
+    shape = (tempo_max + 1, complexidade_max + 1)
+
+    # Pesos de cada item (nó + custo dos pré-requisitos extras agregados)
+    items = []
+    for s in preorder:
+        bundle = [s] + sorted(extras[s])
+        items.append((
+            sum(habilidades[b]['Tempo'] for b in bundle),
+            sum(habilidades[b]['Complexidade'] for b in bundle),
+            habilidades[s]['Valor']
+        ))
+
+    # Última posição que ainda precisa da tabela j (a tabela é liberada em seguida)
+    last_use = {j: j - 1 for j in range(1, n + 1)}
+    for i in range(n):
+        last_use[end[i]] = min(last_use[end[i]], i)
+
+    # Decisões "pegar" guardadas como bits compactados (1 bit por orçamento)
+    tables = {n: np.zeros(shape)}
+    take_bits = [None] * n
+
+    for i in reversed(range(n)):
+        t, c, v = items[i]
+        skip = tables[end[i]]
+        best = skip
+
+        if t <= tempo_max and c <= complexidade_max:
+            take = np.full(shape, -np.inf)
+            take[t:, c:] = tables[i + 1][:shape[0] - t, :shape[1] - c] + v
+            take_mask = take > skip
+            take_bits[i] = np.packbits(take_mask, axis=None)
+            best = np.where(take_mask, take, skip)
+
+        tables[i] = best
+        for j in [i + 1, end[i]]:
+            if j in tables and last_use.get(j) == i:
+                del tables[j]
+
+    # Reconstrução: percorre a pré-ordem a partir do orçamento cheio
+    chosen = set()
+    i, bt, bc = 0, tempo_max, complexidade_max
+    while i < n:
+        flat = bt * shape[1] + bc
+        if take_bits[i] is not None and (take_bits[i][flat >> 3] >> (7 - (flat & 7))) & 1:
+            t, c, _ = items[i]
+            chosen.add(preorder[i])
+            chosen.update(extras[preorder[i]])
+            bt -= t
+            bc -= c
+            i += 1
+        else:
+            i = end[i]
+    return chosen
+
+
+def solve_precedence_knapsack(habilidades, tempo_max, complexidade_max, candidatos=None,
+                              max_rotulos=KNAPSACK_MAX_ROTULOS):
+    """
+    Maximiza o Valor total de um conjunto fechado por pré-requisitos sujeito a
+    Tempo <= tempo_max e Complexidade <= complexidade_max (inteiros).
+
+    Métodos, na ordem:
+        - floresta de pré-requisitos: DP em floresta, exata;
+        - DAG geral: busca exata por rótulos com poda por dominância
+          (pareto_utils.compute_pareto_frontier com os orçamentos como teto);
+        - DAG geral acima de 'max_rotulos' rótulos: DP em floresta com os
+          pré-requisitos extras agregados ao custo do nó. O conjunto é viável
+          e fechado, mas pode não ser ótimo ('Exato' = False).
+
+    Returns:
+        dict: Conjunto escolhido, seus totais, 'Método' e 'Exato'.
+    """
+    if candidatos is None:
+        candidatos = habilidades.keys()
+
+    preorder, end, extras = build_spanning_forest(habilidades, candidatos)
+    if not any(extras.values()):
+        chosen = _forest_knapsack(habilidades, tempo_max, complexidade_max, preorder, end, extras)
+        method, exact = 'DP em Floresta', True
+    else:
+        frontier = compute_pareto_frontier(
+            habilidades, candidatos, tempo_max, complexidade_max, max_rotulos=max_rotulos
+        )
+        if frontier is not None:
+            best = max(frontier, key=lambda p: (p[0], -p[1], -p[2]))
+            chosen = set(best[3])
+            method, exact = 'Rótulos com Dominância', True
+        else:
+            chosen = _forest_knapsack(habilidades, tempo_max, complexidade_max, preorder, end, extras)
+            method, exact = 'DP em Floresta (Aproximada)', False
+
+    return {
+        'Conjunto': sorted(chosen),
+        'Valor Total': sum(habilidades[s]['Valor'] for s in chosen),
+        'Tempo Total': sum(habilidades[s]['Tempo'] for s in chosen),
+        'Complexidade Total': sum(habilidades[s]['Complexidade'] for s in chosen),
+        'Método': method,
+        'Exato': exact
+    }
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo da fronteira de Pareto (Valor máx., Tempo mín., Complexidade mín.)
+sobre os conjuntos de habilidades fechados por pré-requisitos.
+
+A fronteira é calculada uma vez por catálogo (e orçamentos máximos) por
+rótulos com poda por dominância; consultas de orçamento ("qual o melhor
+valor com Tempo <= T e Complexidade <= C?") são respondidas por busca
+binária sobre escadas pré-calculadas, sem refazer a otimização.
+"""
+from bisect import bisect_left, bisect_right
+
+from ..data import get_compiled_catalog, get_habilidades
+from .graph_utils import eligible_topological_order
+
+
+def pareto_filter(points):
+    """
+    Remove os pontos dominados. Cada ponto é (valor, tempo, complexidade, ...).
+    Ordena por (tempo, complexidade, -valor) e mantém uma escada 2-D
+    (complexidade -> maior valor) dos pontos já aceitos: O(n log n) consultas.
+    Entre pontos idênticos, fica o primeiro na ordem de entrada.
+    """
+    ordered = sorted(range(len(points)), key=lambda i: (points[i][1], points[i][2], -points[i][0], i))
+    stair_c = []   # complexidades crescentes
+    stair_v = []   # valores estritamente crescentes
+    kept = []
+    for i in ordered:
+        valor, _, complexidade = points[i][:3]
+        j = bisect_right(stair_c, complexidade) - 1
+        if j >= 0 and stair_v[j] >= valor:
+            continue
+        kept.append(points[i])
+        # Insere na escada e remove os degraus agora dominados
+        k = bisect_left(stair_c, complexidade)
+        end = k
+        while end < len(stair_c) and stair_v[end] <= valor:
+            end += 1
+        stair_c[k:end] = [complexidade]
+        stair_v[k:end] = [valor]
+    return kept
+
+
+def _narrow_order(habilidades, order):
+    """
+    Reordena uma ordem topológica para manter estreita a assinatura dos
+    rótulos: entre as habilidades liberadas, escolhe a que encerra mais
+    pré-requisitos pendentes (último dependente) e abre menos novos.
+    """
+    position = {s: i for i, s in enumerate(order)}
+    dependents = {s: [] for s in order}
+    for s in order:
+        for p in habilidades[s]['Pre_Reqs']:
+            dependents[p].append(s)
+    remaining_deps = {s: len(dependents[s]) for s in order}
+    missing = {s: len(habilidades[s]['Pre_Reqs']) for s in order}
+
+    ready = {s for s in order if missing[s] == 0}
+    narrow = []
+    while ready:
+        def score(s):
+            closes = sum(1 for p in habilidades[s]['Pre_Reqs'] if remaining_deps[p] == 1)
+            opens = 1 if dependents[s] else 0
+            return (opens - closes, position[s])
+        node = min(ready, key=score)
+        ready.discard(node)
+        narrow.append(node)
+        for p in habilidades[node]['Pre_Reqs']:
+            remaining_deps[p] -= 1
+        for dep in dependents[node]:
+            missing[dep] -= 1
+            if missing[dep] == 0:
+                ready.add(dep)
+    return narrow
+
+
+def compute_pareto_frontier(habilidades, candidatos=None, tempo_max=None, complexidade_max=None,
+                            max_rotulos=None):
+    """
+    Fronteira de Pareto dos conjuntos fechados por pré-requisitos.
+
+    As habilidades são processadas em ordem topológica (ver _narrow_order) com a decisão
+    "incluir / não incluir". Dois rótulos só são comparados quando coincidem
+    nas habilidades que ainda liberam dependentes não processados (a
+    assinatura): nesse caso, têm as mesmas opções futuras e a dominância em
+    (Valor, Tempo, Complexidade) é uma poda segura. Rótulos acima de
+    'tempo_max' / 'complexidade_max' são descartados.
+
+    Returns:
+        list: Pontos (valor, tempo, complexidade, conjunto) não dominados; o
+        conjunto segue a ordem de 'candidatos'. None se algum passo passar
+        de 'max_rotulos' rótulos.
+    """
+    if candidatos is None:
+        candidatos = habilidades.keys()
+    candidatos = list(candidatos)
+    order = _narrow_order(habilidades, eligible_topological_order(habilidades, candidatos))
+    local = {s: i for i, s in enumerate(order)}
+    prereqs = [
+        sum(1 << local[p] for p in habilidades[s]['Pre_Reqs']) for s in order
+    ]
+
+    # Última posição (na ordem) de um dependente de cada habilidade e as
+    # habilidades que deixam de liberar dependentes em cada posição
+    last_dependent = [-1] * len(order)
+    for i, s in enumerate(order):
+        for p in habilidades[s]['Pre_Reqs']:
+            last_dependent[local[p]] = max(last_dependent[local[p]], i)
+    retired = [0] * len(order)
+    for j, last in enumerate(last_dependent):
+        if last > j:
+            retired[last] |= 1 << j
+
+    t_cap = float('inf') if tempo_max is None else tempo_max
+    c_cap = float('inf') if complexidade_max is None else complexidade_max
+
+    labels = [(0, 0, 0, 0)]  # (valor, tempo, complexidade, mask)
+    active = 0               # habilidades processadas com dependentes pendentes
+    for i, s in enumerate(order):
+        skill = habilidades[s]
+        expanded = list(labels)
+        for valor, tempo, complexidade, mask in labels:
+            if prereqs[i] & ~mask:
+                continue
+            new_t = tempo + skill['Tempo']
+            new_c = complexidade + skill['Complexidade']
+            if new_t <= t_cap and new_c <= c_cap:
+                expanded.append((valor + skill['Valor'], new_t, new_c, mask | (1 << i)))
+
+        if last_dependent[i] > i:
+            active |= 1 << i
+        active &= ~retired[i]
+
+        # Poda por dominância dentro de cada assinatura
+        groups = {}
+        for label in expanded:
+            groups.setdefault(label[3] & active, []).append(label)
+        labels = []
+        for group in groups.values():
+            labels.extend(group if len(group) == 1 else pareto_filter(group))
+        if max_rotulos is not None and len(labels) > max_rotulos:
+            return None
+
+    frontier = pareto_filter(labels)
+    rank = {s: i for i, s in enumerate(candidatos)}
+    return [
+        (valor, tempo, complexidade,
+         sorted((order[j] for j in range(len(order)) if mask >> j & 1), key=rank.__getitem__))
+        for valor, tempo, complexidade, mask in frontier
+    ]
+
+
+class ParetoFrontier:
+    """
+    Fronteira armazenada com escadas para consultas de orçamento em O(log n).
+
+    Para cada nível distinto de Complexidade, guarda os pontos com
+    complexidade <= nível ordenados por Tempo (com o índice do melhor Valor
+    até cada posição) e ordenados por Valor (com o índice do menor Tempo a
+    partir de cada posição).
+    """
+
+    def __init__(self, points):
+        self.points = sorted(points, key=lambda p: (p[1], p[2], -p[0]))
+        self.levels = sorted({p[2] for p in self.points})
+        self._by_time = []
+        self._by_value = []
+        members = sorted(range(len(self.points)), key=lambda i: self.points[i][2])
+        cursor = 0
+        current = []
+        for level in self.levels:
+            while cursor < len(members) and self.points[members[cursor]][2] <= level:
+                current.append(members[cursor])
+                cursor += 1
+
+            by_time = sorted(current)  # self.points já está ordenado por Tempo
+            best = []
+            for i in by_time:
+                if not best or self._better_value(i, best[-1]):
+                    best.append(i)
+                else:
+                    best.append(best[-1])
+            self._by_time.append(([self.points[i][1] for i in by_time], best))
+
+            by_value = sorted(current, key=lambda i: (self.points[i][0], -self.points[i][1]))
+            fastest = [None] * len(by_value)
+            for k in range(len(by_value) - 1, -1, -1):
+                i = by_value[k]
+                nxt = fastest[k + 1] if k + 1 < len(by_value) else None
+                fastest[k] = i if nxt is None or self._faster(i, nxt) else nxt
+            self._by_value.append(([self.points[i][0] for i in by_value], fastest))
+
+    def _better_value(self, i, j):
+        a, b = self.points[i], self.points[j]
+        return (a[0], -a[1], -a[2]) > (b[0], -b[1], -b[2])
+
+    def _faster(self, i, j):
+        a, b = self.points[i], self.points[j]
+        return (a[1], -a[0], a[2]) < (b[1], -b[0], b[2])
+
+    def _level(self, complexidade_max):
+        if complexidade_max is None:
+            return len(self.levels) - 1
+        return bisect_right(self.levels, complexidade_max) - 1
+
+    def __len__(self):
+        return len(self.points)
+
+    @staticmethod
+    def _as_dict(point):
+        if point is None:
+            return None
+        valor, tempo, complexidade, conjunto = point
+        return {'Valor': valor, 'Tempo': tempo, 'Complexidade': complexidade, 'Conjunto': conjunto}
+
+    def best_within(self, tempo_max=None, complexidade_max=None):
+        """Maior Valor com Tempo <= tempo_max e Complexidade <= complexidade_max."""
+        level = self._level(complexidade_max)
+        if level < 0:
+            return None
+        tempos, best = self._by_time[level]
+        j = len(tempos) - 1 if tempo_max is None else bisect_right(tempos, tempo_max) - 1
+        return self._as_dict(self.points[best[j]]) if j >= 0 else None
+
+    def min_time_for_value(self, valor_min, complexidade_max=None):
+        """Menor Tempo com Valor >= valor_min e Complexidade <= complexidade_max."""
+        level = self._level(complexidade_max)
+        if level < 0:
+            return None
+        valores, fastest = self._by_value[level]
+        j = bisect_left(valores, valor_min)
+        return self._as_dict(self.points[fastest[j]]) if j < len(valores) else None
+
+    def as_records(self):
+        """Fronteira completa como lista de dicionários (ordenada por Tempo)."""
+        return [self._as_dict(p) for p in self.points]
+
+
+_FRONTIERS = {}
+
+def get_pareto_frontier(candidatos=None, tempo_max=None, complexidade_max=None):
+    """
+    Fronteira do catálogo atual, memorizada por (versão do catálogo,
+    candidatos, orçamentos máximos).
+    """
+    catalog = get_compiled_catalog()
+    key = (
+        catalog.content_hash,
+        None if candidatos is None else tuple(sorted(candidatos)),
+        tempo_max,
+        complexidade_max
+    )
+    frontier = _FRONTIERS.get(key)
+    if frontier is None:
+        # Mantém apenas as fronteiras da versão atual do catálogo
+        for old_key in [k for k in _FRONTIERS if k[0] != catalog.content_hash]:
+            del _FRONTIERS[old_key]
+        frontier = ParetoFrontier(compute_pareto_frontier(
+            get_habilidades(), candidatos, tempo_max, complexidade_max
+        ))
+        _FRONTIERS[key] = frontier
+    return frontier
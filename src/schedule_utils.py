@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de agendamento de habilidades em trilhas paralelas (P|prec|Cmax).
+
+Distribui as habilidades em P trilhas minimizando o makespan (tempo total
+até a última conclusão), respeitando os pré-requisitos: uma habilidade só
+começa depois que todos os seus pré-requisitos terminaram, em qualquer trilha.
+"""
+import heapq
+
+from ..data import get_compiled_catalog
+from .graph_utils import GraphValidationError
+
+BB_MAX_HABILIDADES = 20     # maior instância aceita pelo branch-and-bound exato
+BB_MAX_NOS = 200_000        # limite de nós explorados (acima dele, 'Exato' = False)
+
+
+def _schedulable_order(catalog):
+    """
+    Ordem topológica das habilidades agendáveis: exclui as que dependem,
+    direta ou transitivamente, de um pré-requisito inexistente.
+
+    Returns:
+        tuple: (ordem, posições_não_agendáveis)
+    """
+    if catalog.topological_order is None:
+        raise GraphValidationError("Ciclo detectado: o agendamento exige um grafo acíclico.")
+
+    blocked = set(catalog.bits(catalog.orphan_mask))
+    order = []
+    for v in catalog.topological_order:
+        prereqs = catalog.prereq_targets[catalog.prereq_offsets[v]:catalog.prereq_offsets[v + 1]]
+        if v in blocked or any(p in blocked for p in prereqs):
+            blocked.add(v)
+        else:
+            order.append(v)
+    return order, blocked
+
+
+def critical_path_lengths(catalog, order):
+    """
+    Comprimento do caminho crítico a partir de cada habilidade ("bottom
+    level"): seu Tempo mais o maior caminho entre os dependentes. O(V+E).
+    """
+    rank = {}
+    for v in reversed(order):
+        deps = catalog.dependent_targets[catalog.dependent_offsets[v]:catalog.dependent_offsets[v + 1]]
+        rank[v] = catalog.tempo[v] + max((rank[d] for d in deps if d in rank), default=0)
+    return rank
+
+
+def _lower_bound(catalog, rank, num_tracks):
+    """Limite inferior do makespan: caminho crítico ou carga média por trilha."""
+    if not rank:
+        return 0
+    total = sum(catalog.tempo[v] for v in rank)
+    return max(max(rank.values()), total / num_tracks)
+
+
+def list_schedule(num_tracks, catalog, order, rank):
+    """
+    Agendador de lista por caminho crítico (HLFET), O((V+E) log V).
+
+    Sempre que uma trilha fica livre, recebe a habilidade liberada de maior
+    caminho crítico; se nenhuma estiver liberada, a trilha espera até a
+    próxima liberação.
+
+    Returns:
+        dict: posição -> (trilha, início, fim)
+    """
+    members = set(order)
+    pending = {v: catalog.prereq_offsets[v + 1] - catalog.prereq_offsets[v] for v in order}
+    ready_time = dict.fromkeys(order, 0)
+
+    released = [(0, v) for v in order if pending[v] == 0]  # (liberação, posição)
+    heapq.heapify(released)
+    available = []                                          # (-caminho crítico, posição)
+    tracks = [(0, t) for t in range(num_tracks)]            # (livre a partir de, trilha)
+
+    schedule = {}
+    while released or available:
+        free_at, track = heapq.heappop(tracks)
+        if not available:
+            free_at = max(free_at, released[0][0])
+        while released and released[0][0] <= free_at:
+            _, v = heapq.heappop(released)
+            heapq.heappush(available, (-rank[v], v))
+
+        # Itens liberados durante a espera de outra trilha podem ter liberação > free_at
+        _, v = heapq.heappop(available)
+        start = max(free_at, ready_time[v])
+        finish = start + catalog.tempo[v]
+        schedule[v] = (track, start, finish)
+        heapq.heappush(tracks, (finish, track))
+
+        for d in catalog.dependent_targets[catalog.dependent_offsets[v]:catalog.dependent_offsets[v + 1]]:
+            if d not in members:
+                continue
+            ready_time[d] = max(ready_time[d], finish)
+            pending[d] -= 1
+            if pending[d] == 0:
+                heapq.heappush(released, (ready_time[d], d))
+
+    return schedule
+
+
+def branch_and_bound_schedule(num_tracks, catalog, order, rank, upper_bound, max_nos=BB_MAX_NOS):
+    """
+    Branch-and-bound exato para instâncias pequenas.
+
+    Enumera as ordens de início compatíveis com os pré-requisitos; cada
+    habilidade começa o mais cedo possível na trilha que fica livre primeiro
+    (toda agenda ótima é reproduzida por alguma dessas ordens). Poda pelo
+    maior entre o caminho crítico restante e a carga média, e por estados
+    repetidos (conjunto agendado, tempos livres das trilhas, que são
+    intercambiáveis, e término das habilidades com dependentes pendentes).
+
+    Returns:
+        tuple: (agenda ou None se nada melhor que upper_bound, exato)
+    """
+    n = len(order)
+    local = {v: i for i, v in enumerate(order)}
+    tempo = [catalog.tempo[v] for v in order]
+    crit = [rank[v] for v in order]
+    prereq_mask = [0] * n
+    dependent_mask = [0] * n
+    for i, v in enumerate(order):
+        for p in catalog.prereq_targets[catalog.prereq_offsets[v]:catalog.prereq_offsets[v + 1]]:
+            prereq_mask[i] |= 1 << local[p]
+            dependent_mask[local[p]] |= 1 << i
+    full = (1 << n) - 1
+    total_work = sum(tempo)
+
+    best = {'makespan': upper_bound, 'schedule': None}
+    seen = set()
+    nodes = 0
+    finish = [0] * n
+    placement = [None] * n
+
+    def visit(done, free, work_done):
+        nonlocal nodes
+        nodes += 1
+        if nodes > max_nos:
+            return False
+        if done == full:
+            makespan = max(free)
+            if makespan < best['makespan']:
+                best['makespan'] = makespan
+                best['schedule'] = list(placement)
+            return True
+
+        # O estado inclui o término das habilidades que ainda liberam dependentes
+        frontier = tuple(finish[i] for i in range(n) if done >> i & 1 and dependent_mask[i] & ~done)
+        state = (done, tuple(sorted(free)), frontier)
+        if state in seen:
+            return True
+        seen.add(state)
+
+        earliest = min(free)
+        bound = (sum(free) + total_work - work_done) / num_tracks
+        candidates = []
+        for i in range(n):
+            if done >> i & 1 or prereq_mask[i] & ~done:
+                continue
+            ready = max((finish[j] for j in range(n) if prereq_mask[i] >> j & 1), default=0)
+            start = max(ready, earliest)
+            bound = max(bound, start + crit[i])
+            candidates.append((-crit[i], start, i))
+        if bound >= best['makespan']:
+            return True
+
+        track = free.index(earliest)
+        for _, start, i in sorted(candidates):
+            finish[i] = start + tempo[i]
+            placement[i] = (track, start, finish[i])
+            previous = free[track]
+            free[track] = finish[i]
+            complete = visit(done | 1 << i, free, work_done + tempo[i])
+            free[track] = previous
+            if not complete:
+                return False
+        return True
+
+    exact = visit(0, [0] * num_tracks, 0)
+    if best['schedule'] is None:
+        return None, exact
+    return {order[i]: best['schedule'][i] for i in range(n)}, exact
+
+
+def schedule_tracks(num_tracks=2, metodo="lista", max_nos=BB_MAX_NOS):
+    """
+    Agenda o catálogo atual em 'num_tracks' trilhas paralelas.
+
+    Métodos:
+        - "lista": agendador de lista por caminho crítico (heurístico).
+        - "exato": branch-and-bound semeado pela agenda de lista (até
+          BB_MAX_HABILIDADES habilidades; acima disso, usa a lista).
+
+    Returns:
+        dict: Cronograma por trilha, makespan, limite inferior e gap.
+    """
+    if num_tracks < 1:
+        raise ValueError("O número de trilhas deve ser ao menos 1.")
+    if metodo not in ("lista", "exato"):
+        raise ValueError(f"Método desconhecido: {metodo}")
+
+    catalog = get_compiled_catalog()
+    order, blocked = _schedulable_order(catalog)
+    rank = critical_path_lengths(catalog, order)
+    lower_bound = _lower_bound(catalog, rank, num_tracks)
+
+    schedule = list_schedule(num_tracks, catalog, order, rank)
+    makespan = max((f for _, _, f in schedule.values()), default=0)
+    method = 'Lista (Caminho Crítico)'
+    exact = makespan <= lower_bound
+
+    if metodo == "exato" and not exact and len(order) <= BB_MAX_HABILIDADES:
+        improved, exact = branch_and_bound_schedule(
+            num_tracks, catalog, order, rank, makespan, max_nos
+        )
+        method = 'Branch-and-Bound'
+        if improved is not None:
+            schedule = improved
+            makespan = max(f for _, _, f in schedule.values())
+
+    timelines = [[] for _ in range(num_tracks)]
+    for v, (track, start, end) in sorted(schedule.items(), key=lambda item: (item[1][1], item[0])):
+        timelines[track].append({'ID': catalog.ids[v], 'Início': start, 'Fim': end})
+
+    return {
+        'Método': method,
+        'Trilhas': timelines,
+        'Makespan': makespan,
+        'Limite Inferior': lower_bound,
+        'Gap': (makespan - lower_bound) / makespan if makespan else 0.0,
+        'Exato': exact,
+        'Não Agendáveis': [catalog.ids[v] for v in sorted(blocked)]
+    }
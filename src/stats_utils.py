@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de utilidades estatísticas para simulações em fluxo (streaming).
+Inclui acumuladores de memória constante para média/variância (Welford),
+quantis (P²) e histogramas de bins fixos.
+"""
+import copy
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+BINS_QUANTIS_PADRAO = 4096  # bins internos (mínimo) usados para interpolar os quantis
+
+
+class P2Quantile:
+    """
+    Estimador P² (Jain & Chlamtac, 1985) de um quantil em fluxo.
+    Mantém apenas 5 marcadores, independentemente do número de observações.
+    """
+
+    def __init__(self, q):
+        self.q = q
+        self._initial = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = (0.0, q / 2, q, (1 + q) / 2, 1.0)
+
+    def update(self, x):
+        """Incorpora uma observação."""
+        if self._heights is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._heights = sorted(self._initial)
+                self._positions = [0, 1, 2, 3, 4]
+                q = self.q
+                self._desired = [0.0, 2 * q, 4 * q, 2 + 2 * q, 4.0]
+            return
+
+        h = self._heights
+        n = self._positions
+
+        # Localiza a célula da observação e ajusta os extremos
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Ajusta os marcadores intermediários (interpolação parabólica ou linear)
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = candidate
+                n[i] += d
+
+    def update_batch(self, values):
+        """Incorpora um vetor de observações (laço sequencial, memória O(1))."""
+        for x in values:
+            self.update(float(x))
+
+    def _parabolic(self, i, d):
+        h = self._heights
+        n = self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        """Retorna a estimativa atual do quantil."""
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return float('nan')
+        ordered = sorted(self._initial)
+        return ordered[min(len(ordered) - 1, int(round(self.q * (len(ordered) - 1))))]
+
+
+class StreamingStats:
+    """
+    Acumulador de memória constante para simulações de Monte Carlo.
+
+    - Média e variância por Welford, combinadas bloco a bloco (fórmula de Chan).
+    - Histograma de bins fixos quando o suporte 'faixa' é conhecido; os quantis
+      são interpolados de uma versão 'resolucao' vezes mais fina do mesmo histograma
+      (padrão: a menor que chega a BINS_QUANTIS_PADRAO bins internos).
+    - Sem 'faixa', os quantis são estimados por P² e não há histograma.
+    """
+
+    def __init__(self, quantis, faixa=None, bins=50, resolucao=None):
+        self.quantis = tuple(quantis)
+        self.faixa = faixa
+        self.bins = bins
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        if faixa is not None:
+            if resolucao is None:
+                resolucao = math.ceil(BINS_QUANTIS_PADRAO / bins)
+            self._edges = np.linspace(faixa[0], faixa[1], bins * resolucao + 1)
+            self._counts = np.zeros(bins * resolucao, dtype=np.int64)
+            self._p2 = None
+        else:
+            self._edges = None
+            self._counts = None
+            self._p2 = [P2Quantile(q) for q in self.quantis]
+
+    def update(self, x):
+        """Incorpora uma única observação (Welford clássico)."""
+        self.update_batch(np.array([x], dtype=float))
+
+    def update_batch(self, values):
+        """Incorpora um bloco de observações sem armazená-las."""
+        n = values.size
+        if n == 0:
+            return
+
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._merge_moments(n, batch_mean, batch_m2)
+
+        if self._counts is not None:
+            # np.histogram descarta valores fora da faixa; usamos clip para mantê-los nas bordas
+            clipped = np.clip(values, self._edges[0], self._edges[-1])
+            self._counts += np.histogram(clipped, bins=self._counts.size, range=self.faixa)[0]
+        else:
+            for estimator in self._p2:
+                estimator.update_batch(values)
+
+    def merge(self, other):
+        """
+        Combina outro acumulador com a mesma configuração (resultado exato).
+
+        Estimadores P² (sem 'faixa') não podem ser combinados: a fusão só é
+        aceita se um dos dois acumuladores estiver vazio; caso contrário,
+        levanta ValueError.
+        """
+        if (self.faixa, self.bins) != (other.faixa, other.bins) or (
+                self._counts is not None and self._counts.size != other._counts.size):
+            raise ValueError("Acumuladores com configurações diferentes (faixa/bins).")
+        if self._p2 is not None and other.count:
+            if self.count:
+                raise ValueError(
+                    "Quantis P² não podem ser combinados; informe 'faixa' para usar o histograma."
+                )
+            self._p2 = copy.deepcopy(other._p2)
+
+        self._merge_moments(other.count, other.mean, other.m2)
+        if self._counts is not None:
+            self._counts += other._counts
+
+    def _merge_moments(self, n, mean, m2):
+        if n == 0:
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def std(self, ddof=0):
+        """Desvio padrão (populacional por padrão, como np.std)."""
+        if self.count <= ddof:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - ddof))
+
+    def ci_half_width(self, confianca=0.95):
+        """Meia-largura do intervalo de confiança (aprox. normal) para a média."""
+        if self.count < 2:
+            return float('inf')
+        z = NormalDist().inv_cdf(0.5 + confianca / 2)
+        return z * self.std(ddof=1) / math.sqrt(self.count)
+
+    def quantiles(self):
+        """Dicionário {q: estimativa}."""
+        if self.count == 0:
+            return {}
+        if self._counts is None:
+            return {estimator.q: estimator.value() for estimator in self._p2}
+
+        cdf = np.concatenate(([0.0], np.cumsum(self._counts, dtype=float)))
+        cdf /= cdf[-1]
+        return {q: float(np.interp(q, cdf, self._edges)) for q in self.quantis}
+
+    def histogram(self):
+        """Histograma de 'bins' barras no formato {'Contagens', 'Bordas'} (ou None)."""
+        if self._counts is None:
+            return None
+        counts = self._counts.reshape(self.bins, -1).sum(axis=1)
+        return {
+            "Contagens": counts.tolist(),
+            "Bordas": np.linspace(self.faixa[0], self.faixa[1], self.bins + 1).tolist()
+        }
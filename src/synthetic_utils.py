@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo gerador de catálogos sintéticos de habilidades (DAGs aleatórios),
+no mesmo formato de HABILIDADES_MESTRE, para testes de escala e benchmarks.
+"""
+import numpy as np
+
+DISTRIBUICOES_PADRAO = {
+    'Tempo': ('uniforme', 20, 150),
+    'Valor': ('uniforme', 1, 10),
+    'Complexidade': ('uniforme', 1, 10)
+}
+
+
+def _sample_column(spec, size, rng):
+    """
+    Amostra uma coluna inteira (>= 1) conforme a especificação:
+        - ('uniforme', minimo, maximo): inteiros uniformes em [minimo, maximo];
+        - ('lognormal', media, sigma): lognormal arredondada;
+        - função (rng, size) -> array.
+    """
+    if callable(spec):
+        values = np.asarray(spec(rng, size))
+    elif spec[0] == 'uniforme':
+        values = rng.integers(spec[1], spec[2] + 1, size=size)
+    elif spec[0] == 'lognormal':
+        values = np.rint(rng.lognormal(spec[1], spec[2], size=size))
+    else:
+        raise ValueError(f"Distribuição desconhecida: {spec[0]}")
+    return np.maximum(values, 1).astype(int).tolist()
+
+
+def _level_sizes(num_habilidades, profundidade):
+    """Divide as habilidades em níveis de tamanho aproximadamente igual."""
+    sizes = [num_habilidades // profundidade] * profundidade
+    for i in range(num_habilidades % profundidade):
+        sizes[i] += 1
+    return sizes
+
+
+def generate_catalog(num_habilidades, profundidade=4, fan_in=2, distribuicoes=None,
+                     num_criticas=5, alvo=None, seed=None):
+    """
+    Gera um catálogo aleatório acíclico.
+
+    As habilidades são distribuídas em 'profundidade' níveis; o nível 0 é a
+    base (sem pré-requisitos). Cada habilidade de nível L > 0 exige uma
+    habilidade do nível L-1 (garantindo a profundidade) e até 'fan_in' - 1
+    pré-requisitos extras de níveis anteriores. Os IDs seguem a ordem dos
+    níveis (S1, S2, ... são habilidades base); se 'alvo' for informado, esse
+    ID é trocado com o da habilidade mais profunda.
+
+    Returns:
+        tuple: (habilidades, criticas)
+    """
+    profundidade = max(1, min(profundidade, num_habilidades))
+    rng = np.random.default_rng(seed)
+    colunas = dict(DISTRIBUICOES_PADRAO, **(distribuicoes or {}))
+
+    ids = [f'S{i + 1}' for i in range(num_habilidades)]
+    if alvo is not None and alvo in ids:
+        a, b = ids.index(alvo), num_habilidades - 1
+        ids[a], ids[b] = ids[b], ids[a]
+
+    # Intervalo [inicio, fim) de posições de cada nível
+    bounds = []
+    start = 0
+    for size in _level_sizes(num_habilidades, profundidade):
+        bounds.append((start, start + size))
+        start += size
+
+    prereqs = [[] for _ in range(num_habilidades)]
+    for level in range(1, profundidade):
+        prev_start, prev_end = bounds[level - 1]
+        level_start, level_end = bounds[level]
+        for i in range(level_start, level_end):
+            chosen = {int(rng.integers(prev_start, prev_end))}
+            extras = min(int(rng.integers(0, fan_in)), level_start - 1)
+            while len(chosen) < extras + 1:
+                chosen.add(int(rng.integers(0, level_start)))
+            prereqs[i] = sorted(chosen)
+
+    tempo = _sample_column(colunas['Tempo'], num_habilidades, rng)
+    valor = _sample_column(colunas['Valor'], num_habilidades, rng)
+    complexidade = _sample_column(colunas['Complexidade'], num_habilidades, rng)
+
+    non_base = list(range(bounds[0][1], num_habilidades)) or list(range(num_habilidades))
+    num_criticas = min(num_criticas, len(non_base))
+    criticas = sorted(int(i) for i in rng.choice(non_base, size=num_criticas, replace=False))
+    critical_set = set(criticas)
+
+    habilidades = {}
+    for i, skill_id in enumerate(ids):
+        if i == num_habilidades - 1:
+            uso = 'Objetivo Final'
+        elif i in critical_set:
+            uso = 'Crítica'
+        elif i < bounds[0][1]:
+            uso = 'Base'
+        else:
+            uso = 'Lista Grande'
+        habilidades[skill_id] = {
+            'Nome': f'Habilidade Sintética {i + 1}',
+            'Tempo': tempo[i],
+            'Valor': valor[i],
+            'Complexidade': complexidade[i],
+            'Pre_Reqs': [ids[p] for p in prereqs[i]],
+            'Uso': uso
+        }
+
+    return habilidades, [ids[i] for i in criticas]
@@ -13,12 +13,19 @@ plt.switch_backend('Agg')
 def plot_monte_carlo_results(simulated_values, expected_value, std_dev):
     """
     Gera um histograma dos resultados da simulação de Monte Carlo.
+    'simulated_values' pode ser a lista de valores simulados ou o histograma
+    já agregado ({'Contagens', 'Bordas'}) dos modos vetorizado/streaming.
     Retorna o HTML para exibição no notebook.
     """
     fig, ax = plt.subplots(figsize=(10, 6))
     
     # Histograma dos valores simulados
-    ax.hist(simulated_values, bins=50, density=True, alpha=0.6, color='skyblue', label='Distribuição de Valor')
+    if isinstance(simulated_values, dict):
+        edges = np.asarray(simulated_values['Bordas'])
+        ax.hist(edges[:-1], bins=edges, weights=simulated_values['Contagens'], density=True,
+                alpha=0.6, color='skyblue', label='Distribuição de Valor')
+    else:
+        ax.hist(simulated_values, bins=50, density=True, alpha=0.6, color='skyblue', label='Distribuição de Valor')
     
     # Linha do Valor Esperado (Média)
     ax.axvline(expected_value, color='red', linestyle='dashed', linewidth=2, label=f'E[Valor] = {expected_value:.2f}')
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração dos testes: registra a raiz do repositório como o pacote
+'dynamic_programming_project' (mesma estrutura do README), para que os
+imports relativos dos módulos funcionem sem instalação.
+"""
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = 'dynamic_programming_project'
+
+if PACKAGE not in sys.modules:
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT)]
+    sys.modules[PACKAGE] = package
+
+from dynamic_programming_project.data import reset_catalog  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def catalogo_padrao():
+    """Cada teste começa e termina com o catálogo embutido."""
+    reset_catalog()
+    yield
+    reset_catalog()
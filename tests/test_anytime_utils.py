@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+from dynamic_programming_project.data import get_base_skills, get_habilidades, use_catalog
+from dynamic_programming_project.src import challenge_3
+from dynamic_programming_project.src.anytime_utils import AnytimeSolver, solve_anytime
+from dynamic_programming_project.src.challenge_3 import anytime_pivot, exhaustive_search
+from dynamic_programming_project.src.challenge_5 import solve_challenge_5
+
+
+def _wait_done(solver, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not solver.done and time.monotonic() < limite:
+        time.sleep(0.005)
+    assert solver.done
+
+
+def test_prazo_devolve_a_melhor_solucao_parcial():
+    liberar = threading.Event()
+
+    def busca():
+        yield 'gulosa', 10, 8
+        liberar.wait(5)
+        yield 'otima', 9, 9
+
+    solver = AnytimeSolver(busca(), "min")
+    parcial = solver.result(time_budget=0.05)
+    assert parcial['Status'] == 'Em Andamento'
+    assert (parcial['Solução'], parcial['Valor'], parcial['Limite']) == ('gulosa', 10, 8)
+    assert parcial['Gap'] == pytest.approx(0.2)
+    assert not parcial['Ótimo Comprovado']
+
+    liberar.set()
+    final = solver.result()
+    assert final['Status'] == 'Concluído'
+    assert (final['Solução'], final['Gap'], final['Ótimo Comprovado']) == ('otima', 0.0, True)
+    assert final['Atualizações'] == 2
+
+
+def test_gap_maximizacao_e_limite_so_aperta():
+    solver = AnytimeSolver(iter([('a', 8, 10), ('b', 7, 12), ('c', 8, 9)]), "max")
+    final = solver.result()
+    assert (final['Solução'], final['Valor'], final['Limite']) == ('c', 8, 9)
+    assert final['Gap'] == pytest.approx(1 / 9)
+
+
+def test_cancelamento_atendido_nos_sinais_de_progresso():
+    def busca():
+        yield 'inicial', 5, 1
+        while True:
+            time.sleep(0.001)
+            yield None
+
+    solver = AnytimeSolver(busca(), "min")
+    solver.result(time_budget=0.02)
+    solver.cancel()
+    _wait_done(solver)
+    resultado = solver.snapshot()
+    assert resultado['Status'] == 'Cancelado'
+    assert resultado['Solução'] == 'inicial'
+    assert resultado['Atualizações'] == 1
+
+
+def test_erro_na_busca():
+    def busca():
+        yield 'parcial', 3, 1
+        raise RuntimeError('falhou')
+
+    resultado = AnytimeSolver(busca(), "min").result()
+    assert resultado['Status'] == 'Erro'
+    assert resultado['Mensagem'] == 'RuntimeError: falhou'
+    assert resultado['Solução'] == 'parcial'
+
+
+def test_meta_inatingivel_e_chave_com_constantes(monkeypatch):
+    viavel = solve_anytime('challenge_3', time_budget=5)
+    assert viavel['Status'] == 'Concluído' and viavel['Ótimo Comprovado']
+
+    monkeypatch.setattr(challenge_3, 'ADAPTABILIDADE_MINIMA', 1000)
+    inviavel = solve_anytime('challenge_3', time_budget=5)
+    assert inviavel['Status'] == 'Inviável'
+    assert inviavel['Gap'] is None
+    assert not inviavel['Ótimo Comprovado']
+
+
+def test_branch_and_bound_produz_solucoes_intermediarias():
+    habilidades = {
+        f'B{i}': {'Nome': f'Base {i}', 'Tempo': 1.5 + (7 * i % 11), 'Valor': 0.5 + (5 * i % 7),
+                  'Complexidade': 1, 'Pre_Reqs': []}
+        for i in range(16)
+    }
+    use_catalog(habilidades)
+    base = get_base_skills()
+    itens = [item for item in anytime_pivot(base, get_habilidades()) if item is not None]
+    # Primeiro item: solução gulosa; depois, as melhorias do branch-and-bound
+    tempos = [tempo for _, tempo, _ in itens[1:]]
+    assert len(tempos) > 2
+    assert tempos == sorted(tempos, reverse=True)
+    assert tempos[-1] == pytest.approx(exhaustive_search(base, habilidades)[2])
+    assert itens[-1][2] == tempos[-1]
+    assert all(limite <= tempo for _, tempo, limite in itens)
+
+
+def test_challenge_5_igual_ao_solver_exato():
+    resultado = solve_anytime('challenge_5', time_budget=5)
+    esperado = solve_challenge_5(motor="recursivo")
+    assert resultado['Status'] == 'Concluído'
+    assert resultado['Ótimo Comprovado']
+    assert resultado['Solução']['Habilidades Recomendadas'] == esperado['Habilidades Recomendadas']
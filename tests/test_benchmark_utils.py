@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import json
+
+from dynamic_programming_project.data import get_habilidades
+from dynamic_programming_project.src.benchmark_utils import measure, run_benchmarks, write_report
+
+
+def test_relatorio_bem_formado(tmp_path):
+    habilidades = get_habilidades()
+    report = run_benchmarks(
+        tamanhos=(12, 30), casos=['challenge_3/exato', 'pareto/fronteira'],
+        aquecimento=0, repeticoes=1, seed=0, profundidade=3
+    )
+
+    metadados = report['Metadados']
+    assert metadados['Tamanhos'] == [12, 30]
+    assert metadados['Repetições'] == 1
+    assert metadados['Parâmetros do Catálogo'] == {'profundidade': 3}
+    assert {'Data', 'Python', 'NumPy', 'Plataforma', 'Seed'} <= set(metadados)
+
+    resultados = report['Resultados']
+    assert [(r['Caso'], r['Tamanho']) for r in resultados] == [
+        ('challenge_3/exato', 12), ('pareto/fronteira', 12),
+        ('challenge_3/exato', 30), ('pareto/fronteira', 30),
+    ]
+    for r in resultados:
+        assert r['Status'] == 'Sucesso', r.get('Mensagem')
+        for chave in ('Mediana (s)', 'P95 (s)', 'Mínimo (s)', 'Média (s)'):
+            assert isinstance(r[chave], float) and r[chave] >= 0
+        assert isinstance(r['Pico de Memória (bytes)'], int)
+    # O catálogo embutido é restaurado ao final
+    assert get_habilidades() is habilidades
+
+    path = tmp_path / 'bench.json'
+    write_report(report, path)
+    assert json.loads(path.read_text(encoding='utf-8')) == json.loads(json.dumps(report, default=str))
+
+
+def test_caso_acima_do_tamanho_maximo_ignorado():
+    report = run_benchmarks(tamanhos=(12, 150), casos=['challenge_5/recursivo'], aquecimento=0, repeticoes=1)
+    assert [r['Status'] for r in report['Resultados']] == ['Sucesso', 'Ignorado']
+
+
+def test_reset_roda_antes_de_cada_execucao():
+    chamadas = []
+    resultado = measure(lambda: chamadas.append('f'), aquecimento=1, repeticoes=2,
+                        reset=lambda: chamadas.append('r'))
+    assert chamadas == ['r', 'f'] * 4
+    assert resultado['Repetições'] == 2
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+
+import pytest
+
+from dynamic_programming_project.data import get_compiled_catalog, get_habilidades, use_catalog
+from dynamic_programming_project.src import cache_utils
+from dynamic_programming_project.src.cache_utils import ResultCache, set_result_cache
+from dynamic_programming_project.src.challenge_1 import find_optimal_path_set, solve_challenge_1
+from dynamic_programming_project.src.challenge_5 import dp_recommendation, solve_challenge_5
+
+
+@pytest.fixture
+def cache(tmp_path):
+    result_cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    previous = set_result_cache(result_cache)
+    yield result_cache
+    set_result_cache(previous)
+
+
+def test_cache_desativado_por_padrao():
+    if not os.environ.get('DP_RESULT_CACHE'):
+        assert cache_utils.get_result_cache() is None
+
+
+def test_arquivo_privado(cache):
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+
+def test_ordem_do_catalogo_entra_na_chave(cache):
+    original = solve_challenge_5(['S1', 'S2'], motor='recursivo')
+    hash_original = get_compiled_catalog().content_hash
+
+    invertido = dict(reversed(list(get_habilidades().items())))
+    use_catalog(invertido)
+    assert get_compiled_catalog().content_hash != hash_original
+
+    recursivo = solve_challenge_5(['S1', 'S2'], motor='recursivo')
+    iterativo = solve_challenge_5(['S1', 'S2'], motor='iterativo')
+    assert recursivo['Habilidades Recomendadas'] == iterativo['Habilidades Recomendadas']
+    assert not {'S1', 'S2'} & set(recursivo['Habilidades Recomendadas'])
+    assert original['Habilidades Recomendadas'] == iterativo['Habilidades Recomendadas']
+
+
+def test_resultado_do_disco_igual_ao_calculado(cache):
+    esperado = solve_challenge_5(motor='recursivo')
+    deterministico = solve_challenge_1(modo='vetorizado', seed=0)[0]
+    assert cache.stats()['Entradas'] > 0
+
+    # Sem o lru_cache em memória, as respostas vêm do disco
+    dp_recommendation.cache_clear()
+    find_optimal_path_set.cache_clear()
+    assert solve_challenge_5(motor='recursivo') == esperado
+    assert dp_recommendation.cache_info().currsize == 0
+    assert solve_challenge_1(modo='vetorizado', seed=0)[0] == deterministico
+    assert isinstance(find_optimal_path_set('S6')[3], frozenset)
+
+
+def _recount(cache):
+    count, total = cache._connection().execute(
+        'SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM resultados'
+    ).fetchone()
+    return {'Entradas': count, 'Bytes': total, 'Arquivo': cache.path}
+
+
+def test_despejo_lru_por_entradas_e_bytes(tmp_path):
+    cache = ResultCache(str(tmp_path / 'lru.sqlite3'), max_entradas=5, max_bytes=2_000)
+    for i in range(20):
+        cache.put('h', 'x', [i], 'v' * 10)
+    assert cache.stats()['Entradas'] == 5
+    assert cache.get('h', 'x', [19]) == (True, 'v' * 10)
+    assert cache.get('h', 'x', [0]) == (False, None)
+
+    for i in range(10):
+        cache.put('h', 'y', [i], 'z' * 600)
+    assert cache.stats()['Bytes'] <= 2_000
+
+    cache.put('h', 'y', [9], 'w')  # substituição ajusta os totais
+    assert cache.stats() == _recount(cache)
+    cache.invalidate(solver='y')
+    assert cache.stats() == _recount(cache)
+    cache.invalidate()
+    assert cache.stats() == {'Entradas': 0, 'Bytes': 0, 'Arquivo': cache.path}
+
+
+def test_valores_em_json(cache):
+    cache.put('h', 's', [1, [2, 3]], {'a': [1.5, None]})
+    assert cache.get('h', 's', [1, [2, 3]]) == (True, {'a': [1.5, None]})
+    with pytest.raises(TypeError):
+        cache.put('h', 's', [2], object())
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+
+import pytest
+
+from dynamic_programming_project.data import (
+    HABILIDADES_MESTRE, get_base_skills, get_habilidades, load_catalog
+)
+from dynamic_programming_project.src.catalog_utils import (
+    SEPARADOR_PRE_REQS, ingest_catalog, open_catalog
+)
+from dynamic_programming_project.src.challenge_3 import solve_challenge_3
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+
+def _write_json(path, habilidades):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(habilidades, f, ensure_ascii=False)
+
+
+def _write_csv(path, habilidades):
+    campos = ['ID', 'Nome', 'Tempo', 'Valor', 'Complexidade', 'Pre_Reqs', 'Uso']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=campos)
+        writer.writeheader()
+        for skill_id, dados in habilidades.items():
+            writer.writerow(dict(
+                dados, ID=skill_id, Pre_Reqs=SEPARADOR_PRE_REQS.join(dados['Pre_Reqs'])
+            ))
+
+
+def _assert_round_trip(catalogo, habilidades):
+    assert list(catalogo) == list(habilidades)
+    assert len(catalogo) == len(habilidades)
+    for skill_id, dados in habilidades.items():
+        assert skill_id in catalogo
+        for campo in ('Nome', 'Tempo', 'Valor', 'Complexidade', 'Pre_Reqs', 'Uso'):
+            assert catalogo[skill_id][campo] == dados[campo]
+    assert 'X1' not in catalogo
+    assert catalogo.base_skills() == [s for s, d in habilidades.items() if not d['Pre_Reqs']]
+
+
+@pytest.mark.parametrize('escrever, nome', [(_write_json, 'catalogo.json'), (_write_csv, 'catalogo.csv')])
+def test_catalogo_mestre_ida_e_volta(tmp_path, escrever, nome):
+    escrever(str(tmp_path / nome), HABILIDADES_MESTRE)
+    content_hash = ingest_catalog(str(tmp_path / nome), str(tmp_path / 'colunar'))
+    catalogo = open_catalog(str(tmp_path / 'colunar'))
+
+    assert catalogo.content_hash == content_hash
+    _assert_round_trip(catalogo, HABILIDADES_MESTRE)
+
+
+def test_json_e_csv_geram_o_mesmo_hash(tmp_path):
+    habilidades, _ = generate_catalog(40, profundidade=3, fan_in=2, seed=5)
+    _write_json(str(tmp_path / 'c.json'), habilidades)
+    _write_csv(str(tmp_path / 'c.csv'), habilidades)
+
+    hash_json = ingest_catalog(str(tmp_path / 'c.json'), str(tmp_path / 'json'))
+    hash_csv = ingest_catalog(str(tmp_path / 'c.csv'), str(tmp_path / 'csv'))
+
+    assert hash_json == hash_csv
+    _assert_round_trip(open_catalog(str(tmp_path / 'csv')), habilidades)
+
+
+def test_registros_sao_reaproveitados(tmp_path):
+    _write_json(str(tmp_path / 'c.json'), HABILIDADES_MESTRE)
+    ingest_catalog(str(tmp_path / 'c.json'), str(tmp_path / 'colunar'))
+    catalogo = open_catalog(str(tmp_path / 'colunar'))
+
+    assert catalogo['S1'] is catalogo['S1']
+
+
+@pytest.mark.parametrize('escrever, nome', [(_write_json, 'catalogo.json'), (_write_csv, 'catalogo.csv')])
+def test_solver_no_catalogo_colunar(tmp_path, escrever, nome):
+    esperado = solve_challenge_3()
+
+    escrever(str(tmp_path / nome), HABILIDADES_MESTRE)
+    ingest_catalog(str(tmp_path / nome), str(tmp_path / 'colunar'))
+    load_catalog(str(tmp_path / 'colunar'))
+
+    assert get_habilidades() is not HABILIDADES_MESTRE
+    assert get_base_skills() == [s for s, d in HABILIDADES_MESTRE.items() if not d['Pre_Reqs']]
+    resultado = solve_challenge_3()
+    assert resultado['Solução Ótima'] == esperado['Solução Ótima']
+    assert resultado['Solução Gulosa'] == esperado['Solução Gulosa']
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from dynamic_programming_project.data import get_compiled_catalog, get_habilidades
+from dynamic_programming_project.src.challenge_1 import (
+    TARGET_SKILL, find_optimal_path_set, monte_carlo_parallel
+)
+
+
+def test_monte_carlo_paralelo_nao_depende_de_workers():
+    get_compiled_catalog()
+    path_set = find_optimal_path_set(TARGET_SKILL)[3]
+    habilidades = get_habilidades()
+
+    resultados = [
+        monte_carlo_parallel(habilidades, path_set, num_cenarios=10_001, seed=7,
+                             chunk_size=1_000, workers=workers)
+        for workers in (1, 2)
+    ]
+
+    assert [r.pop('Processos') for r in resultados] == [1, 2]
+    assert resultados[0] == resultados[1]
+    assert resultados[0]['Número de Cenários'] == 10_001
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from itertools import permutations
+
+import pytest
+
+from dynamic_programming_project.data import get_habilidades, get_habilidades_criticas, use_catalog
+from dynamic_programming_project.src.challenge_2 import (
+    _cost_view, anytime_orders, calculate_acquisition_cost, dfs_top_k_orders, iter_orders_by_cost,
+    parallel_top_k_permutations, solve_challenge_2, top_k_orders
+)
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+
+def _all_orders(criticas, habilidades):
+    results = [
+        {'Ordem': list(order), 'Custo Total': cost, 'Tempo de Espera': wait}
+        for order in permutations(criticas)
+        for cost, wait in [calculate_acquisition_cost(order, habilidades)]
+    ]
+    results.sort(key=lambda r: r['Custo Total'])
+    return results
+
+
+def _catalogos():
+    yield get_habilidades(), get_habilidades_criticas()
+    for seed in range(4):
+        yield generate_catalog(30, profundidade=4, fan_in=3, num_criticas=6, seed=seed)
+
+
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_motores_iguais_a_enumeracao(k):
+    for habilidades, criticas in _catalogos():
+        esperado = _all_orders(criticas, habilidades)[:k]
+        assert dfs_top_k_orders(criticas, habilidades, k) == esperado
+        # Held-Karp pode desempatar de outra forma: comparamos os custos
+        hk = top_k_orders(criticas, habilidades, k)
+        assert [r['Custo Total'] for r in hk] == [r['Custo Total'] for r in esperado]
+        for r in hk:
+            assert (r['Custo Total'], r['Tempo de Espera']) == calculate_acquisition_cost(r['Ordem'], habilidades)
+
+
+def test_paralelo_igual_a_enumeracao():
+    for habilidades, criticas in _catalogos():
+        esperado = _all_orders(criticas, habilidades)[:3]
+        assert parallel_top_k_permutations(criticas, habilidades, 3, workers=2) == esperado
+
+
+def test_recorte_enviado_aos_processos_preserva_o_custo():
+    for habilidades, criticas in _catalogos():
+        view = _cost_view(criticas, habilidades)
+        assert set(criticas) <= set(view) < set(habilidades)
+        for order in permutations(criticas):
+            assert calculate_acquisition_cost(order, view) == calculate_acquisition_cost(order, habilidades)
+
+
+def test_fluxo_por_custo_nao_decrescente():
+    habilidades, criticas = generate_catalog(30, profundidade=4, fan_in=3, num_criticas=5, seed=9)
+    custos = [r['Custo Total'] for r in iter_orders_by_cost(criticas, habilidades)]
+    assert len(custos) == 120
+    assert custos == sorted(custos)
+    assert sorted(custos) == sorted(r['Custo Total'] for r in _all_orders(criticas, habilidades))
+
+
+def test_anytime_termina_no_otimo():
+    habilidades, criticas = get_habilidades(), get_habilidades_criticas()
+    *_, (top, melhor, limite) = anytime_orders(criticas, habilidades, 3)
+    assert melhor == limite == _all_orders(criticas, habilidades)[0]['Custo Total']
+    assert len(top) == 3
+
+
+@pytest.mark.parametrize('metodo', ['subconjuntos', 'arvore', 'paralelo'])
+def test_solve_challenge_2_metodos(metodo):
+    habilidades, criticas = generate_catalog(30, profundidade=4, fan_in=3, num_criticas=6, seed=1)
+    use_catalog(habilidades, criticas)
+    base = solve_challenge_2()
+    resultado = solve_challenge_2(metodo=metodo, workers=2)
+    assert resultado['Total de Permutações'] == base['Total de Permutações']
+    assert resultado['Custo Médio das Top 3'] == base['Custo Médio das Top 3']
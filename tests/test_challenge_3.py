@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from dynamic_programming_project.data import get_base_skills, get_habilidades, use_catalog
+from dynamic_programming_project.src.challenge_3 import (
+    ADAPTABILIDADE_MINIMA, branch_and_bound_search, exhaustive_search, fractional_time_bound,
+    gray_code_search, min_time_dp, pareto_search, solve_challenge_3
+)
+
+
+def _skills(*pares):
+    return {
+        f'B{i}': {'Nome': f'Base {i}', 'Tempo': t, 'Valor': v, 'Complexidade': 1, 'Pre_Reqs': []}
+        for i, (v, t) in enumerate(pares)
+    }
+
+
+def test_limite_fracionario_ignora_valor_zero():
+    habilidades = _skills((0, 5), (ADAPTABILIDADE_MINIMA - 1, 10), (0, 1))
+    assert fractional_time_bound(list(habilidades), habilidades) is None
+
+    habilidades = _skills((0, 1), (ADAPTABILIDADE_MINIMA, 10), (0, 2))
+    assert fractional_time_bound(list(habilidades), habilidades) == pytest.approx(10)
+
+
+def test_limite_fracionario_nao_excede_otimo():
+    habilidades = _skills((10, 10), (10, 30), (5, 4))
+    bound = fractional_time_bound(list(habilidades), habilidades)
+    # Ótimo inteiro: {B0, B2} (valor 15, tempo 14); relaxação: 4 + 10 = 14
+    assert bound == pytest.approx(14)
+
+
+def _random_skills(n, seed, reais=False):
+    rng = random.Random(seed)
+    if reais:
+        return _skills(*((round(rng.uniform(0, 8), 3), round(rng.uniform(0.1, 20), 3)) for _ in range(n)))
+    return _skills(*((rng.randint(0, 8), rng.randint(1, 20)) for _ in range(n)))
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_motores_exatos_iguais_a_exaustiva(seed):
+    habilidades = _random_skills(10, seed)
+    base = list(habilidades)
+    esperado = exhaustive_search(base, habilidades)
+    assert min_time_dp(base, habilidades) == esperado
+    assert branch_and_bound_search(base, habilidades) == esperado
+    for block_bits in (0, 3, 16):
+        assert gray_code_search(base, habilidades, block_bits=block_bits) == esperado
+
+    use_catalog(habilidades)
+    caminho, valor, tempo, _ = pareto_search(get_base_skills())
+    assert (valor, tempo) == esperado[1:]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_gray_com_valores_reais(seed):
+    habilidades = _random_skills(10, seed, reais=True)
+    base = list(habilidades)
+    caminho, valor, tempo = exhaustive_search(base, habilidades)
+    g_caminho, g_valor, g_tempo = gray_code_search(base, habilidades, block_bits=3)
+    assert g_tempo == pytest.approx(tempo)
+    assert g_valor == sum(habilidades[s]['Valor'] for s in g_caminho)
+    assert g_tempo == sum(habilidades[s]['Tempo'] for s in g_caminho)
+
+
+def test_gray_meta_inatingivel():
+    habilidades = _skills((1, 1), (2, 2), (3, 3))
+    assert gray_code_search(list(habilidades), habilidades, block_bits=1) == ([], 0, float('inf'))
+
+
+def test_auditoria_confere_com_valores_reais():
+    use_catalog(_random_skills(12, 7, reais=True))
+    resultado = solve_challenge_3(auditoria=True)
+    assert resultado['Auditoria']['Confere?']
+
+
+def test_auditoria_catalogo_padrao():
+    get_habilidades()
+    assert solve_challenge_3(auditoria=True)['Auditoria']['Confere?']
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from dynamic_programming_project.src.challenge_4 import (
+    NUMPY_MIN_N, SORT_ALGORITHMS, detect_runs, merge_sort_bottom_up, natural_merge_sort
+)
+
+
+def _entradas(n, seed):
+    rng = random.Random(seed)
+    blocos = sorted(rng.randint(-5, 5) for _ in range(n // 2)) + sorted(
+        (rng.randint(-5, 5) for _ in range(n - n // 2)), reverse=True)
+    return {
+        'inteiros': [rng.randint(-20, 20) for _ in range(n)],
+        'reais': [rng.choice([0.5, 1.25, -3.0, 2.0]) for _ in range(n)],
+        'textos': [rng.choice('abcde') for _ in range(n)],
+        'blocos': blocos,
+    }
+
+
+@pytest.mark.parametrize('algoritmo', sorted(SORT_ALGORITHMS))
+@pytest.mark.parametrize('n', [0, 1, 2, 17, NUMPY_MIN_N - 1, NUMPY_MIN_N, 3000])
+def test_ordenacao_estavel_igual_a_sorted(algoritmo, n):
+    _, sort_func = SORT_ALGORITHMS[algoritmo]
+    for chaves in _entradas(n, n).values():
+        # Pares (chave, posição original): a comparação por chave exige estabilidade
+        data = [(k, i) for i, k in enumerate(chaves)]
+        key = lambda x: x[0]
+        assert sort_func(data, key=key) == sorted(data, key=key)
+
+
+def test_bottom_up_chaves_inteiras_grandes():
+    rng = random.Random(3)
+    data = [rng.randint(-10**12, 10**12) for _ in range(2 * NUMPY_MIN_N)]
+    assert merge_sort_bottom_up(data) == sorted(data)
+
+
+def test_corridas_naturais():
+    assert detect_runs([1, 2, 2, 5, 4, 3, 3, 6]) == [(0, 4, False), (4, 6, True), (6, 8, False)]
+    data = list(range(1000)) + list(range(1000))
+    assert natural_merge_sort(data) == sorted(data)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import random
+
+import numpy as np
+import pytest
+
+from dynamic_programming_project.data import get_compiled_catalog, get_habilidades, use_catalog
+from dynamic_programming_project.src import challenge_5
+from dynamic_programming_project.src.challenge_5 import (
+    MARKET_TRANSITION_PROB, astar_recommendation, beam_recommendation, dp_recommendation,
+    get_available_skills, iterative_recommendation, market_scenario_sweep, solve_challenge_5,
+    solve_challenge_5_batch
+)
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+MERCADO = tuple(sorted(MARKET_TRANSITION_PROB.items()))
+
+
+def _brute_force(acquired, steps, habilidades):
+    """Maior ganho em até 'steps' aquisições (enumerando as sequências)."""
+    if steps == 0:
+        return 0
+    best = 0
+    for skill_id in get_available_skills(acquired, habilidades):
+        gain = habilidades[skill_id]['Valor'] * MARKET_TRANSITION_PROB.get(skill_id, 1.0)
+        best = max(best, gain + _brute_force(acquired | {skill_id}, steps - 1, habilidades))
+    return best
+
+
+def _perfis():
+    yield ['S1', 'S2']
+    yield []
+    yield ['S1']
+
+
+@pytest.mark.parametrize('seed', [None, 0, 1, 2])
+@pytest.mark.parametrize('horizonte', [1, 3])
+def test_motores_exatos_iguais_a_forca_bruta(seed, horizonte):
+    if seed is not None:
+        use_catalog(*generate_catalog(18, profundidade=4, fan_in=2, seed=seed))
+    habilidades = get_habilidades()
+    index = get_compiled_catalog()
+    for perfil in _perfis():
+        start = index.mask_of(perfil)
+        esperado = _brute_force(set(perfil), horizonte, habilidades)
+
+        assert dp_recommendation(start, horizonte, MERCADO)[0] == pytest.approx(esperado)
+        assert iterative_recommendation(start, horizonte, MERCADO)[0].get(start, (0,))[0] == pytest.approx(esperado)
+        astar = astar_recommendation(start, horizonte, MERCADO)
+        assert astar['Exato']
+        assert astar['Valor'] == pytest.approx(esperado)
+        assert len(astar['Caminho']) <= horizonte
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_buscas_limitadas_cercam_o_otimo(seed):
+    use_catalog(*generate_catalog(30, profundidade=3, fan_in=2, seed=seed))
+    habilidades = get_habilidades()
+    index = get_compiled_catalog()
+    start = index.mask_of(['S1'])
+    esperado = _brute_force({'S1'}, 3, habilidades)
+
+    buscas = [beam_recommendation(start, 3, MERCADO, largura) for largura in (1, 2, 64)]
+    buscas.append(astar_recommendation(start, 3, MERCADO, max_expansoes=1))
+    for busca in buscas:
+        assert busca['Valor'] <= esperado + 1e-9
+        assert busca['Limite Superior'] >= esperado - 1e-9
+        if busca['Exato']:
+            assert busca['Valor'] == pytest.approx(esperado)
+        # O caminho é válido e vale o que a busca reporta
+        acquired = {'S1'}
+        valor = 0
+        for i in busca['Caminho']:
+            skill_id = index.ids[i]
+            assert skill_id in get_available_skills(acquired, habilidades)
+            acquired.add(skill_id)
+            valor += habilidades[skill_id]['Valor'] * MARKET_TRANSITION_PROB.get(skill_id, 1.0)
+        assert valor == pytest.approx(busca['Valor'])
+
+
+def test_solve_challenge_5_motores_concordam():
+    base = solve_challenge_5(motor="recursivo")
+    for motor in ("iterativo", "astar", "feixe"):
+        resultado = solve_challenge_5(motor=motor)
+        assert resultado['Habilidades Recomendadas'] == base['Habilidades Recomendadas']
+        assert resultado['Valor Esperado Máximo (Estimado)'] == pytest.approx(
+            base['Valor Esperado Máximo (Estimado)'])
+
+
+def _random_profiles(habilidades, quantidade, seed):
+    rng = random.Random(seed)
+    ids = list(habilidades)
+    perfis = [[], ['S1', 'S2'], ['S1', 'S2'], ['X_inexistente']]
+    perfis += [rng.sample(ids, rng.randint(1, min(6, len(ids)))) for _ in range(quantidade)]
+    return perfis
+
+
+@pytest.mark.parametrize('seed', [None, 0, 1, 2, 3])
+@pytest.mark.parametrize('max_estados', [None, 0, 50])
+def test_lote_igual_a_perfis_individuais(seed, max_estados):
+    if seed is not None:
+        use_catalog(*generate_catalog(25, profundidade=4, fan_in=2, seed=seed))
+    perfis = _random_profiles(get_habilidades(), 18, seed or 0)
+
+    lote = solve_challenge_5_batch(perfis, max_estados=max_estados)
+    assert lote['Perfil Atual'] == perfis
+    for perfil, recomendadas, valor in zip(
+            perfis, lote['Habilidades Recomendadas'], lote['Valor Esperado Máximo (Estimado)']):
+        individual = solve_challenge_5(perfil, motor="recursivo")
+        assert recomendadas == individual['Habilidades Recomendadas']
+        assert valor == pytest.approx(individual['Valor Esperado Máximo (Estimado)'])
+
+
+@pytest.mark.parametrize('seed', [None, 0, 1])
+def test_varredura_igual_a_cenarios_individuais(seed, monkeypatch):
+    if seed is not None:
+        use_catalog(*generate_catalog(25, profundidade=4, fan_in=2, seed=seed))
+    index = get_compiled_catalog()
+    rng = np.random.default_rng(seed)
+    matriz = rng.uniform(0.5, 1.5, size=(12, len(index.ids)))
+
+    por_matriz = market_scenario_sweep(matriz)
+    por_dicionarios = market_scenario_sweep([dict(zip(index.ids, linha)) for linha in matriz])
+    assert por_matriz['Melhor Próxima Habilidade'] == por_dicionarios['Melhor Próxima Habilidade']
+    assert por_matriz['Número de Cenários'] == 12
+
+    start = index.mask_of(['S1', 'S2'])
+    for m, linha in enumerate(matriz):
+        mercado = dict(zip(index.ids, linha.tolist()))
+        monkeypatch.setattr(challenge_5, 'MARKET_TRANSITION_PROB', mercado)
+        individual = solve_challenge_5(['S1', 'S2'], motor="recursivo")
+        assert por_matriz['Melhor Próxima Habilidade'][m] == individual['Habilidades Recomendadas'][0]
+        valor = dp_recommendation(start, challenge_5.MAX_SKILLS_TO_RECOMMEND, tuple(sorted(mercado.items())))[0]
+        assert por_matriz['Valor Esperado'][m] == pytest.approx(valor)
+
+
+@pytest.mark.parametrize('formato', [(3,), (3, 2), (0, None), (2, None, 1)])
+def test_varredura_rejeita_formato_invalido(formato):
+    n = len(get_compiled_catalog().ids)
+    matriz = np.ones(tuple(n if d is None else d for d in formato))
+    with pytest.raises(ValueError):
+        market_scenario_sweep(matriz)
+    with pytest.raises(ValueError):
+        market_scenario_sweep([])
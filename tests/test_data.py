@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from dynamic_programming_project import data
+from dynamic_programming_project.data import (
+    HABILIDADES_MESTRE, catalog_version, get_base_skills, get_compiled_catalog,
+    get_habilidades, update_skill, use_catalog
+)
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+
+def test_csr_e_mascaras_conferem_com_pre_reqs():
+    habilidades, criticas = generate_catalog(80, profundidade=4, fan_in=3, seed=1)
+    habilidades['S80'] = dict(habilidades['S80'], Pre_Reqs=habilidades['S80']['Pre_Reqs'] + ['X1'])
+    use_catalog(habilidades, criticas)
+    catalog = get_compiled_catalog()
+
+    for i, skill_id in enumerate(catalog.ids):
+        prereqs = [p for p in habilidades[skill_id]['Pre_Reqs'] if p in habilidades]
+        targets = catalog.prereq_targets[catalog.prereq_offsets[i]:catalog.prereq_offsets[i + 1]]
+        assert [catalog.ids[t] for t in targets] == prereqs
+        assert catalog.ids_of(catalog.prereq_mask[i]) == [s for s in catalog.ids if s in prereqs]
+        dependents = catalog.dependent_targets[catalog.dependent_offsets[i]:catalog.dependent_offsets[i + 1]]
+        assert sorted(dependents) == [
+            j for j, s in enumerate(catalog.ids) if skill_id in habilidades[s]['Pre_Reqs']
+        ]
+        assert catalog.ids_of(catalog.dependent_mask[i]) == [catalog.ids[d] for d in sorted(dependents)]
+    assert catalog.ids_of(catalog.orphan_mask) == ['S80']
+
+
+def test_recompila_apenas_quando_a_versao_muda():
+    catalog = get_compiled_catalog()
+    assert get_compiled_catalog() is catalog
+
+    version = catalog_version()
+    update_skill('H13', {'Nome': 'Nova', 'Tempo': 10, 'Valor': 1, 'Complexidade': 1,
+                         'Pre_Reqs': ['S1'], 'Uso': 'Lista Grande'})
+    assert catalog_version() == version + 1
+    assert 'H13' not in HABILIDADES_MESTRE  # o catálogo embutido não é alterado
+    recompiled = get_compiled_catalog()
+    assert recompiled is not catalog and 'H13' in recompiled.position
+    assert recompiled.content_hash != catalog.content_hash
+
+
+def test_habilidades_base_sem_compilar():
+    esperado = [s for s, d in get_habilidades().items() if not d['Pre_Reqs']]
+    update_skill('H14', {'Nome': 'Base', 'Tempo': 5, 'Valor': 1, 'Complexidade': 1,
+                         'Pre_Reqs': [], 'Uso': 'Base'})
+    stale = data._COMPILED_CATALOG
+    assert get_base_skills() == esperado + ['H14']
+    assert data._COMPILED_CATALOG is stale
+    assert get_compiled_catalog().ids_of(get_compiled_catalog().base_mask) == esperado + ['H14']
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from dynamic_programming_project.data import (
+    catalog_version, get_compiled_catalog, get_habilidades, use_catalog
+)
+from dynamic_programming_project.src import graph_utils
+from dynamic_programming_project.src.graph_utils import (
+    AvailabilityFrontier, GraphValidationError, IncrementalGraphValidator, TransitiveClosure,
+    analyze_graph, build_prerequisite_graph, edit_skill, get_transitive_closure, validate_graph
+)
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+
+def _ancestors(habilidades, skill_id):
+    seen = {skill_id}
+    stack = [skill_id]
+    while stack:
+        for prereq in habilidades[stack.pop()]['Pre_Reqs']:
+            if prereq in habilidades and prereq not in seen:
+                seen.add(prereq)
+                stack.append(prereq)
+    return seen
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fecho_sob_demanda_e_tabela_completa(seed):
+    habilidades, criticas = generate_catalog(60, profundidade=5, fan_in=3, seed=seed)
+    use_catalog(habilidades, criticas)
+    catalog = get_compiled_catalog()
+
+    lazy = get_transitive_closure()
+    assert lazy is get_transitive_closure()
+    full = TransitiveClosure(catalog)
+    full.rows  # força a tabela bit-paralela
+    for skill_id in habilidades:
+        esperado = _ancestors(habilidades, skill_id)
+        position = catalog.position[skill_id]
+        assert set(catalog.ids_of(lazy.mask(position))) == esperado
+        assert lazy.mask(position) == full.mask(position)
+        assert set(full.prerequisites(skill_id)) == esperado - {skill_id}
+
+
+def test_tabela_persistida_validada_pelo_hash(tmp_path):
+    path = str(tmp_path / 'fecho')
+    table = get_transitive_closure(cache_path=path)
+    reopened = TransitiveClosure.load(path, get_compiled_catalog())
+    assert reopened is not None
+    assert reopened.prerequisites('S6') == table.prerequisites('S6') == ['S1', 'S3', 'S4']
+    assert reopened.closure_cost(['S6', 'S5']) == 80 + 100 + 120 + 150 + 60 + 40
+
+    habilidades = dict(get_habilidades())
+    habilidades['S6'] = dict(habilidades['S6'], Tempo=1)
+    use_catalog(habilidades)
+    assert TransitiveClosure.load(path, get_compiled_catalog()) is None
+
+
+def test_fecho_rejeita_ciclo():
+    habilidades = dict(get_habilidades())
+    habilidades['S1'] = dict(habilidades['S1'], Pre_Reqs=['S6'])
+    use_catalog(habilidades)
+    with pytest.raises(GraphValidationError):
+        get_transitive_closure()
+
+
+def _available(graph, acquired):
+    return {
+        skill for skill, prereqs in graph.items()
+        if skill not in acquired and all(p in acquired for p in prereqs)
+    }
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fronteira_remove_restaura_add(seed):
+    rng = random.Random(seed)
+    habilidades, _ = generate_catalog(40, profundidade=4, fan_in=3, seed=seed)
+    habilidades['S40'] = dict(habilidades['S40'], Pre_Reqs=habilidades['S40']['Pre_Reqs'] + ['X1'])
+    graph = build_prerequisite_graph(habilidades)
+    frontier = AvailabilityFrontier(graph)
+    assert frontier.available == _available(graph, set())
+
+    pilha = []
+    while frontier.available:
+        snapshot = (set(frontier.available), set(frontier.acquired), dict(frontier.unmet))
+        skill = rng.choice(frontier.available_skills())
+        frontier.add(skill)
+        pilha.append((skill, snapshot))
+        assert frontier.available == _available(graph, frontier.acquired)
+        assert 'S40' not in frontier.available
+        assert frontier.available_skills() == [s for s in graph if s in frontier.available]
+
+    while pilha:
+        skill, (available, acquired, unmet) = pilha.pop()
+        frontier.remove(skill)
+        assert frontier.available == available
+        assert frontier.acquired == acquired
+        assert frontier.unmet == unmet
+
+
+def _orphan_set(result):
+    return set(map(tuple, result['Órfãos']))
+
+
+def _assert_topological(validator):
+    for u, prereqs in enumerate(validator.prereqs):
+        for p in prereqs:
+            assert validator.order[p] < validator.order[u]
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_validador_incremental_confere_com_analise_completa(seed):
+    rng = random.Random(seed)
+    habilidades, criticas = generate_catalog(25, profundidade=4, fan_in=2, seed=seed)
+    use_catalog(habilidades, criticas)
+
+    for step in range(120):
+        current = get_habilidades()
+        ids = list(current)
+        op = rng.random()
+        if op < 0.4:
+            skill_id = f'N{step}'
+            pool = ids + [f'N{step + k}' for k in range(1, 4)]  # inclui órfãos futuros
+        else:
+            skill_id = rng.choice(ids)
+            pool = ids
+        prereqs = list(current[skill_id]['Pre_Reqs']) if skill_id in current else []
+        if op > 0.85 and prereqs:
+            prereqs.pop(rng.randrange(len(prereqs)))
+        else:
+            prereqs += rng.sample(pool, k=min(2, len(pool)))
+        prereqs = list(dict.fromkeys(p for p in prereqs if p != skill_id))
+        dados = dict(current.get(skill_id, habilidades['S1']), Pre_Reqs=prereqs)
+
+        graph = build_prerequisite_graph(current)
+        graph[skill_id] = prereqs
+        esperado = analyze_graph(graph)
+        cria_ciclo = any(skill_id in cycle for cycle in esperado['Ciclos'])
+
+        version = catalog_version()
+        if cria_ciclo:
+            with pytest.raises(GraphValidationError):
+                edit_skill(skill_id, dados)
+            assert catalog_version() == version and get_habilidades() is current
+        else:
+            status = edit_skill(skill_id, dados)
+            assert status['Ciclos'] == []
+            assert _orphan_set(status) == _orphan_set(esperado)
+            assert _orphan_set(analyze_graph(build_prerequisite_graph(get_habilidades()))) == _orphan_set(status)
+
+        validator = graph_utils._VALIDATION['validator']
+        if validator is not None:
+            _assert_topological(validator)
+
+
+def test_validador_rejeita_aresta_que_fecha_ciclo():
+    validator = IncrementalGraphValidator(build_prerequisite_graph(get_habilidades()))
+    _assert_topological(validator)
+    with pytest.raises(GraphValidationError, match='S1'):
+        validator.add_edge('S1', 'S6')
+    _assert_topological(validator)
+    validator.add_edge('H12', 'S6')
+    _assert_topological(validator)
+
+    # Órfão pendente é resolvido quando a habilidade é incluída
+    validator.add_skill('H20', ['H21'])
+    assert ('H20', 'H21') in validator.status()['Órfãos']
+    validator.add_skill('H21', ['S1'])
+    assert validator.status()['Órfãos'] == []
+    _assert_topological(validator)
+
+
+def test_validate_graph_usa_resultado_da_edicao():
+    validate_graph()
+    edit_skill('H30', {'Nome': 'X', 'Tempo': 1, 'Valor': 1, 'Complexidade': 1,
+                       'Pre_Reqs': ['H31'], 'Uso': 'Lista Grande'})
+    with pytest.raises(GraphValidationError, match='H31'):
+        validate_graph()
+    edit_skill('H31', {'Nome': 'Y', 'Tempo': 1, 'Valor': 1, 'Complexidade': 1,
+                       'Pre_Reqs': ['S1'], 'Uso': 'Lista Grande'})
+    assert validate_graph() == ("Nenhum nó órfão detectado.", "Nenhum ciclo detectado.")
+    with pytest.raises(GraphValidationError):
+        edit_skill('S1', dict(get_habilidades()['S1'], Pre_Reqs=['H30']))
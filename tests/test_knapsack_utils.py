@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import random
+from itertools import combinations
+
+import pytest
+
+from dynamic_programming_project.data import get_habilidades
+from dynamic_programming_project.src.graph_utils import eligible_topological_order
+from dynamic_programming_project.src.knapsack_utils import solve_precedence_knapsack
+
+
+def _random_dag(n, seed):
+    rng = random.Random(seed)
+    habilidades = {}
+    for i in range(n):
+        ids = list(habilidades)
+        habilidades[f'H{i}'] = {
+            'Tempo': rng.randint(1, 12),
+            'Complexidade': rng.randint(1, 6),
+            'Valor': rng.randint(0, 10),
+            'Pre_Reqs': rng.sample(ids, min(len(ids), rng.choice([0, 1, 1, 2, 3]))),
+        }
+    return habilidades
+
+
+def _brute_force(habilidades, tempo_max, complexidade_max):
+    ids = list(habilidades)
+    best = 0
+    for r in range(len(ids) + 1):
+        for subset in combinations(ids, r):
+            chosen = set(subset)
+            if any(p not in chosen for s in chosen for p in habilidades[s]['Pre_Reqs']):
+                continue
+            if (sum(habilidades[s]['Tempo'] for s in chosen) <= tempo_max
+                    and sum(habilidades[s]['Complexidade'] for s in chosen) <= complexidade_max):
+                best = max(best, sum(habilidades[s]['Valor'] for s in chosen))
+    return best
+
+
+def _check_feasible(habilidades, resultado, tempo_max, complexidade_max):
+    chosen = set(resultado['Conjunto'])
+    assert all(p in chosen for s in chosen for p in habilidades[s]['Pre_Reqs'])
+    assert resultado['Tempo Total'] == sum(habilidades[s]['Tempo'] for s in chosen) <= tempo_max
+    assert (resultado['Complexidade Total']
+            == sum(habilidades[s]['Complexidade'] for s in chosen) <= complexidade_max)
+    assert resultado['Valor Total'] == sum(habilidades[s]['Valor'] for s in chosen)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_mochila_igual_forca_bruta(seed):
+    habilidades = _random_dag(12, seed)
+    resultado = solve_precedence_knapsack(habilidades, 30, 12)
+    _check_feasible(habilidades, resultado, 30, 12)
+    assert resultado['Exato']
+    assert resultado['Valor Total'] == _brute_force(habilidades, 30, 12)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_mochila_aproximada_viavel_sem_dupla_contagem(seed):
+    habilidades = _random_dag(12, seed)
+    resultado = solve_precedence_knapsack(habilidades, 30, 12, max_rotulos=0)
+    _check_feasible(habilidades, resultado, 30, 12)
+    assert resultado['Valor Total'] <= _brute_force(habilidades, 30, 12)
+
+
+def test_mochila_catalogo_padrao_exata():
+    habilidades = get_habilidades()
+    resultado = solve_precedence_knapsack(habilidades, 350, 30)
+    _check_feasible(habilidades, resultado, 350, 30)
+    assert resultado['Exato']
+    assert resultado['Valor Total'] == _brute_force(habilidades, 350, 30)
+
+
+def test_ordem_topologica_elegivel():
+    habilidades = {
+        'A': {'Pre_Reqs': []},
+        'B': {'Pre_Reqs': ['A']},
+        'C': {'Pre_Reqs': ['B', 'X']},
+        'D': {'Pre_Reqs': ['C']},
+        'X': {'Pre_Reqs': []},
+    }
+    assert eligible_topological_order(habilidades, ['D', 'C', 'B', 'A']) == ['A', 'B']
+    assert eligible_topological_order(habilidades, habilidades) == ['A', 'X', 'B', 'C', 'D']
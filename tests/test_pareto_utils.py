@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import random
+from itertools import combinations
+
+import pytest
+
+from dynamic_programming_project.data import use_catalog
+from dynamic_programming_project.src.pareto_utils import (
+    ParetoFrontier, compute_pareto_frontier, get_pareto_frontier, pareto_filter
+)
+
+
+def _random_dag(n, seed):
+    rng = random.Random(seed)
+    habilidades = {}
+    for i in range(n):
+        ids = list(habilidades)
+        habilidades[f'H{i}'] = {
+            'Nome': f'Habilidade {i}',
+            'Tempo': rng.randint(1, 12),
+            'Complexidade': rng.randint(1, 6),
+            'Valor': rng.randint(0, 10),
+            'Pre_Reqs': rng.sample(ids, min(len(ids), rng.choice([0, 1, 1, 2]))),
+        }
+    return habilidades
+
+
+def _closed_sets(habilidades):
+    ids = list(habilidades)
+    for r in range(len(ids) + 1):
+        for subset in combinations(ids, r):
+            chosen = set(subset)
+            if all(p in chosen for s in chosen for p in habilidades[s]['Pre_Reqs']):
+                yield (sum(habilidades[s]['Valor'] for s in chosen),
+                       sum(habilidades[s]['Tempo'] for s in chosen),
+                       sum(habilidades[s]['Complexidade'] for s in chosen),
+                       subset)
+
+
+def _dominated(p, q):
+    return q[0] >= p[0] and q[1] <= p[1] and q[2] <= p[2] and q[:3] != p[:3]
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_fronteira_igual_forca_bruta(seed):
+    habilidades = _random_dag(11, seed)
+    todos = list(_closed_sets(habilidades))
+    esperado = {p[:3] for p in todos if not any(_dominated(p, q) for q in todos)}
+
+    fronteira = compute_pareto_frontier(habilidades)
+    assert {p[:3] for p in fronteira} == esperado
+    assert len(fronteira) == len(esperado)
+    for valor, tempo, complexidade, conjunto in fronteira:
+        chosen = set(conjunto)
+        assert all(p in chosen for s in chosen for p in habilidades[s]['Pre_Reqs'])
+        assert (valor, tempo, complexidade) == (
+            sum(habilidades[s]['Valor'] for s in chosen),
+            sum(habilidades[s]['Tempo'] for s in chosen),
+            sum(habilidades[s]['Complexidade'] for s in chosen))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_consultas_de_orcamento(seed):
+    habilidades = _random_dag(10, seed)
+    todos = list(_closed_sets(habilidades))
+    fronteira = ParetoFrontier(compute_pareto_frontier(habilidades))
+    rng = random.Random(seed)
+    for _ in range(40):
+        t_max, c_max, v_min = rng.randint(0, 60), rng.randint(0, 30), rng.randint(0, 40)
+
+        viaveis = [p for p in todos if p[1] <= t_max and p[2] <= c_max]
+        melhor = fronteira.best_within(t_max, c_max)
+        assert melhor['Valor'] == max(p[0] for p in viaveis)
+
+        cobrem = [p for p in todos if p[0] >= v_min and p[2] <= c_max]
+        rapido = fronteira.min_time_for_value(v_min, c_max)
+        if cobrem:
+            assert rapido['Tempo'] == min(p[1] for p in cobrem)
+        else:
+            assert rapido is None
+
+
+def test_tetos_e_limite_de_rotulos():
+    habilidades = _random_dag(11, 3)
+    todos = list(_closed_sets(habilidades))
+    com_teto = compute_pareto_frontier(habilidades, tempo_max=25, complexidade_max=10)
+    assert max(p[0] for p in com_teto) == max(p[0] for p in todos if p[1] <= 25 and p[2] <= 10)
+    assert all(p[1] <= 25 and p[2] <= 10 for p in com_teto)
+    assert compute_pareto_frontier(habilidades, max_rotulos=1) is None
+
+
+def test_filtro_de_pareto():
+    pontos = [(5, 3, 2, 'a'), (5, 3, 2, 'b'), (4, 3, 2, 'c'), (6, 4, 1, 'd'), (1, 1, 1, 'e')]
+    assert pareto_filter(pontos) == [(1, 1, 1, 'e'), (5, 3, 2, 'a'), (6, 4, 1, 'd')]
+
+
+def test_fronteira_memorizada_por_catalogo():
+    primeira = get_pareto_frontier()
+    assert get_pareto_frontier() is primeira
+    use_catalog(_random_dag(8, 1))
+    segunda = get_pareto_frontier()
+    assert segunda is not primeira
+    assert all(r['Conjunto'][0].startswith('H') for r in segunda.as_records() if r['Conjunto'])
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from dynamic_programming_project.data import get_habilidades, use_catalog
+from dynamic_programming_project.src.schedule_utils import schedule_tracks
+from dynamic_programming_project.src.synthetic_utils import generate_catalog
+
+
+def _brute_force(habilidades, num_tracks):
+    """Menor makespan: toda ordem de início compatível x toda escolha de trilha."""
+    best = [float('inf')]
+
+    def visit(finish, free):
+        if len(finish) == len(habilidades):
+            best[0] = min(best[0], max(free))
+            return
+        if max(free) >= best[0]:
+            return
+        for skill_id, data in habilidades.items():
+            if skill_id in finish or any(p not in finish for p in data['Pre_Reqs']):
+                continue
+            ready = max((finish[p] for p in data['Pre_Reqs']), default=0)
+            for track in range(num_tracks):
+                if free.index(free[track]) != track:
+                    continue  # trilhas com o mesmo tempo livre são intercambiáveis
+                previous = free[track]
+                finish[skill_id] = max(ready, previous) + data['Tempo']
+                free[track] = finish[skill_id]
+                visit(finish, free)
+                free[track] = previous
+                del finish[skill_id]
+
+    visit({}, [0] * num_tracks)
+    return best[0]
+
+
+def _check_schedule(habilidades, resultado, num_tracks):
+    inicio, fim = {}, {}
+    assert len(resultado['Trilhas']) == num_tracks
+    for trilha in resultado['Trilhas']:
+        for anterior, atual in zip(trilha, trilha[1:]):
+            assert anterior['Fim'] <= atual['Início']
+        for item in trilha:
+            inicio[item['ID']], fim[item['ID']] = item['Início'], item['Fim']
+            assert item['Fim'] - item['Início'] == habilidades[item['ID']]['Tempo']
+    assert set(inicio) == set(habilidades)
+    for skill_id, data in habilidades.items():
+        assert all(fim[p] <= inicio[skill_id] for p in data['Pre_Reqs'])
+    assert resultado['Makespan'] == max(fim.values())
+    assert resultado['Limite Inferior'] <= resultado['Makespan']
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('num_tracks', [2, 3])
+def test_agendamento_exato_igual_forca_bruta(seed, num_tracks):
+    habilidades, criticas = generate_catalog(7, profundidade=3, fan_in=2, seed=seed)
+    use_catalog(habilidades, criticas)
+    otimo = _brute_force(habilidades, num_tracks)
+
+    lista = schedule_tracks(num_tracks, "lista")
+    _check_schedule(habilidades, lista, num_tracks)
+    assert lista['Makespan'] >= otimo
+
+    exato = schedule_tracks(num_tracks, "exato")
+    _check_schedule(habilidades, exato, num_tracks)
+    assert exato['Exato']
+    assert exato['Makespan'] == otimo
+
+
+def test_agendamento_catalogo_padrao_valido():
+    habilidades = get_habilidades()
+    for num_tracks in (1, 2, 4):
+        resultado = schedule_tracks(num_tracks, "exato")
+        _check_schedule(habilidades, resultado, num_tracks)
+    assert schedule_tracks(1)['Makespan'] == sum(s['Tempo'] for s in habilidades.values())
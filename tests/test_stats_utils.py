@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from dynamic_programming_project.src.stats_utils import BINS_QUANTIS_PADRAO, StreamingStats
+
+QUANTIS = (0.05, 0.5, 0.95)
+
+
+def test_momentos_e_quantis_em_blocos():
+    values = np.random.default_rng(0).uniform(90, 110, 50_000)
+    stats = StreamingStats(QUANTIS, faixa=(90, 110), bins=50)
+    for bloco in np.array_split(values, 7):
+        stats.update_batch(bloco)
+
+    assert stats.count == values.size
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std() == pytest.approx(values.std())
+    largura = 20 / BINS_QUANTIS_PADRAO
+    for q, estimativa in stats.quantiles().items():
+        assert abs(estimativa - np.quantile(values, q)) <= 2 * largura
+    assert sum(stats.histogram()['Contagens']) == values.size
+
+
+def test_resolucao_padrao_tem_bins_suficientes():
+    stats = StreamingStats(QUANTIS, faixa=(0, 1), bins=50)
+    assert stats._counts.size >= BINS_QUANTIS_PADRAO
+    assert len(stats.histogram()['Contagens']) == 50
+
+
+def test_merge_igual_a_passada_unica():
+    rng = np.random.default_rng(1)
+    a, b = rng.uniform(0, 10, 1000), rng.uniform(0, 10, 3000)
+    unico = StreamingStats(QUANTIS, faixa=(0, 10))
+    unico.update_batch(np.concatenate((a, b)))
+    parte_a = StreamingStats(QUANTIS, faixa=(0, 10))
+    parte_a.update_batch(a)
+    parte_b = StreamingStats(QUANTIS, faixa=(0, 10))
+    parte_b.update_batch(b)
+    parte_a.merge(parte_b)
+
+    assert parte_a.count == unico.count
+    assert parte_a.mean == pytest.approx(unico.mean)
+    assert parte_a.m2 == pytest.approx(unico.m2)
+    assert parte_a.quantiles() == unico.quantiles()
+
+
+def test_merge_p2_so_com_acumulador_vazio():
+    values = np.random.default_rng(2).normal(size=200)
+    cheio = StreamingStats(QUANTIS)
+    cheio.update_batch(values)
+
+    vazio = StreamingStats(QUANTIS)
+    vazio.merge(cheio)
+    assert vazio.quantiles() == cheio.quantiles()
+    cheio.merge(StreamingStats(QUANTIS))
+    assert cheio.count == values.size
+
+    outro = StreamingStats(QUANTIS)
+    outro.update_batch(values)
+    with pytest.raises(ValueError):
+        cheio.merge(outro)
+
+
+def test_merge_configuracoes_diferentes():
+    with pytest.raises(ValueError):
+        StreamingStats(QUANTIS, faixa=(0, 1), bins=50).merge(StreamingStats(QUANTIS, faixa=(0, 1), bins=10))